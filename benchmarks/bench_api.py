@@ -0,0 +1,103 @@
+"""Load test for health_gain_api: p50/p99 latency and requests/sec.
+
+Starts the API in a subprocess on a free port, then drives it with
+`--concurrency` keep-alive connections from one asyncio client.
+
+    python benchmarks/bench_api.py [--requests 20000] [--concurrency 32] [--batch 1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PERSON = {"age": 28, "sex": "Male", "drinking_days": 4, "drinks_per_occ": 2,
+          "years_drinking": 5, "target_days": 2}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("API did not start")
+
+
+async def client(port, path, body, n, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    for _ in range(n):
+        t0 = time.perf_counter()
+        writer.write(request)
+        await writer.drain()
+        status = await reader.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(f"unexpected response: {status!r}")
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - t0)
+    writer.close()
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+async def run(port, args):
+    await wait_ready(port)
+    payload = [PERSON] * args.batch if args.batch > 1 else PERSON
+    body = json.dumps(payload).encode()
+    per_client = max(1, args.requests // args.concurrency)
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(port, "/v1/alcohol", body, per_client, latencies)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    print(f"{len(latencies):,} requests x {args.batch} row(s), {args.concurrency} connections")
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   "
+          f"{len(latencies) / elapsed:,.0f} req/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=20_000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--batch", type=int, default=1, help="rows per request body")
+    args = ap.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "health_gain_api.py", "--port", str(port)],
+                              cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(run(port, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
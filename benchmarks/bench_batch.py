@@ -0,0 +1,63 @@
+"""Rows/sec of the vectorized alcohol model vs. a loop over the scalar one.
+
+    python benchmarks/bench_batch.py [--rows 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import health_gain_model as model  # noqa: E402
+
+
+def make_population(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(15, 91, n),
+        rng.choice(np.array(["Male", "Female"]), n),
+        rng.integers(0, 8, n),
+        rng.integers(0, 11, n),
+        rng.integers(0, 61, n),
+        rng.integers(0, 8, n),
+    )
+
+
+def bench_loop(cols):
+    rows = list(zip(*(c.tolist() for c in cols)))
+    t0 = time.perf_counter()
+    out = [model.health_gain_demo(*r)["gain_months"] for r in rows]
+    return time.perf_counter() - t0, np.asarray(out)
+
+
+def bench_batch(cols):
+    t0 = time.perf_counter()
+    out = model.health_gain_demo_batch(*cols)
+    return time.perf_counter() - t0, out["gain_months"]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--loop-rows", type=int, default=100_000,
+                    help="rows for the scalar loop (it is slow)")
+    args = ap.parse_args()
+
+    cols = make_population(args.rows)
+    t_batch, batch_months = bench_batch(cols)
+
+    loop_cols = tuple(c[:args.loop_rows] for c in cols)
+    t_loop, loop_months = bench_loop(loop_cols)
+
+    assert np.array_equal(batch_months[:args.loop_rows], loop_months), "batch != scalar"
+    loop_rps = len(loop_months) / t_loop
+    batch_rps = args.rows / t_batch
+    print(f"scalar loop : {loop_rps:>14,.0f} rows/s  ({len(loop_months):,} rows)")
+    print(f"batch       : {batch_rps:>14,.0f} rows/s  ({args.rows:,} rows)")
+    print(f"speed-up    : {batch_rps / loop_rps:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Server CPU per user: server-side reruns vs. browser-side evaluation.
+
+Simulates one visitor's session against each dual app through Streamlit's
+AppTest harness (the same script thread a real server runs) and measures
+the process CPU it costs:
+
+    server mode   page load, then every slider move and button click is a
+                  rerun (SLIDER_MOVES + the calculate buttons)
+    client mode   HEALTH_GAIN_CLIENT_MODE=1: the page load only; the same
+                  interactions happen in the browser and never reach the server
+
+The websocket/protocol overhead of each rerun is not included, so the real
+saving per interaction is larger than shown.
+
+    python benchmarks/bench_client.py [--users 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import health_gain_client as client  # noqa: E402
+
+APPS = ("ai_health_gain_demo.py", "ai_health_gain_demo 02.py")
+# (slider index, value) per drag step: days now, drinks, goal, then cigarettes now / goal
+SLIDER_MOVES = [(0, 6), (0, 4), (1, 3), (2, 3), (2, 1), (2, 0), (3, 25), (3, 15), (4, 5), (4, 2)]
+
+
+def session(app, client_mode):
+    """Run one visitor's session; returns (cpu seconds, script runs)."""
+    os.environ[client.CLIENT_ENV] = "1" if client_mode else "0"
+    t0 = time.process_time()
+    at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=60).run()
+    runs = 1
+    if not client_mode:
+        for i, value in SLIDER_MOVES:
+            at.slider[i].set_value(value).run()
+            runs += 1
+        for button in range(len(at.button)):
+            at.button[button].click().run()
+            runs += 1
+    if at.exception:
+        raise RuntimeError(f"{app}: {at.exception[0].value}")
+    return time.process_time() - t0, runs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=20)
+    args = ap.parse_args()
+
+    for app in APPS:
+        session(app, False)  # warm imports and process-wide caches
+        session(app, True)
+        rows = {}
+        for mode in ("server", "client"):
+            results = [session(app, mode == "client") for _ in range(args.users)]
+            rows[mode] = (statistics.median(cpu for cpu, _ in results), results[0][1])
+        print(app)
+        for mode, (cpu, runs) in rows.items():
+            print(f"  {mode:<7} {runs:>3} script runs/user   {cpu * 1e3:>8.1f} ms CPU/user")
+        print(f"  client mode: {rows['server'][0] / rows['client'][0]:.1f}x less server CPU per user")
+    size = len(client.widget_html("EN", client.current_params()).encode("utf-8"))
+    print(f"component page: {size / 1024:.1f} KiB per page load")
+
+
+if __name__ == "__main__":
+    main()
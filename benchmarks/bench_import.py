@@ -0,0 +1,48 @@
+"""Cold import time of the UI-free model vs. loading an app script.
+
+Each case runs in a fresh interpreter; the app scripts are executed with
+runpy (Streamlit "bare mode"), which is what importing them amounts to.
+
+    python benchmarks/bench_import.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "health_gain_model": "import health_gain_model",
+    "ai_health_gain_demo.py": "import runpy; runpy.run_path('ai_health_gain_demo.py')",
+    "ai_health_gain_demo 01.py": "import runpy; runpy.run_path('ai_health_gain_demo 01.py')",
+    "ai_health_gain_demo 02.py": "import runpy; runpy.run_path('ai_health_gain_demo 02.py')",
+}
+
+
+def time_case(code, repeat):
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    baseline = time_case("pass", args.repeat)
+    print(f"{'interpreter start-up':<28}{baseline * 1000:>9.1f} ms")
+    for name, code in CASES.items():
+        t = time_case(code, args.repeat) - baseline
+        print(f"{name:<28}{t * 1000:>9.1f} ms (+ start-up)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Memory per result: detail dicts vs. slotted records vs. the columnar ResultBuffer.
+
+Each variant scores the same population with the scalar model, keeps every
+result and then builds the DataFrame; peak and retained memory come from
+tracemalloc. The batch path (`ResultBuffer.score`) is measured too.
+
+    python benchmarks/bench_memory.py [--rows 200000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd  # noqa: E402
+
+import health_gain_model as model  # noqa: E402
+from bench_batch import make_population  # noqa: E402
+from health_gain_records import ResultBuffer, alcohol_record  # noqa: E402
+
+
+def keep_dicts(rows):
+    results = [model.health_gain_demo(*r) for r in rows]
+    return results, lambda: pd.DataFrame(results, columns=model.DETAIL_COLUMNS)
+
+
+def keep_records(rows):
+    results = [alcohol_record(*r) for r in rows]
+    return results, lambda: pd.DataFrame([r.as_dict() for r in results], columns=model.DETAIL_COLUMNS)
+
+
+def keep_buffer(rows):
+    buf = ResultBuffer()
+    for r in rows:
+        buf.add(*r)
+    return buf, buf.to_frame
+
+
+def measure(name, collect, n, *args):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    results, to_frame = collect(*args)
+    kept, _ = tracemalloc.get_traced_memory()
+    frame = to_frame()
+    _, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.stop()
+    assert len(frame) == n
+    print(f"{name:<16} kept {kept / n:>7.1f} B/result   peak {peak / 1e6:>8.1f} MB   {elapsed:>6.2f} s")
+    return frame
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    args = ap.parse_args()
+
+    cols = make_population(args.rows)
+    rows = list(zip(*(c.tolist() for c in cols)))
+    print(f"{args.rows:,} results, kept = held before building the DataFrame")
+    ref = measure("dicts", keep_dicts, args.rows, rows)
+    measure("slotted records", keep_records, args.rows, rows)
+    buffered = measure("ResultBuffer", keep_buffer, args.rows, rows)
+    assert buffered.equals(ref), "ResultBuffer frame != dict frame"
+
+    def batch():
+        buf = ResultBuffer()
+        buf.score(*cols)
+        return buf, buf.to_frame
+    measure("buffer (batch)", batch, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Scaling of ParallelScorer at 1/2/4/8 workers (rows/sec).
+
+Pool start-up is excluded; each run scores the same population and is
+checked against the in-process batch model.
+
+    python benchmarks/bench_parallel.py [--rows 2000000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import health_gain_model as model  # noqa: E402
+from health_gain_parallel import ParallelScorer  # noqa: E402
+
+from bench_batch import make_population  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--capacity", type=int, default=500_000)
+    args = ap.parse_args()
+
+    cols = make_population(args.rows)
+    t0 = time.perf_counter()
+    expected = model.health_gain_demo_batch(*cols)
+    serial = args.rows / (time.perf_counter() - t0)
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'in-process':<12}{serial:>14,.0f} rows/s")
+
+    for workers in args.workers:
+        with ParallelScorer("alcohol", workers=workers, capacity=args.capacity) as scorer:
+            scorer(*(c[:1000] for c in cols))  # warm the pool
+            t0 = time.perf_counter()
+            out = scorer(*cols)
+            rps = args.rows / (time.perf_counter() - t0)
+        assert all(np.array_equal(out[k], expected[k]) for k in expected), "parallel != batch"
+        print(f"{workers:>2} workers  {rps:>14,.0f} rows/s  ({rps / serial:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
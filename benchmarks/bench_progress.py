@@ -0,0 +1,75 @@
+"""Weekly check-in cost vs. history length: incremental totals vs. recomputing.
+
+Fills a fresh store with `--users` trackers of 1, 5 and 10 years of weekly
+check-ins (batched, one transaction per `--batch` rows), then times for one
+user on each history length:
+
+    check_in     a new week: insert one row and bump the totals row
+    progress     read the totals (what the app shows on every rerun)
+    recompute    rescan and re-derive the whole history (what a check-in would
+                 cost without the incremental totals)
+    history      read the whole history (the chart)
+
+    python benchmarks/bench_progress.py [--users 1000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from health_gain_progress import ProgressStore, week_of  # noqa: E402
+
+YEARS = (1, 5, 10)
+
+
+def timed(fn, repeat):
+    times = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=1000, help="background trackers per history length")
+    ap.add_argument("--batch", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "progress.db")
+        store = ProgressStore(path)
+        last = week_of() - 1
+        t0 = time.perf_counter()
+        n = 0
+        for years in YEARS:
+            weeks = years * 52
+            for user in range(args.users):
+                rows = [(f"{years}y-{user}", last - weeks + w, rng.randint(0, 7), rng.randint(0, 40))
+                        for w in range(weeks)]
+                for i in range(0, len(rows), args.batch):
+                    n += store.check_in_many(rows[i:i + args.batch])
+        load = time.perf_counter() - t0
+        print(f"{n:,} check-ins loaded in {load:.1f} s ({n / load:,.0f}/s), "
+              f"{os.path.getsize(path) / n:.0f} bytes each")
+
+        print(f"{'history':>8} {'check_in':>10} {'progress':>10} {'recompute':>10} {'history':>10}   (ms)")
+        for years in YEARS:
+            names = [f"{years}y-{user}" for user in range(args.repeat)]
+            check_in = timed(lambda i: store.check_in(names[i % len(names)], 2, 5, week=last + 1), args.repeat)
+            progress = timed(lambda i: store.progress(names[i % len(names)]), args.repeat)
+            recompute = timed(lambda i: store.recompute(names[i % len(names)]), args.repeat)
+            history = timed(lambda i: store.history(names[i % len(names)]), args.repeat)
+            print(f"{years:>6} y {check_in:>10.3f} {progress:>10.3f} {recompute:>10.3f} {history:>10.3f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
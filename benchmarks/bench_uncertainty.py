@@ -0,0 +1,37 @@
+"""Latency of Monte Carlo bands for one user (target: 10k draws in < ~20 ms).
+
+    python benchmarks/bench_uncertainty.py [--draws 10000] [--repeat 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from health_gain_uncertainty import gain_months_bands  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--draws", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    user = dict(age=28, sex="Male", drinking_days=4, drinks_per_occ=2, years_drinking=5, target_days=2)
+    first = gain_months_bands(**user, n_draws=args.draws, seed=0)
+    assert first == gain_months_bands(**user, n_draws=args.draws, seed=0), "seeded bands differ"
+
+    times = []
+    for i in range(args.repeat):
+        t0 = time.perf_counter()
+        gain_months_bands(**user, n_draws=args.draws, seed=i)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+    print(f"bands (seed 0): {first}")
+    print(f"{args.draws:,} draws: p50 {statistics.median(times):.2f} ms, p99 {p99:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Load test: N concurrent simulated sessions against a running Streamlit app.
+
+Each session speaks Streamlit's own websocket protocol (the BackMsg /
+ForwardMsg protobufs the browser uses), so the server does exactly the work
+a real visitor causes: a session connects, loads the page, then repeats a
+visitor flow until the run ends:
+
+    language toggle -> slider drags -> every calculate button
+    -> after each, its downloads (HTTP GET of the files + a button's rerun)
+    -> language toggle back
+
+with `--think` seconds between actions. Widgets are found from the page
+itself (by type and position, like AppTest), so the flow works on every app
+in this repo; widgets inside a form only rerun on submit, as in a browser.
+
+Reported per concurrency level: reruns/sec, p50/p95/p99 rerun latency
+(BackMsg sent -> script_finished received, per action), page-load latency,
+errors, and server memory per session (RSS growth over the idle server
+divided by the sessions; Linux, and only when the server pid is known;
+noisy below ~10 sessions).
+
+    python benchmarks/loadtest.py --app ai_health_gain_demo.py --sessions 1,10,50 --duration 20
+    python benchmarks/loadtest.py --url http://localhost:8501 --pid 12345 --sessions 25
+    python benchmarks/loadtest.py --app "ai_health_gain_demo 01.py" --json run.json
+    python benchmarks/loadtest.py --app ai_health_gain_demo.py --baseline run.json   # exit 1 on regression
+
+`--app` starts `streamlit run` on a free port for the run and stops it
+afterwards; `--url` attaches to an app you started yourself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THRESHOLD = 0.25
+WIDGET_TYPES = ("slider", "button", "download_button", "radio", "selectbox", "number_input", "checkbox")
+DRAGS_PER_FLOW = 3
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident memory of `pid` (Linux /proc), or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+# ------------------------
+# One simulated browser session
+# ------------------------
+class Session:
+    def __init__(self, base_url, think, rng):
+        self.base_url = base_url.rstrip("/")
+        self.think = think
+        self.rng = rng
+        self.conn = None
+        self.cache = {}       # message hash -> ForwardMsg (for "ref_hash" messages)
+        self.widgets = []     # (type, proto) of the last run, in page order
+        self.states = {}      # widget id -> WidgetState the browser would send
+        self.latencies = []   # (action, seconds)
+        self.errors = 0
+
+    async def connect(self):
+        ws_url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.conn = await websocket_connect(ws_url, subprotocols=["streamlit"])
+        await self.rerun("page_load")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    # ---- protocol ----
+    def _widget(self, element):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        if kind not in WIDGET_TYPES:
+            return
+        proto = getattr(element, kind)
+        self.widgets.append((kind, proto))
+        if kind in ("button", "download_button") or proto.id in self.states:
+            return
+        state = WidgetState(id=proto.id)
+        if kind == "slider":
+            state.double_array_value.data.extend(proto.default)
+        elif kind in ("radio", "selectbox"):
+            state.int_value = proto.default
+        elif kind == "number_input":
+            if proto.data_type == NumberInput.INT:
+                state.int_value = int(proto.default)
+            else:
+                state.double_value = proto.default
+        elif kind == "checkbox":
+            state.bool_value = proto.default
+        self.states[proto.id] = state
+
+    async def rerun(self, action, trigger=None):
+        """Send a rerun (optionally with a button trigger) and wait for the script to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.add(id=trigger, trigger_value=True)
+        self.widgets = []
+        t0 = time.perf_counter()
+        await self.conn.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            raw = await self.conn.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the websocket")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            if fwd.hash:
+                self.cache[fwd.hash] = fwd
+            if fwd.WhichOneof("type") == "ref_hash":
+                fwd = self.cache[fwd.ref_hash]
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._widget(fwd.delta.new_element)
+            elif kind == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.latencies.append((action, time.perf_counter() - t0))
+        live = {proto.id for _, proto in self.widgets}
+        self.states = {wid: state for wid, state in self.states.items() if wid in live}
+
+    # ---- visitor actions ----
+    def _of(self, kind):
+        return [proto for k, proto in self.widgets if k == kind]
+
+    async def pause(self):
+        if self.think:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+
+    async def set_value(self, action, proto, fill):
+        state = self.states[proto.id]
+        fill(state)
+        if not proto.form_id:  # form widgets only send their value on submit
+            await self.rerun(action)
+            await self.pause()
+
+    async def toggle_language(self):
+        radios = self._of("radio")
+        if radios:
+            radio = radios[0]
+            current = self.states[radio.id].int_value
+            await self.set_value("language", radio,
+                                 lambda s: setattr(s, "int_value", (current + 1) % len(radio.options)))
+
+    async def drag(self):
+        sliders = self._of("slider")
+        for slider in self.rng.sample(sliders, min(DRAGS_PER_FLOW, len(sliders))):
+            lo, hi, step = slider.min, slider.max, slider.step or 1
+            value = lo + step * self.rng.randint(0, int((hi - lo) / step))
+
+            def fill(state, value=value):
+                del state.double_array_value.data[:]
+                state.double_array_value.data.append(value)
+            await self.set_value("slider", slider, fill)
+
+    async def calculate(self):
+        i = 0
+        while i < len(self._of("button")):  # re-read: a click can add or remove widgets
+            await self.rerun("button", trigger=self._of("button")[i].id)
+            await self.pause()
+            await self.download()
+            i += 1
+
+    async def download(self):
+        # the browser fetches the file, and the click reruns the script (which
+        # hides a result shown by an earlier button, so only one click per result)
+        buttons = self._of("download_button")
+        if not buttons:
+            return
+        client = AsyncHTTPClient()
+        for button in buttons:
+            t0 = time.perf_counter()
+            await client.fetch(self.base_url + button.url)
+            self.latencies.append(("download_get", time.perf_counter() - t0))
+        await self.rerun("download", trigger=buttons[-1].id)
+        await self.pause()
+
+    async def flow(self):
+        await self.toggle_language()
+        await self.drag()
+        await self.calculate()
+        await self.toggle_language()
+
+
+# ------------------------
+# Runs
+# ------------------------
+async def run_level(base_url, sessions, duration, think, seed, pid):
+    rss_idle = rss_bytes(pid) if pid else None
+    stop_at = None
+    active = []
+
+    async def visitor(i):
+        s = Session(base_url, think, random.Random(seed + i))
+        active.append(s)
+        await asyncio.sleep(random.Random(seed - i).uniform(0, min(1.0, duration / 4)))  # stagger arrivals
+        try:
+            await s.connect()
+            while time.perf_counter() < stop_at:
+                await s.flow()
+        except Exception as exc:  # noqa: BLE001 - count and keep the other sessions going
+            s.errors += 1
+            print(f"session {i}: {type(exc).__name__}: {exc}", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    stop_at = t0 + duration
+    tasks = [asyncio.ensure_future(visitor(i)) for i in range(sessions)]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - t0
+    rss_loaded = rss_bytes(pid) if pid else None  # sessions are still connected here
+    for s in active:
+        s.close()
+
+    reruns = [t for s in active for a, t in s.latencies if a not in ("page_load", "download_get")]
+    loads = [t for s in active for a, t in s.latencies if a == "page_load"]
+    result = {
+        "sessions": sessions,
+        "seconds": round(elapsed, 2),
+        "reruns": len(reruns),
+        "reruns_per_sec": round(len(reruns) / elapsed, 2),
+        "rerun_p50_ms": round(percentile(reruns, 50) * 1e3, 1),
+        "rerun_p95_ms": round(percentile(reruns, 95) * 1e3, 1),
+        "rerun_p99_ms": round(percentile(reruns, 99) * 1e3, 1),
+        "page_load_p50_ms": round(percentile(loads, 50) * 1e3, 1),
+        "errors": sum(s.errors for s in active),
+        "memory_per_session_kb": None,
+    }
+    if rss_idle is not None and rss_loaded is not None:
+        result["memory_per_session_kb"] = round((rss_loaded - rss_idle) / sessions / 1024, 1)
+    by_action = {}
+    for s in active:
+        for action, t in s.latencies:
+            by_action.setdefault(action, []).append(t)
+    result["p50_ms_by_action"] = {a: round(statistics.median(v) * 1e3, 1) for a, v in sorted(by_action.items())}
+    return result
+
+
+def start_app(app, port):
+    cmd = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, app), "--server.headless", "true",
+           "--server.port", str(port), "--browser.gatherUsageStats", "false", "--server.fileWatcherType", "none"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.read() == b"ok":
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{app} did not start")
+
+
+def compare(results, baseline, threshold):
+    """Regressions of `results` vs. `baseline` (matched on the sessions level)."""
+    previous = {r["sessions"]: r for r in baseline["levels"]}
+    problems = []
+    for r in results["levels"]:
+        old = previous.get(r["sessions"])
+        if old is None:
+            continue
+        if r["rerun_p95_ms"] > old["rerun_p95_ms"] * (1 + threshold):
+            problems.append(f"{r['sessions']} sessions: p95 {old['rerun_p95_ms']} -> {r['rerun_p95_ms']} ms")
+        if r["reruns_per_sec"] < old["reruns_per_sec"] * (1 - threshold):
+            problems.append(f"{r['sessions']} sessions: {old['reruns_per_sec']} -> {r['reruns_per_sec']} reruns/s")
+        if r["errors"] > old["errors"]:
+            problems.append(f"{r['sessions']} sessions: {r['errors']} errors")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit apps.")
+    target = ap.add_mutually_exclusive_group(required=True)
+    target.add_argument("--app", help="app script to start for the run, e.g. ai_health_gain_demo.py")
+    target.add_argument("--url", help="base URL of an app that is already running")
+    ap.add_argument("--pid", type=int, help="server pid for memory figures (with --url)")
+    ap.add_argument("--sessions", default="1,10,25", help="concurrency levels, comma-separated")
+    ap.add_argument("--duration", type=float, default=15.0, help="seconds per level")
+    ap.add_argument("--think", type=float, default=0.5, help="mean seconds between a visitor's actions (0: flat out)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="write the results here")
+    ap.add_argument("--baseline", help="compare with an earlier --json file; exit 1 on a regression")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.app:
+        port = free_port()
+        proc = start_app(args.app, port)
+        base_url, pid = f"http://127.0.0.1:{port}", proc.pid
+    else:
+        base_url, pid = args.url, args.pid
+    try:
+        asyncio.run(run_level(base_url, 1, 2.0, 0.0, args.seed, None))  # warm imports and caches
+        levels = []
+        print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'load ms':>8} "
+              f"{'KiB/sess':>9} {'errors':>6}")
+        for n in (int(x) for x in args.sessions.split(",")):
+            r = asyncio.run(run_level(base_url, n, args.duration, args.think, args.seed, pid))
+            levels.append(r)
+            mem = "-" if r["memory_per_session_kb"] is None else f"{r['memory_per_session_kb']:.0f}"
+            print(f"{n:>8} {r['reruns_per_sec']:>9.1f} {r['rerun_p50_ms']:>8.1f} {r['rerun_p95_ms']:>8.1f} "
+                  f"{r['rerun_p99_ms']:>8.1f} {r['page_load_p50_ms']:>8.1f} {mem:>9} {r['errors']:>6}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    results = {"app": args.app or args.url, "think": args.think, "duration": args.duration, "levels": levels}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.threshold)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
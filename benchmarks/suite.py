@@ -0,0 +1,323 @@
+"""Benchmark suite with a stored baseline, a regression check and golden values.
+
+    python benchmarks/suite.py golden            # check the model against golden.json
+    python benchmarks/suite.py golden --write    # re-record it (only for intended model changes)
+    python benchmarks/suite.py run --json base.json         # measure and store the results
+    python benchmarks/suite.py compare --baseline base.json # measure, compare, exit 1 on a regression
+
+Every `run` / `compare` checks the golden values first, so a speed-up that
+changes a number fails before it is timed. Timings are best-of-N seconds per
+operation; `compare` flags any benchmark slower than the baseline by more
+than --threshold (default 25%; app reruns, which go through Streamlit's
+script thread and vary more between processes, use --rerun-threshold,
+default 50%). Baselines are machine-specific, so none is committed: record
+one with `run --json` on the machine and environment you compare on.
+`compare` refuses a baseline from a different Python, numpy, machine or
+model version (--any-environment to compare anyway).
+
+Benchmarks: the scalar `health_gain_demo` / `health_gain_alcohol` /
+`health_gain_smoking` calls, batch throughput, cold import of the model and
+a button-click rerun of each app through Streamlit's AppTest harness
+(skipped when Streamlit is not installed).
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import numpy as np  # noqa: E402
+
+import health_gain_model as model  # noqa: E402
+import health_gain_params as params  # noqa: E402
+from bench_batch import make_population  # noqa: E402
+from health_gain_joint import health_gain_joint, health_gain_joint_batch  # noqa: E402
+from health_gain_records import ResultBuffer  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_FILE = os.path.join(HERE, "golden.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_RERUN_THRESHOLD = 0.5
+APPS = ("ai_health_gain_demo.py", "ai_health_gain_demo 01.py", "ai_health_gain_demo 02.py")
+
+# Golden values are computed with the built-in coefficients, so recalibrating
+# data/params.json never trips them; only code changes do.
+GOLDEN_PARAMS = params.BUILTIN
+
+
+# ------------------------
+# Golden values
+# ------------------------
+def golden_cases():
+    """Inputs spanning the model's branches: binge threshold, RR floor, gain cap, age floor, sex labels."""
+    alcohol = [
+        [age, sex, days, drinks, years, target]
+        for age in (15, 28, 65, 90)
+        for sex in ("Male", "Female", "kvinne", "other")
+        for days, drinks, target in ((4, 2, 2), (7, 10, 0), (5, 5, 1), (3, 4, 3), (0, 0, 0), (2, 6, 5))
+        for years in (0, 60)
+    ]
+    smoking = [[now, goal] for now in (0, 1, 5, 19, 20, 40) for goal in (0, 3, 20, 40)]
+    return {"alcohol": alcohol, "smoking": smoking, "curve": [[28, "Male", 4, 2, 5], [70, "Female", 7, 10, 40]]}
+
+
+def joint_cases(cases):
+    # every alcohol case paired with a smoking case, cycling through the latter
+    return [a + s for a, s in zip(cases["alcohol"], itertools.cycle(cases["smoking"]))]
+
+
+def compute_golden(cases):
+    p = GOLDEN_PARAMS
+    return {
+        "health_gain_demo": [model.health_gain_demo(*c, params=p) for c in cases["alcohol"]],
+        "health_gain_alcohol": [model.health_gain_alcohol(c[2], c[3], c[5], params=p) for c in cases["alcohol"]],
+        "health_gain_smoking": [model.health_gain_smoking(*c, params=p) for c in cases["smoking"]],
+        "health_gain_demo_curve": [model.health_gain_demo_curve(*c, params=p) for c in cases["curve"]],
+        "health_gain_joint": [health_gain_joint(*c, params=p) for c in joint_cases(cases)],
+    }
+
+
+def check_golden(golden):
+    """List of mismatch descriptions; every fast path is checked against the stored scalar results."""
+    p = GOLDEN_PARAMS
+    cases, expected = golden["cases"], golden["results"]
+    problems = []
+
+    def same(name, got, want):
+        if got != want:
+            problems.append(name)
+
+    fresh = compute_golden(cases)
+    for name, want in expected.items():
+        same(name, fresh[name], want)
+
+    cols = [np.asarray(c) for c in zip(*cases["alcohol"])]
+    batch = model.health_gain_demo_batch(*cols, params=p)
+    same("health_gain_demo_batch",
+         [{k: batch[k][i].item() for k in model.OUTPUT_COLUMNS} for i in range(len(cols[0]))],
+         [{k: d[k] for k in model.OUTPUT_COLUMNS} for d in expected["health_gain_demo"]])
+    buf = ResultBuffer(chunk_size=64)
+    buf.score(*cols, params=p)
+    same("ResultBuffer", [r.as_dict() for r in buf], expected["health_gain_demo"])
+    smoking_cols = [np.asarray(c) for c in zip(*cases["smoking"])]
+    same("health_gain_smoking_batch", model.health_gain_smoking_batch(*smoking_cols, params=p).tolist(),
+         expected["health_gain_smoking"])
+    same("health_gain_alcohol_curve",
+         [model.health_gain_alcohol_curve(c[2], c[3], params=p) for c in cases["alcohol"]],
+         [[model.health_gain_alcohol(c[2], c[3], t, params=p) for t in model.ALCOHOL_TARGETS]
+          for c in cases["alcohol"]])
+    joint = health_gain_joint_batch(*(np.asarray(c) for c in zip(*joint_cases(cases))), params=p)
+    same("health_gain_joint_batch",
+         [{k: joint[k][i].item() for k in joint} for i in range(len(joint["rr_now"]))],
+         [{k: d[k] for k in joint} for d in expected["health_gain_joint"]])
+    return problems
+
+
+def load_golden():
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_golden():
+    cases = golden_cases()
+    results = compute_golden(cases)
+    # one case / result per line keeps diffs of the file readable
+    lines = [f'{{"model_version": {json.dumps(model.MODEL_VERSION)},']
+    for section, data in (("cases", cases), ("results", results)):
+        lines.append(f' "{section}": {{')
+        for i, (name, items) in enumerate(data.items()):
+            lines.append(f'  "{name}": [')
+            lines.append(",\n".join(f"   {json.dumps(item, ensure_ascii=False)}" for item in items))
+            lines.append("  ]" + ("," if i < len(data) - 1 else ""))
+        lines.append(" }" + ("," if section == "cases" else ""))
+    lines.append("}")
+    with open(GOLDEN_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ------------------------
+# Benchmarks (seconds per operation, best of `repeat`)
+# ------------------------
+def best_of(fn, repeat, number=1):
+    times = []
+    gc.collect()
+    gc.disable()  # like timeit: collections triggered by earlier benchmarks add noise
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - t0) / number)
+    finally:
+        gc.enable()
+    return min(times)
+
+
+def bench_scalar(repeat):
+    cases, smoking = golden_cases()["alcohol"], golden_cases()["smoking"]
+
+    def demo():
+        for c in cases:
+            model.health_gain_demo(*c)
+
+    def alcohol():
+        for c in cases:
+            model.health_gain_alcohol(c[2], c[3], c[5])
+
+    def smoke():
+        for c in smoking:
+            model.health_gain_smoking(*c)
+
+    return {
+        "scalar.health_gain_demo": best_of(demo, repeat) / len(cases),
+        "scalar.health_gain_alcohol": best_of(alcohol, repeat) / len(cases),
+        "scalar.health_gain_smoking": best_of(smoke, repeat * 10) / len(smoking),
+    }
+
+
+def bench_batch(repeat, rows):
+    cols = make_population(rows)
+    return {f"batch.health_gain_demo_batch[{rows}]": best_of(lambda: model.health_gain_demo_batch(*cols), repeat)}
+
+
+def bench_import(repeat):
+    # timed inside a fresh interpreter, so start-up noise doesn't swamp a few ms of imports
+    code = ("import time; t0 = time.perf_counter(); import health_gain_model, health_gain_params; "
+            "health_gain_params.current(); print(time.perf_counter() - t0)")
+    runs = [float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True,
+                                 text=True).stdout) for _ in range(repeat)]
+    return {"import.health_gain_model": min(runs)}
+
+
+def bench_reruns(repeat):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit not installed: skipping app reruns", file=sys.stderr)
+        return {}
+    out = {}
+    for app in APPS:
+        at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=60).run()
+        at.button[0].click().run()  # warm the process-wide caches once
+
+        def click():
+            at.button[0].click().run()
+            if at.exception:
+                raise RuntimeError(f"{app}: {at.exception[0].value}")
+        out[f"rerun.{app}"] = best_of(click, repeat * 4)
+    return out
+
+
+def run_all(args):
+    results = {}
+    results.update(bench_scalar(args.repeat))
+    results.update(bench_batch(args.repeat, args.rows))
+    results.update(bench_import(args.repeat))
+    if not args.no_apps:
+        results.update(bench_reruns(args.repeat))
+    return results
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "platform": platform.platform(), "model_version": model.MODEL_VERSION}
+
+
+# timings are only comparable when these match; "platform" (kernel build etc.) is informational
+COMPARABLE = ("python", "numpy", "machine", "model_version")
+
+
+def environment_mismatch(recorded, current):
+    """Descriptions of the COMPARABLE fields that differ, e.g. ["numpy 1.26.4 -> 2.4.6"]."""
+    return [f"{k} {recorded.get(k)} -> {current[k]}" for k in COMPARABLE if recorded.get(k) != current[k]]
+
+
+def _fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.2f} µs"
+    return f"{seconds * 1e3:9.2f} ms"
+
+
+def compare(results, baseline, threshold, rerun_threshold=DEFAULT_RERUN_THRESHOLD):
+    """Print old/new per benchmark; returns the names that regressed beyond their threshold."""
+    regressions = []
+    print(f"{'benchmark':<44}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name, now in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<44}{'—':>12}{_fmt(now):>12}{'new':>9}")
+            continue
+        change = now / old - 1 if old else 0.0
+        flag = ""
+        if change > (rerun_threshold if name.startswith("rerun.") else threshold):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44}{_fmt(old):>12}{_fmt(now):>12}{change:>+8.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Health gain benchmark suite.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    g = sub.add_parser("golden", help="check (or --write) the golden values")
+    g.add_argument("--write", action="store_true")
+    for name in ("run", "compare"):
+        p = sub.add_parser(name)
+        p.add_argument("--repeat", type=int, default=5)
+        p.add_argument("--rows", type=int, default=1_000_000, help="rows for the batch benchmark")
+        p.add_argument("--no-apps", action="store_true", help="skip the AppTest reruns")
+    sub.choices["run"].add_argument("--json", help="write the results here, for a later compare --baseline")
+    sub.choices["compare"].add_argument("--baseline", required=True, help="an earlier run --json file")
+    sub.choices["compare"].add_argument("--any-environment", action="store_true",
+                                        help="compare even if the baseline came from another environment")
+    sub.choices["compare"].add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                        help="allowed slow-down as a fraction (default: %(default)s)")
+    sub.choices["compare"].add_argument("--rerun-threshold", type=float, default=DEFAULT_RERUN_THRESHOLD,
+                                        help="the same for the app reruns (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "golden" and args.write:
+        write_golden()
+        print(f"wrote {GOLDEN_FILE}")
+        return 0
+    problems = check_golden(load_golden())
+    if problems:
+        print(f"golden values changed: {', '.join(problems)}", file=sys.stderr)
+        return 1
+    print("golden values: ok")
+    if args.cmd == "golden":
+        return 0
+
+    results = run_all(args)
+    if args.cmd == "run":
+        for name, seconds in results.items():
+            print(f"{name:<44}{_fmt(seconds):>12}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"environment": environment(), "results": results}, f, indent=2)
+                f.write("\n")
+            print(f"saved {args.json}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    mismatch = environment_mismatch(baseline["environment"], environment())
+    if mismatch and not args.any_environment:
+        print(f"baseline is from another environment ({', '.join(mismatch)}); "
+              "record one here with run --json, or pass --any-environment", file=sys.stderr)
+        return 2
+    regressions = compare(results, baseline["results"], args.threshold, args.rerun_threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
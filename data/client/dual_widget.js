@@ -0,0 +1,187 @@
+/* Browser-side UI for the dual (alcohol + smoking) apps; see health_gain_client.py.
+ *
+ * Builds the inputs and result panels from the payload, evaluates the model
+ * with HealthGain on every input event and builds the downloads as Blobs, so
+ * moving a slider never reaches the server.
+ */
+(function () {
+  "use strict";
+
+  var P = JSON.parse(document.getElementById("payload").textContent);
+  var HG = window.HealthGain;
+  var S = P.strings;
+  var params = P.params;
+  var app = document.getElementById("app");
+
+  function el(tag, attrs, html) {
+    var node = document.createElement(tag);
+    Object.keys(attrs || {}).forEach(function (k) { node.setAttribute(k, attrs[k]); });
+    if (html !== undefined) node.innerHTML = html;
+    return node;
+  }
+
+  function fill(key, values) {
+    return S[key].replace(/\{(\w+)\}/g, function (_, name) { return String(values[name]); });
+  }
+
+  function card(parent) {
+    var node = el("div", {"class": "card"});
+    parent.appendChild(node);
+    return node;
+  }
+
+  function numberInput(parent, key, min, max, value) {
+    var label = el("label", {}, S[key]);
+    var input = el("input", {type: "number", min: min, max: max, step: 1, value: value});
+    label.appendChild(input);
+    parent.appendChild(label);
+    return function () {
+      var v = Math.round(Number(input.value));
+      return Math.min(max, Math.max(min, isNaN(v) ? value : v));
+    };
+  }
+
+  function slider(parent, key, min, max, value) {
+    var label = el("label", {}, S[key] + " <output>" + value + "</output>");
+    var input = el("input", {type: "range", min: min, max: max, step: 1, value: value});
+    var out = label.querySelector("output");
+    input.addEventListener("input", function () { out.textContent = input.value; });
+    label.appendChild(input);
+    parent.appendChild(label);
+    return function () { return Number(input.value); };
+  }
+
+  function sexSelect(parent) {
+    var label = el("label", {}, S.sex);
+    var select = el("select");
+    [P.labels.male, P.labels.female].forEach(function (text) { select.appendChild(el("option", {}, text)); });
+    label.appendChild(select);
+    parent.appendChild(label);
+    return function () { return select.value; };
+  }
+
+  function barChart(values, xLabel) {
+    var max = Math.max.apply(null, values.concat([1]));
+    var bars = values.map(function (v, i) {
+      return "<div class='bar' title='" + i + ": " + v + "'><span style='height:" + (100 * v / max).toFixed(1) +
+        "%'></span><small>" + i + "</small></div>";
+    }).join("");
+    return "<div class='chart'><div class='bars'>" + bars + "</div><div class='axis'>" + xLabel + " · " +
+      S.curve_y + "</div></div>";
+  }
+
+  function tips(now, goal, bigStep) {
+    if (goal >= now) return "<p>" + S.tip_try_reduce + "</p>";
+    var out = "<p>" + fill("tip_good_start", {x: now, y: goal}) + "</p>";
+    if (now - goal >= bigStep) out += "<p>" + S.tip_reduce_one + "</p>";
+    return out + "<p>" + S.tip_support + "</p>";
+  }
+
+  function download(name, text) {
+    var url = URL.createObjectURL(new Blob([text], {type: "text/plain"}));
+    return "<a class='download' download='" + name + "' href='" + url + "'>";
+  }
+
+  function results(gainHtml, months, cap, curveHtml, tipsHtml, exportsHtml) {
+    return "<h3>" + S.your_gain + "</h3><p>" + gainHtml + "</p><p>" + S.lifespan_bar + "</p>" +
+      "<div class='progress'><span style='width:" + (100 * Math.min(months, cap) / cap).toFixed(1) + "%'></span></div>" +
+      "<p>" + S.curve_title + "</p>" + curveHtml + S.tips + tipsHtml + (exportsHtml || "");
+  }
+
+  function csvCell(value) {
+    value = String(value);
+    return /[",\r\n]/.test(value) ? '"' + value.replace(/"/g, '""') + '"' : value;
+  }
+
+  function exportsHtml(module, gainText) {
+    // same bytes as the server's LazyExports for this module
+    if (!P.layout.exports) return "";
+    var csv = module + "_gain,param_version\n" + gainText + "," + csvCell(params.version) + "\n";
+    var txt = (module === "alcohol" ? "Alcohol" : "Smoking") + " module result: +" + gainText + " months";
+    return "<hr>" + S.save_result + "<p>" + download(module + "_result.txt", txt) + S.download_txt + "</a> " +
+      download(module + "_result.csv", csv) + S.download_csv + "</a></p>";
+  }
+
+  // ---- layout ----
+  var d = P.defaults;
+  var profile = {};
+  if (P.layout.profile === "shared") {
+    app.appendChild(el("h2", {}, S.profile_title));
+    var pc = card(app);
+    profile.age = numberInput(pc, "age", 15, 90, d.age);
+    profile.sex = sexSelect(pc);
+  }
+
+  app.appendChild(el("h2", {}, S.alcohol_title));
+  var ac = card(app);
+  var alc = {};
+  if (P.layout.profile !== "shared") {
+    alc.age = numberInput(ac, "age", 15, 90, d.age);
+    alc.sex = sexSelect(ac);
+  }
+  alc.years = numberInput(ac, "years_drink", 0, 60, d.years_drink);
+  alc.now = slider(ac, "days_now", 0, 7, d.drinking_days);
+  alc.per = slider(ac, "drinks_per", 0, 10, d.drinks_per);
+  alc.goal = slider(ac, "days_goal", 0, 7, d.target_days);
+  var alcOut = el("div", {"class": "result"});
+  ac.appendChild(alcOut);
+
+  app.appendChild(el("h2", {}, S.smoking_title));
+  var sc = card(app);
+  var smk = {};
+  if (P.layout.profile !== "shared") {
+    smk.age = numberInput(sc, "age", 15, 90, d.age);
+    smk.sex = sexSelect(sc);
+  }
+  smk.years = numberInput(sc, "years_smoking", 0, 60, d.years_smoking);
+  smk.now = slider(sc, "smoking_now", 0, 40, d.cigs_now);
+  smk.goal = slider(sc, "smoking_goal", 0, 40, d.cigs_goal);
+  var smkOut = el("div", {"class": "result"});
+  sc.appendChild(smkOut);
+
+  var jointOut = null;
+  if (P.layout.joint) {
+    app.appendChild(el("h2", {}, S.joint_title));
+    jointOut = el("div", {"class": "result"});
+    card(app).appendChild(jointOut);
+  }
+
+  // ---- evaluation ----
+  var urls = [];
+
+  function update() {
+    urls.forEach(URL.revokeObjectURL);
+    urls = [];
+    var now = alc.now(), per = alc.per(), goal = alc.goal();
+    var aText = HG.alcoholText(now, per, goal, params);
+    var aCurve = P.targets.map(function (t) { return HG.alcohol(now, per, t, params); });
+    alcOut.innerHTML = results(fill("gain_a_text", {x: now, y: goal, m: aText}), HG.alcohol(now, per, goal, params),
+      P.caps.alcohol, barChart(aCurve, S.curve_a_x), tips(now, goal, 2), exportsHtml("alcohol", aText));
+
+    var cNow = smk.now(), cGoal = smk.goal();
+    var sGain = HG.smoking(cNow, cGoal, params);
+    var sCurve = P.goals.map(function (g) { return HG.smoking(cNow, g, params); });
+    smkOut.innerHTML = results(fill("gain_s_text", {x: cNow, y: cGoal, m: sGain}), sGain, P.caps.smoking,
+      barChart(sCurve, S.curve_s_x), tips(cNow, cGoal, 5), exportsHtml("smoking", String(sGain)));
+
+    if (jointOut) {
+      // the alcohol card's (simple) model plus the smoking card's value, as on the server
+      var j = HG.jointSimple(now, per, goal, cNow, cGoal, params);
+      var mText = aText === "0" ? String(j.combined_gain_months) : HG.pyFloatStr(j.combined_gain_months);
+      jointOut.innerHTML = "<h3>" + S.your_gain + "</h3><p>" +
+        fill("joint_text", {a: aText, s: String(sGain), m: mText}) + "</p>";
+    }
+    Array.prototype.forEach.call(app.querySelectorAll("a.download"), function (a) { urls.push(a.href); });
+    resize();
+  }
+
+  // grow the component's iframe to fit (Streamlit's frame-height message)
+  function resize() {
+    window.parent.postMessage({isStreamlitMessage: true, type: "streamlit:setFrameHeight",
+                               height: document.documentElement.scrollHeight}, "*");
+  }
+
+  app.addEventListener("input", update);
+  app.addEventListener("change", update);
+  update();
+})();
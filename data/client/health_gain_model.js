@@ -0,0 +1,121 @@
+/* JavaScript port of health_gain_model.py (health_gain_demo, health_gain_alcohol,
+ * health_gain_smoking) and health_gain_joint.py for browser-side evaluation.
+ *
+ * Same operation order as the Python model, and Python's rounding (correctly
+ * rounded, ties to even), so results are identical for the same parameter
+ * set. `python health_gain_client.py check` compares the two under Node.
+ * Keep in step with MODEL_VERSION.
+ */
+(function (root) {
+  "use strict";
+
+  var FEMALE_LABELS = ["female", "f", "woman", "kvinne"];
+
+  // Python's round(x, n). toFixed(100) gives the exact decimal expansion of
+  // any double >= 2**-47; below that no tie at n <= 3 decimals is possible.
+  function pyRound(x, n) {
+    n = n || 0;
+    if (!isFinite(x) || x === 0) return x;
+    var ax = Math.abs(x);
+    var r = Number(ax.toFixed(n));  // rounds ties away from zero
+    if (ax >= Math.pow(2, -47)) {
+      var exact = ax.toFixed(100);
+      var cut = exact.indexOf(".") + 1 + n;
+      if (/^50*$/.test(exact.slice(cut))) {
+        var digits = exact.slice(0, cut).replace(".", "");
+        if (Number(digits.charAt(digits.length - 1)) % 2 === 0) r = Number(exact.slice(0, cut));
+      }
+    }
+    return x < 0 ? -r : r;
+  }
+
+  // str() of a float the model rounded to a few decimals (Python repr: "4.0", "2.4")
+  function pyFloatStr(x) {
+    return Number.isInteger(x) ? x.toFixed(1) : String(x);
+  }
+
+  function sexAdj(sex, p) {
+    return FEMALE_LABELS.indexOf(String(sex).toLowerCase()) >= 0 ? p.female_adj : 1.0;
+  }
+
+  function ageAdj(age, p) {
+    return Math.max(p.age_adj_floor, p.age_adj_base - (age - p.age_adj_pivot) * p.age_adj_slope);
+  }
+
+  function alcohol(drinkingDays, drinksPerOcc, targetDays, p) {
+    return pyRound(Math.max(0, (drinkingDays - targetDays) * p.alcohol_months_per_day), 1);
+  }
+
+  // str(health_gain_alcohol(...)): max(0, x) keeps the int 0 when x <= 0
+  function alcoholText(drinkingDays, drinksPerOcc, targetDays, p) {
+    if ((drinkingDays - targetDays) * p.alcohol_months_per_day <= 0) return "0";
+    return pyFloatStr(alcohol(drinkingDays, drinksPerOcc, targetDays, p));
+  }
+
+  function smoking(cigsNow, cigsGoal, p) {
+    return pyRound(Math.max(0, (cigsNow - cigsGoal) / p.cigs_per_pack * p.smoking_months_per_pack), 0);
+  }
+
+  function demo(age, sex, drinkingDays, drinksPerOcc, yearsDrinking, targetDays, p) {
+    var now = drinkingDays * drinksPerOcc;
+    var after = targetDays * drinksPerOcc;
+    var binge = drinksPerOcc >= p.binge_drinks ? 1 : 0;
+    var adjust = sexAdj(sex, p) * ageAdj(age, p);
+
+    var rrNow = 1 + p.a * now + p.b * binge + p.c * (yearsDrinking / 20.0);
+    var rrAfter = 1 + p.a * after + p.b * binge + p.c * (yearsDrinking / 20.0);
+    rrNow = Math.max(rrNow, p.rr_floor);
+    rrAfter = Math.max(rrAfter, p.rr_floor);
+
+    var gainYears = p.k * (rrNow - rrAfter) / rrNow * adjust;
+    gainYears = Math.max(0.0, Math.min(gainYears, p.gain_cap_years));
+
+    return {
+      age: age, sex: sex,
+      now_drinks_per_week: now,
+      after_drinks_per_week: after,
+      rr_now: pyRound(rrNow, 3),
+      rr_after: pyRound(rrAfter, 3),
+      gain_years: pyRound(gainYears, 2),
+      gain_months: pyRound(gainYears * 12, 0),
+      param_version: p.version
+    };
+  }
+
+  function joint(age, sex, drinkingDays, drinksPerOcc, yearsDrinking, targetDays, cigsNow, cigsGoal, p) {
+    var detail = demo(age, sex, drinkingDays, drinksPerOcc, yearsDrinking, targetDays, p);
+    var s = smoking(cigsNow, cigsGoal, p);
+    return {
+      age: age, sex: sex,
+      rr_now: detail.rr_now,
+      rr_after: detail.rr_after,
+      alcohol_gain_months: detail.gain_months,
+      smoking_gain_months: s,
+      combined_gain_months: detail.gain_months + s,
+      param_version: p.version
+    };
+  }
+
+  function jointSimple(drinkingDays, drinksPerOcc, targetDays, cigsNow, cigsGoal, p) {
+    var a = alcohol(drinkingDays, drinksPerOcc, targetDays, p);
+    var s = smoking(cigsNow, cigsGoal, p);
+    return {
+      alcohol_gain_months: a,
+      smoking_gain_months: s,
+      combined_gain_months: pyRound(a + s, 1),
+      param_version: p.version
+    };
+  }
+
+  function curve(fn, targets) {
+    return targets.map(fn);
+  }
+
+  var HealthGain = {
+    pyRound: pyRound, pyFloatStr: pyFloatStr, sexAdj: sexAdj, ageAdj: ageAdj,
+    alcohol: alcohol, alcoholText: alcoholText, smoking: smoking, demo: demo, joint: joint,
+    jointSimple: jointSimple, curve: curve
+  };
+  if (typeof module !== "undefined" && module.exports) module.exports = HealthGain;
+  else root.HealthGain = HealthGain;
+})(this);
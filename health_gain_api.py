@@ -0,0 +1,299 @@
+"""Small asyncio HTTP/JSON scoring service (stdlib only).
+
+Partner apps get the same numbers as the Streamlit app without a Streamlit
+session per request:
+
+    POST /v1/alcohol          health_gain_demo -> the app's "See model details" JSON
+    POST /v1/alcohol/simple   health_gain_alcohol -> {"alcohol_gain": ...}
+    POST /v1/smoking          health_gain_smoking -> {"smoking_gain": ...}
+    POST /v1/joint            health_gain_joint -> per-behaviour and combined months
+    POST /v1/alcohol/curve, /v1/alcohol/simple/curve, /v1/smoking/curve
+                              the same without the goal field: one result per
+                              goal value (0-7 days, 0-40 cigarettes)
+    GET  /healthz
+    GET  /metrics, /metrics.json   per-route timings (with --profile)
+
+Each POST takes one JSON object, or a JSON array of objects which is scored
+in one vectorized pass and answered with an array in the same order.
+Numeric fields must lie in the apps' input ranges (`model.INPUT_RANGES`);
+anything else is a 400 naming the item and field.
+Bodies over 64 KiB are parsed and scored in a worker thread, so a big
+batch doesn't stall the other connections. A request is scored with one
+parameter set (see `health_gain_params`), whose version every result
+carries as "param_version"; with --watch-params the parameter file is
+hot-reloaded without restarting the service.
+
+    python health_gain_api.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+import math
+import numbers
+import sys
+import traceback
+
+import health_gain_model as model
+from health_gain_joint import JOINT_INPUT_COLUMNS, JOINT_OUTPUT_COLUMNS, health_gain_joint, health_gain_joint_batch
+import health_gain_params as params
+import health_gain_profile as profile
+from health_gain_records import ResultBuffer
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+EXECUTOR_BODY_BYTES = 64 * 1024  # larger bodies (~500+ records) are scored off the event loop
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class JSONText(str):
+    """A response body that is already JSON (e.g. `ResultBuffer.to_json`), sent as is."""
+
+
+class BadRequest(ValueError):
+    def __init__(self, message, item=None, field=None):
+        super().__init__(message)
+        self.item, self.field = item, field
+
+    def payload(self):
+        extra = {k: v for k, v in (("item", self.item), ("field", self.field)) if v is not None}
+        return {"error": str(self), **extra}
+
+
+# ------------------------
+# Scoring
+# ------------------------
+def _columns(records, fields, text_fields=()):
+    cols = {f: [] for f in fields}
+    for i, rec in enumerate(records):
+        if not isinstance(rec, dict):
+            raise BadRequest(f"item {i}: expected a JSON object", i)
+        for f in fields:
+            if f not in rec:
+                raise BadRequest(f"item {i}: missing field {f!r}", i, f)
+            value = rec[f]
+            if f in text_fields:
+                if not isinstance(value, str):
+                    raise BadRequest(f"item {i}: {f!r} must be a string", i, f)
+            elif isinstance(value, bool) or not isinstance(value, numbers.Real) or not math.isfinite(value):
+                raise BadRequest(f"item {i}: {f!r} must be a finite number", i, f)
+            else:
+                lo, hi = model.INPUT_RANGES[f]
+                if not lo <= value <= hi:
+                    raise BadRequest(f"item {i}: {f!r} must be between {lo} and {hi}", i, f)
+            cols[f].append(value)
+    return cols
+
+
+def score_alcohol(records, p):
+    cols = _columns(records, model.INPUT_COLUMNS, ("sex",))
+    if len(records) == 1:
+        return [model.health_gain_demo(*(cols[f][0] for f in model.INPUT_COLUMNS), params=p)]
+    buf = ResultBuffer()
+    try:
+        # columns straight to JSON text: no result dict per record
+        buf.score(*(cols[f] for f in model.INPUT_COLUMNS), params=p)
+        return JSONText(buf.to_json())
+    except ValueError:
+        pass  # fractional age / drinks per week don't fit the compact columns
+    out = model.health_gain_demo_batch(*(cols[f] for f in model.INPUT_COLUMNS), params=p)
+    now = [d * n for d, n in zip(cols["drinking_days"], cols["drinks_per_occ"])]
+    after = [t * n for t, n in zip(cols["target_days"], cols["drinks_per_occ"])]
+    columns = [cols["age"], cols["sex"], now, after] + [out[c].tolist() for c in model.OUTPUT_COLUMNS]
+    return [dict(zip(model.DETAIL_COLUMNS, row), param_version=p.version) for row in zip(*columns)]
+
+
+def score_alcohol_simple(records, p):
+    fields = ["drinking_days", "drinks_per_occ", "target_days"]
+    cols = _columns(records, fields)
+    return [{"alcohol_gain": model.health_gain_alcohol(*row, params=p), "param_version": p.version}
+            for row in zip(*(cols[f] for f in fields))]
+
+
+def score_smoking(records, p):
+    cols = _columns(records, model.SMOKING_INPUT_COLUMNS)
+    if len(records) == 1:
+        gains = [model.health_gain_smoking(cols["cigs_now"][0], cols["cigs_goal"][0], params=p)]
+    else:
+        gains = model.health_gain_smoking_batch(cols["cigs_now"], cols["cigs_goal"], params=p).tolist()
+    return [{"smoking_gain": g, "param_version": p.version} for g in gains]
+
+
+def score_joint(records, p):
+    cols = _columns(records, JOINT_INPUT_COLUMNS, ("sex",))
+    if len(records) == 1:
+        return [health_gain_joint(*(cols[f][0] for f in JOINT_INPUT_COLUMNS), params=p)]
+    out = health_gain_joint_batch(*(cols[f] for f in JOINT_INPUT_COLUMNS), params=p)
+    columns = [cols["age"], cols["sex"]] + [out[c].tolist() for c in JOINT_OUTPUT_COLUMNS]
+    return [dict(zip(["age", "sex"] + JOINT_OUTPUT_COLUMNS, row), param_version=p.version)
+            for row in zip(*columns)]
+
+
+def curve_alcohol(records, p):
+    fields = model.INPUT_COLUMNS[:-1]
+    cols = _columns(records, fields, ("sex",))
+    return [{"target_days": list(model.ALCOHOL_TARGETS), "results": model.health_gain_demo_curve(*row, params=p),
+             "param_version": p.version}
+            for row in zip(*(cols[f] for f in fields))]
+
+
+def curve_alcohol_simple(records, p):
+    cols = _columns(records, ["drinking_days", "drinks_per_occ"])
+    return [{"target_days": list(model.ALCOHOL_TARGETS),
+             "alcohol_gain": model.health_gain_alcohol_curve(*row, params=p), "param_version": p.version}
+            for row in zip(cols["drinking_days"], cols["drinks_per_occ"])]
+
+
+def curve_smoking(records, p):
+    cols = _columns(records, ["cigs_now"])
+    return [{"cigs_goal": list(model.SMOKING_GOALS), "smoking_gain": model.health_gain_smoking_curve(c, params=p),
+             "param_version": p.version}
+            for c in cols["cigs_now"]]
+
+
+ROUTES = {
+    "/v1/alcohol": score_alcohol,
+    "/v1/alcohol/simple": score_alcohol_simple,
+    "/v1/smoking": score_smoking,
+    "/v1/joint": score_joint,
+    "/v1/alcohol/curve": curve_alcohol,
+    "/v1/alcohol/simple/curve": curve_alcohol_simple,
+    "/v1/smoking/curve": curve_smoking,
+}
+
+
+def handle(method, path, body):
+    """Return (status, payload) for one request."""
+    path = path.split("?", 1)[0]
+    if path == "/healthz":
+        return 200, {"status": "ok", "model_version": model.MODEL_VERSION,
+                     "param_version": params.current().version}
+    if path == "/metrics":
+        return 200, profile.REGISTRY.to_prometheus()
+    if path == "/metrics.json":
+        return 200, profile.REGISTRY.to_dict()
+    if path not in ROUTES:
+        return 404, {"error": f"no route {path}"}
+    if method != "POST":
+        return 405, {"error": "use POST"}
+    try:
+        data = json.loads(body or b"null")
+    except ValueError as exc:
+        return 400, {"error": f"invalid JSON: {exc}"}
+    many = isinstance(data, list)
+    records = data if many else [data]
+    if not records:
+        return 200, []
+    try:
+        with profile.stage(path):
+            results = ROUTES[path](records, params.current())
+    except BadRequest as exc:
+        return 400, exc.payload()
+    return 200, results if many else results[0]
+
+
+# ------------------------
+# HTTP
+# ------------------------
+def _encode(payload):
+    if isinstance(payload, JSONText):
+        return payload.encode("utf-8"), "application/json"
+    if isinstance(payload, str):
+        return payload.encode("utf-8"), "text/plain; version=0.0.4"
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+
+
+def _respond(method, target, body):
+    """(status, body bytes, content type) for one request."""
+    try:
+        status, payload = handle(method, target, body)
+    except Exception:  # never drop the connection on a scoring bug
+        print(f"health_gain_api: {method} {target} failed", file=sys.stderr)
+        traceback.print_exc()
+        status, payload = 500, {"error": "internal error"}
+    return (status,) + _encode(payload)
+
+
+async def _serve_connection(reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                status, (data, ctype) = 400, _encode({"error": "invalid Content-Length"})
+                keep_alive = False
+            elif length > MAX_BODY_BYTES:
+                status, (data, ctype) = 413, _encode({"error": "request body too large"})
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                if length > EXECUTOR_BODY_BYTES:
+                    # a big batch: parse, score and encode it in a worker thread so the
+                    # event loop keeps serving every other connection meanwhile
+                    loop = asyncio.get_running_loop()
+                    status, data, ctype = await loop.run_in_executor(None, _respond, method, target, body)
+                else:
+                    status, data, ctype = _respond(method, target, body)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {ctype}; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8080):
+    server = await asyncio.start_server(_serve_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Health gain scoring API")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--profile", action="store_true", help="record per-route timings for /metrics")
+    ap.add_argument("--watch-params", action="store_true",
+                    help="hot-reload the parameter file (HEALTH_GAIN_PARAMS or data/params.json) when it changes")
+    args = ap.parse_args(argv)
+    if args.profile:
+        profile.enable()
+    if args.watch_params:
+        params.watch()
+    else:
+        params.current()
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+"""One configurable Streamlit app for every variant of the demo.
+
+A `Variant` picks the layout and the alcohol model:
+
+    form      single-form alcohol app: the `health_gain_demo` model (age, sex,
+              years) with relative risks, uncertainty band, details and downloads
+    dual      alcohol + smoking modules over one shared profile, plus the joint
+              result (the `health_gain_alcohol` days-and-drinks model)
+    modules   alcohol + smoking modules, each asking age and sex, with downloads
+
+Everything shared is loaded once per process and used by every variant and
+session: the string catalogs, the parameter set, the result cache and the
+lookup table. One server can therefore serve all variants; switching is a
+rerun, not a new process:
+
+    python3 -m streamlit run health_gain_app.py     # variant picker in the sidebar; ?variant=form links
+    HEALTH_GAIN_VARIANT=form python3 -m streamlit run health_gain_app.py
+
+The `ai_health_gain_demo*.py` scripts are thin wrappers that pin one variant.
+"""
+import itertools
+import os
+from datetime import datetime
+from typing import NamedTuple
+
+import streamlit as st
+
+import health_gain_client as client
+import health_gain_i18n as i18n
+import health_gain_model as model
+import health_gain_params as params
+import health_gain_profile as profile
+import health_gain_progress as progress
+import health_gain_session as session
+import health_gain_telemetry as telemetry
+from health_gain_cache import LRUCache
+from health_gain_export import LazyExports
+from health_gain_joint import health_gain_joint, health_gain_joint_simple
+from health_gain_uncertainty import DEFAULT_DRAWS, gain_months_bands
+
+VARIANT_ENV = "HEALTH_GAIN_VARIANT"
+LAYOUTS = ("form", "dual")
+ALCOHOL_MODELS = ("demo", "simple")
+
+
+class Variant(NamedTuple):
+    """What one app variant shows.
+
+    layout          "form" (alcohol only, one form) or "dual" (alcohol + smoking modules)
+    alcohol_model   "demo" (age, sex and years; needed by the form) or "simple" (days and drinks only)
+    shared_profile  dual: one age/sex for every module rather than one per module
+    joint           dual: add the combined alcohol + smoking result
+    exports         dual: TXT/CSV downloads under each result (the form always has them)
+    tracker         dual: the weekly check-in (shown when HEALTH_GAIN_PROGRESS_DB is set)
+    """
+    layout: str = "dual"
+    alcohol_model: str = "simple"
+    shared_profile: bool = True
+    joint: bool = True
+    exports: bool = False
+    tracker: bool = True
+
+
+VARIANTS = {
+    "form": Variant(layout="form", alcohol_model="demo", joint=False, exports=True, tracker=False),
+    "dual": Variant(),
+    "modules": Variant(shared_profile=False, joint=False, exports=True),
+}
+DEFAULT_VARIANT = "dual"
+
+
+def validate(variant):
+    if variant.layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {variant.layout!r}; expected one of {LAYOUTS}")
+    if variant.alcohol_model not in ALCOHOL_MODELS:
+        raise ValueError(f"unknown alcohol model {variant.alcohol_model!r}; expected one of {ALCOHOL_MODELS}")
+    if variant.layout == "form" and variant.alcohol_model != "demo":
+        raise ValueError("the form layout needs the 'demo' alcohol model")
+    return variant
+
+
+# ------------------------
+# Shared resources (one per process, every variant and session)
+# ------------------------
+@st.cache_resource
+def result_cache():
+    # keys hold the Params tuple itself, not its version string: a hot-reloaded
+    # file with new coefficients but the same "version" must not hit old entries
+    return LRUCache(maxsize=int(os.environ.get("HEALTH_GAIN_CACHE_SIZE", 1024)))
+
+
+@st.cache_resource
+def lookup_table(path):
+    # HEALTH_GAIN_LUT=<dir> serves the form's results from the precomputed
+    # table (rebuilt when the parameter version changes)
+    from health_gain_lut import LookupTable
+
+    return LookupTable.load_or_build(path, params=params.current())
+
+
+def demo_curve(age, sex, drinking_days, drinks_per_occ, years_drinking, p):
+    # `detail` for every target_days value in one vectorized call; moving the
+    # goal slider only picks another entry
+    key = (model.MODEL_VERSION, p, "curve", age, sex, drinking_days, drinks_per_occ, years_drinking)
+    return result_cache().get_or_compute(key, lambda: model.health_gain_demo_curve(
+        age, sex, drinking_days, drinks_per_occ, years_drinking, params=p))
+
+
+def alcohol_curve(drinking_days, drinks_per_occ, p):
+    return result_cache().get_or_compute(
+        (model.MODEL_VERSION, p, "alcohol_curve", drinking_days, drinks_per_occ),
+        lambda: model.health_gain_alcohol_curve(drinking_days, drinks_per_occ, params=p))
+
+
+def smoking_curve(cigs_now, p):
+    return result_cache().get_or_compute((model.MODEL_VERSION, p, "smoking_curve", cigs_now),
+                                         lambda: model.health_gain_smoking_curve(cigs_now, params=p))
+
+
+def alcohol_months_curve(variant, age, sex, drinking_days, drinks_per_occ, years_drinking, p):
+    """Gain in months for every goal, from the variant's alcohol model."""
+    if variant.alcohol_model == "demo":
+        return [d["gain_months"] for d in demo_curve(age, sex, drinking_days, drinks_per_occ, years_drinking, p)]
+    return alcohol_curve(drinking_days, drinks_per_occ, p)
+
+
+def module_exports(name, gain, p):
+    """One module's TXT/CSV downloads; cached, they don't depend on the language."""
+    return result_cache().get_or_compute(
+        (model.MODEL_VERSION, p, "exports", name, gain),
+        lambda: LazyExports({f"{name}_gain": gain, "param_version": p.version},
+                            txt=lambda: f"{name.capitalize()} module result: +{gain} months"))
+
+
+# ------------------------
+# Form layout
+# ------------------------
+FORM_CSS = """
+    <style>
+      html, body, [class*="css"] {
+        font-family: Inter, -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif;
+      }
+      :root { --uio-red: #9b1c1c; }
+      .uio-accent { color: var(--uio-red) !important; }
+      .card {
+        border: 1px solid rgba(0,0,0,0.07);
+        border-radius: 16px;
+        padding: 18px 20px;
+        box-shadow: 0 1px 10px rgba(0,0,0,0.06);
+        background: #fff;
+      }
+      .lang-switch { position: sticky; top: 0; left: 0; z-index: 100; padding-top: 6px; margin-bottom: 4px; }
+    </style>
+    """
+
+
+def language_radio(layout, **kwargs):
+    """The session's language radio over the layout's catalogs; default from session state only, never `index=`."""
+    options = i18n.languages(layout)  # a new data/locales/<layout>/<lang>.json shows up here
+    # a widget default on top of a session_state value makes Streamlit warn on every carry-over
+    if st.session_state.get("lang") not in options:
+        st.session_state["lang"] = i18n.DEFAULT_LANG
+    return st.radio("Language", options, horizontal=True, key="lang", **kwargs)
+
+
+def form_language():
+    with st.container():
+        st.markdown('<div class="lang-switch">', unsafe_allow_html=True)
+        cols = st.columns([0.22, 0.78])
+        with cols[0]:
+            lang = language_radio("form", label_visibility="collapsed")
+        with cols[1]:
+            st.write("")
+        st.markdown('</div>', unsafe_allow_html=True)
+    return lang
+
+
+def demo_result(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, T, p):
+    """Model output plus lazily built exports; cacheable per (versions, language, inputs)."""
+    with profile.stage("model"):
+        path = os.environ.get("HEALTH_GAIN_LUT")
+        lut = lookup_table(path) if path else None
+        if lut is not None and lut.params != p:
+            lookup_table.clear()
+            lut = lookup_table(path)
+        if lut is not None:
+            detail = lut.alcohol(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=p)
+        else:
+            detail = demo_curve(age, sex, drinking_days, drinks_per_occ, years_drinking, p)[target_days]
+    headline = T.format("headline", now=drinking_days, goal=target_days, months=detail["gain_months"])
+    # The TXT header carries a timestamp, so only the body is cached.
+    txt_body = lambda: (
+        f"{headline}\n\n"
+        f"{T['txt_inputs']}:\n"
+        f"- {T['txt_age']}: {detail['age']}\n"
+        f"- {T['txt_sex']}: {detail['sex']}\n"
+        f"- {T['txt_days']}: {drinking_days} → {target_days}\n"
+        f"- {T['txt_drinks_occ']}: {drinks_per_occ}\n"
+        f"- {T['txt_years']}: {years_drinking}\n\n"
+        f"{T['txt_model']}:\n"
+        f"- {T['txt_rr']}: {detail['rr_now']} / {detail['rr_after']}\n"
+        f"- {T['txt_gain']}: {detail['gain_months']} {T['unit_months']}\n"
+    )
+    # Fixed seed: the same inputs always show the same band (and stay cacheable)
+    with profile.stage("bands"):
+        bands = gain_months_bands(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                                  n_draws=DEFAULT_DRAWS, seed=0, params=p)
+    return {"headline": headline, "detail": detail, "bands": bands,
+            "exports": LazyExports(detail, txt=txt_body)}
+
+
+def form_page(T, lang, p, sess, prof):
+    st.markdown(f"# <span class='uio-accent'>{T['title']}</span>", unsafe_allow_html=True)
+    st.markdown(T["subtitle"])
+
+    with st.container():
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        with st.form("inputs"):
+            col1, col2 = st.columns(2)
+            with col1:
+                age = st.number_input(T["age"], min_value=15, max_value=90, value=28, step=1)
+                sex = st.selectbox(T["sex"], [T["male"], T["female"]])
+                years_drinking = st.number_input(T["years_drink"], min_value=0, max_value=60, value=5, step=1)
+            with col2:
+                drinking_days = st.slider(T["days_now"], 0, 7, 4)
+                drinks_per_occ = st.slider(T["drinks_per"], 0, 10, 2)
+                target_days = st.slider(T["days_goal"], 0, 7, 2)
+
+            submitted = st.form_submit_button(T["calc"])
+        st.markdown("</div>", unsafe_allow_html=True)
+    prof.mark("inputs")
+
+    if submitted:
+        st.subheader(T["your_gain"])
+        inputs = (age, sex, drinking_days, drinks_per_occ, years_drinking, target_days)
+        result = result_cache().get_or_compute((model.MODEL_VERSION, p, lang, "form") + inputs,
+                                               lambda: demo_result(*inputs, T, p))
+        headline, detail = result["headline"], result["detail"]
+        telemetry.record("alcohol", telemetry.session_token(sess), age=age, sex=sex,
+                         drinking_days=drinking_days, drinks_per_occ=drinks_per_occ, years=years_drinking,
+                         target_days=target_days, gain_months=detail["gain_months"])
+        st.success(headline)
+        st.caption(T.format("band", lo=result["bands"]["p5"], hi=result["bands"]["p95"], n=DEFAULT_DRAWS))
+
+        st.markdown(T["lifespan_bar"])
+        cap_months = model.ALCOHOL_BAR_CAP_MONTHS
+        st.progress(min(detail["gain_months"], cap_months) / cap_months)
+
+        st.markdown(T["curve_title"])
+        curve = demo_curve(age, sex, drinking_days, drinks_per_occ, years_drinking, p)
+        st.bar_chart({"goal": list(model.ALCOHOL_TARGETS), "months": [d["gain_months"] for d in curve]},
+                     x="goal", y="months", x_label=T["curve_x"], y_label=T["curve_y"])
+
+        tips(T, drinking_days, target_days, 2)
+
+        with st.expander(T["see_details"]):
+            st.json(detail)
+
+        # ---- Downloads ----
+        st.markdown("---")
+        st.markdown(T["save_result"])
+
+        exports = result["exports"]
+        with profile.stage("export"):
+            txt = f"{T['txt_title']}\nTime: {datetime.utcnow().isoformat()}Z\n\n" + exports.txt
+            csv_data = exports.csv
+        st.download_button(T["download_txt"], txt, file_name="ai_health_gain_result.txt")
+        st.download_button(T["download_csv"], csv_data, file_name="ai_health_gain_result.csv")
+    prof.mark("results")
+
+
+# ------------------------
+# Dual layout
+# ------------------------
+DUAL_CSS = """
+    <style>
+      html, body, [class*="css"] {
+        font-family: Inter, -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif;
+      }
+      .card {
+        background: #ffffff;
+        border: 1px solid rgba(0,0,0,0.06);
+        border-radius: 14px;
+        padding: 16px 18px;
+        margin-bottom: 20px;
+        box-shadow: 0 1px 8px rgba(0,0,0,0.05);
+      }
+      .highlight-number {
+        font-size: 28px;
+        font-weight: 800;
+        color: #2E8B57;
+      }
+      .block-container { padding-top: 1.2rem; }
+      .stSlider { margin-top: 0 !important; }
+    </style>
+    """
+
+
+def dual_language():
+    return language_radio("dual")
+
+
+def profile_inputs(T, key=None):
+    """Age and sex; `key` suffixes the widget keys when every module asks for its own."""
+    age = st.number_input(T["age"], min_value=15, max_value=90, value=28, step=1, key=key and f"age_{key}")
+    sex = st.selectbox(T["sex"], [T["male"], T["female"]], key=key and f"sex_{key}")
+    return age, sex
+
+
+def tips(T, now, goal, big_step):
+    st.markdown(T["tips"])
+    if goal < now:
+        st.write(T.format("tip_good_start", x=now, y=goal))
+        if now - goal >= big_step:
+            st.write(T["tip_reduce_one"])
+        st.write(T["tip_support"])
+    else:
+        st.write(T["tip_try_reduce"])
+
+
+def module_result(T, text_key, now, goal, gain, cap, goals, curve, x_label, big_step):
+    st.subheader(T["your_gain"])
+    st.markdown(T.format(text_key, x=now, y=goal, m=gain), unsafe_allow_html=True)
+    st.markdown(T["lifespan_bar"])
+    st.progress(min(gain, cap) / cap)
+
+    st.markdown(T["curve_title"])
+    st.bar_chart({"goal": list(goals), "months": curve}, x="goal", y="months",
+                 x_label=T[x_label], y_label=T["curve_y"])
+    tips(T, now, goal, big_step)
+
+
+def download_exports(T, name, gain, p):
+    st.markdown("---")
+    st.markdown(T["save_result"])
+    exports = module_exports(name, gain, p)
+    with profile.stage("export"):
+        txt, csv_data = exports.txt, exports.csv
+    st.download_button(T["download_txt"], txt, file_name=f"{name}_result.txt")
+    st.download_button(T["download_csv"], csv_data, file_name=f"{name}_result.csv")
+
+
+def dual_page(variant, T, lang, p, sess, prof):
+    st.markdown(f"# {T['title']}")
+    st.markdown(T["subtitle"])
+
+    if client.enabled() and variant.alcohol_model == "simple":
+        # HEALTH_GAIN_CLIENT_MODE=1: every module is evaluated in the browser, so
+        # slider moves never rerun this script (the JS port has the simple model only)
+        client.render(lang, p, shared_profile=variant.shared_profile, joint=variant.joint, exports=variant.exports)
+        return
+
+    if variant.shared_profile:
+        st.markdown(f"## {T['profile_title']}")
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        col_p1, col_p2 = st.columns(2)
+        with col_p1:
+            age = st.number_input(T["age"], min_value=15, max_value=90, value=28, step=1)
+        with col_p2:
+            sex = st.selectbox(T["sex"], [T["male"], T["female"]])
+        st.markdown("</div>", unsafe_allow_html=True)
+        prof.mark("profile_inputs")
+
+    # ---- Alcohol ----
+    st.markdown(f"## {T['alcohol_title']}")
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        if not variant.shared_profile:
+            age, sex = profile_inputs(T)
+        years_drink = st.number_input(T["years_drink"], min_value=0, max_value=60, value=5, step=1)
+    with col2:
+        drinking_days = st.slider(T["days_now"], 0, 7, 5)
+        drinks_per = st.slider(T["drinks_per"], 0, 10, 2)
+        target_days = st.slider(T["days_goal"], 0, 7, 2)
+
+    calc_a = st.button(T["calc_button_a"])
+    st.markdown("</div>", unsafe_allow_html=True)
+    prof.mark("alcohol_inputs")
+
+    if calc_a:
+        # every goal in one call: the chart and the selected goal come from the same curve
+        with profile.stage("model"):
+            curve_a = alcohol_months_curve(variant, age, sex, drinking_days, drinks_per, years_drink, p)
+        alcohol_gain = curve_a[target_days]
+        telemetry.record("alcohol" if variant.alcohol_model == "demo" else "alcohol_simple",
+                         telemetry.session_token(sess), age=age, sex=sex,
+                         drinking_days=drinking_days, drinks_per_occ=drinks_per, years=years_drink,
+                         target_days=target_days, gain_months=alcohol_gain)
+        module_result(T, "gain_a_text", drinking_days, target_days, alcohol_gain, model.ALCOHOL_BAR_CAP_MONTHS,
+                      model.ALCOHOL_TARGETS, curve_a, "curve_a_x", 2)
+        if variant.exports:
+            download_exports(T, "alcohol", alcohol_gain, p)
+    prof.mark("alcohol_results")
+
+    # ---- Smoking ----
+    st.markdown(f"## {T['smoking_title']}")
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    col3, col4 = st.columns(2)
+    with col3:
+        if variant.shared_profile:
+            age_s, sex_s = age, sex
+        else:
+            age_s, sex_s = profile_inputs(T, key="s")
+        years_smoking = st.number_input(T["years_smoking"], min_value=0, max_value=60, value=5, step=1, key="ys")
+    with col4:
+        cigs_now = st.slider(T["smoking_now"], 0, 40, 20, key="sn")
+        cigs_goal = st.slider(T["smoking_goal"], 0, 40, 0, key="sg")
+
+    calc_s = st.button(T["calc_button_s"])
+    st.markdown("</div>", unsafe_allow_html=True)
+    prof.mark("smoking_inputs")
+
+    if calc_s:
+        with profile.stage("model"):
+            curve_s = smoking_curve(cigs_now, p)
+        smoking_gain = curve_s[cigs_goal]
+        telemetry.record("smoking", telemetry.session_token(sess), age=age_s, sex=sex_s,
+                         cigs_now=cigs_now, cigs_goal=cigs_goal, gain_months=smoking_gain)
+        module_result(T, "gain_s_text", cigs_now, cigs_goal, smoking_gain, model.SMOKING_BAR_CAP_MONTHS,
+                      model.SMOKING_GOALS, curve_s, "curve_s_x", 5)
+        if variant.exports:
+            download_exports(T, "smoking", smoking_gain, p)
+    prof.mark("smoking_results")
+
+    if variant.joint:
+        # ---- Both together ----
+        st.markdown(f"## {T['joint_title']}")
+        if st.button(T["calc_button_joint"]):
+            # the same alcohol model as the card above, so the two results agree
+            with profile.stage("model"):
+                if variant.alcohol_model == "demo":
+                    joint = health_gain_joint(age, sex, drinking_days, drinks_per, years_drink, target_days,
+                                              cigs_now, cigs_goal, params=p)
+                else:
+                    joint = health_gain_joint_simple(drinking_days, drinks_per, target_days, cigs_now, cigs_goal,
+                                                     params=p)
+            telemetry.record("joint", telemetry.session_token(sess), age=age, sex=sex,
+                             drinking_days=drinking_days, drinks_per_occ=drinks_per, years=years_drink,
+                             target_days=target_days, cigs_now=cigs_now, cigs_goal=cigs_goal,
+                             gain_months=joint["combined_gain_months"])
+            st.subheader(T["your_gain"])
+            st.markdown(T.format("joint_text", a=joint["alcohol_gain_months"], s=joint["smoking_gain_months"],
+                                 m=joint["combined_gain_months"]), unsafe_allow_html=True)
+        prof.mark("joint_results")
+
+
+def tracker_page(T, p):
+    """Weekly check-in: banks this week against the user's first one (see health_gain_progress)."""
+    tracker = progress.store()
+    st.markdown(f"## {T['progress_title']}")
+    st.markdown(T["progress_intro"])
+    with st.form("checkin"):
+        name = st.text_input(T["progress_name"], type="password", key="tracker_name")
+        col1, col2 = st.columns(2)
+        with col1:
+            drinking_days = st.slider(T["progress_days"], 0, progress.MAX_DRINKING_DAYS, 3)
+        with col2:
+            cigs = st.slider(T["progress_cigs"], 0, progress.MAX_CIGS, 10)
+        submitted = st.form_submit_button(T["progress_button"])
+    if not name.strip():
+        return
+
+    if submitted:
+        with profile.stage("progress"):
+            gain = tracker.check_in(name, drinking_days, cigs, params=p)
+    state = tracker.progress(name)  # one row, however long the history
+    if state is None:
+        return
+    if submitted:
+        st.success(T["progress_first"] if state.weeks == 1 else T.format("progress_banked", d=gain))
+    col1, col2 = st.columns(2)
+    col1.metric(T["progress_total"], f"{state.gain_days:.1f}")
+    col2.metric(T["progress_weeks"], state.weeks)
+    st.caption(T.format("progress_baseline", w=progress.week_start(state.first_week).isoformat(),
+                        x=state.base_drinking_days, y=state.base_cigs))
+    if state.weeks > 1:
+        history = tracker.history(name)
+        st.line_chart({"week": [progress.week_start(week) for week, _, _, _ in history],
+                       "days": list(itertools.accumulate(gain for _, _, _, gain in history))},
+                      x="week", y="days", x_label=T["progress_chart_x"], y_label=T["progress_total"])
+
+
+# ------------------------
+# Entry point
+# ------------------------
+def _keep_language():
+    # the layouts' language radios are different widgets; carry the choice over
+    if "lang" in st.session_state:
+        st.session_state["lang"] = st.session_state["lang"]
+
+
+def select_variant():
+    """The variant picked in the sidebar, defaulting to ?variant= or HEALTH_GAIN_VARIANT."""
+    names = list(VARIANTS)
+    requested = st.query_params.get("variant") or os.environ.get(VARIANT_ENV) or DEFAULT_VARIANT
+    index = names.index(requested) if requested in VARIANTS else names.index(DEFAULT_VARIANT)
+    name = st.sidebar.selectbox("Variant", names, index=index, key="variant", on_change=_keep_language)
+    st.query_params["variant"] = name  # keeps the address shareable
+    return VARIANTS[name]
+
+
+def run(variant=None):
+    """Render one rerun of the app; `variant` is a name, a `Variant`, or None for the sidebar picker."""
+    st.set_page_config(page_title="AI Health Gain — Demo (EN/NO)", page_icon="🌿", layout="centered")
+    prof = profile.rerun()  # no-op unless HEALTH_GAIN_PROFILE=1
+    profile.serve_metrics()
+    params.watch()  # hot-reloads data/params.json (or HEALTH_GAIN_PARAMS) for every session
+    telemetry.configure()  # opt-in: HEALTH_GAIN_TELEMETRY_DIR=<dir> logs pseudonymised results
+    progress.configure()  # opt-in: HEALTH_GAIN_PROGRESS_DB=<file> adds the weekly check-in
+    session.start()  # evicts idle sessions after HEALTH_GAIN_SESSION_TTL seconds
+    p = params.current()  # one parameter set for this whole rerun
+    sess = session.current()  # this session's own (minimal) state
+
+    if variant is None:
+        variant = select_variant()
+    elif isinstance(variant, str):
+        variant = VARIANTS[variant]
+    validate(variant)
+
+    form = variant.layout == "form"
+    st.markdown(FORM_CSS if form else DUAL_CSS, unsafe_allow_html=True)
+    prof.mark("css")
+
+    lang = form_language() if form else dual_language()
+    T = i18n.catalog(variant.layout, lang)  # loaded once per process, shared by all sessions
+    prof.mark("strings")
+
+    if form:
+        form_page(T, lang, p, sess, prof)
+    else:
+        dual_page(variant, T, lang, p, sess, prof)
+        if variant.tracker and progress.store() is not None:
+            # a form: reruns on check-in only, so it suits the browser-side mode too
+            tracker_page(T, p)
+            prof.mark("tracker")
+
+    st.markdown("---")
+    st.caption(T["disclaimer"])
+    prof.mark("footer")
+    prof.done()
+
+
+if __name__ == "__main__":
+    run()
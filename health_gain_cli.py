@@ -0,0 +1,220 @@
+"""Headless batch scoring for large CSV / JSONL files.
+
+Input is read in fixed-size chunks and each scored chunk is appended to the
+output straight away, so memory stays flat whatever the file size. Output
+columns follow the app's "Download data (.csv)" export.
+
+    python health_gain_cli.py alcohol cohort.csv -o scored.csv
+    python health_gain_cli.py smoking cohort.jsonl --id-column person_id
+    python health_gain_cli.py joint population.csv -o scored.csv   # both behaviours, one pass
+    python health_gain_cli.py alcohol registry.csv -o scored.csv --workers 8
+    python health_gain_cli.py alcohol cohort.csv -o results.zip --id-column person_id
+    python health_gain_cli.py alcohol cohort.csv -o scored.parquet
+"""
+import argparse
+import os
+import sys
+
+import health_gain_model as model
+from health_gain_joint import JOINT_INPUT_COLUMNS, joint_frame
+from health_gain_params import current as current_params
+
+MODELS = {
+    "alcohol": (model.INPUT_COLUMNS, model.detail_frame),
+    "smoking": (model.SMOKING_INPUT_COLUMNS, model.score_smoking_frame),
+    "joint": (JOINT_INPUT_COLUMNS, joint_frame),
+}
+DEFAULT_CHUNK_SIZE = 100_000
+MAX_SHOWN_ERRORS = 20
+
+
+def guess_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson") else "csv"
+
+
+def read_chunks(path, fmt, chunk_size):
+    import pandas as pd
+
+    source = sys.stdin if path == "-" else path
+    if fmt == "jsonl":
+        return pd.read_json(source, lines=True, chunksize=chunk_size)
+    return pd.read_csv(source, chunksize=chunk_size)
+
+
+def check_chunk(chunk, columns, first_line=2):
+    """Coerce `columns` to numbers; returns (chunk, mask of bad rows, ["line N: ..."]).
+
+    A row is bad if any of `columns` is blank, or (except sex) not a finite
+    number. Line numbers assume one row per line after `first_line` - 1
+    header lines, which holds for CSV (first_line=2) and JSONL (1).
+    """
+    import numpy as np
+    import pandas as pd
+
+    numeric, masks = {}, {}
+    for col in columns:
+        if col == "sex":
+            masks[col] = chunk[col].isna().to_numpy()
+        else:
+            numeric[col] = pd.to_numeric(chunk[col], errors="coerce")
+            masks[col] = ~np.isfinite(numeric[col].to_numpy(dtype=np.float64))
+    bad = np.logical_or.reduce(list(masks.values()))
+    errors = [f"line {chunk.index[i] + first_line}: blank or not a number: "
+              + ", ".join(col for col, mask in masks.items() if mask[i])
+              for i in np.flatnonzero(bad)]
+    return chunk.assign(**numeric), bad, errors
+
+
+def _restore_ints(chunk, columns):
+    # a blank cell reads the whole column as float; once it's dropped, give the
+    # column back the integer dtype a clean chunk would have
+    import numpy as np
+
+    ints = {col: chunk[col].astype(np.int64) for col in columns
+            if chunk[col].dtype.kind == "f" and (chunk[col] % 1 == 0).all()}
+    return chunk.assign(**ints)
+
+
+def score_chunks(chunks, model_name, id_column=None, batch=None, bands=0, params=None, invalid=None,
+                 first_line=2, bands_batch=None):
+    """Yield one scored DataFrame per input chunk.
+
+    `batch` overrides the model's batch function, e.g. with a ParallelScorer.
+    `bands` > 0 adds Monte Carlo gain_months percentiles from that many draws
+    (alcohol only, seed 0 so every chunk sees the same draws), computed by
+    `bands_batch` (default: `gain_months_bands_batch`; a ParallelScorer's
+    `bands` spreads them over its pool). Every chunk is scored with the same
+    parameter set (`params`, default: the active one).
+
+    Rows with a blank or non-numeric input raise ValueError naming their
+    input lines (see `check_chunk`); if `invalid` is a list they are skipped
+    and their messages appended to it instead.
+    """
+    p = params or current_params()
+    required, score = MODELS[model_name]
+    expected = [id_column] + required if id_column else required
+    for chunk in chunks:
+        missing = [col for col in expected if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"input is missing column(s): {', '.join(missing)}")
+        chunk, bad, errors = check_chunk(chunk, required, first_line)
+        if errors:
+            if invalid is None:
+                shown = "\n".join(errors[:MAX_SHOWN_ERRORS])
+                more = f"\n... and {len(errors) - MAX_SHOWN_ERRORS:,} more" if len(errors) > MAX_SHOWN_ERRORS else ""
+                raise ValueError(f"invalid input rows (fix them or pass --skip-invalid):\n{shown}{more}")
+            invalid.extend(errors)
+            chunk = _restore_ints(chunk[~bad], required)
+        scored = score(chunk, batch, p) if batch is not None else score(chunk, params=p)
+        if id_column:
+            scored.insert(0, id_column, chunk[id_column])
+        if bands:
+            if bands_batch is None:
+                from health_gain_uncertainty import gain_months_bands_batch as bands_batch
+
+            percentiles = bands_batch(
+                *(chunk[col].to_numpy() for col in model.INPUT_COLUMNS), n_draws=bands, seed=0, params=p)
+            for name, values in percentiles.items():
+                # whole months, rounded like gain_months (half to even)
+                scored[f"gain_months_{name}"] = values.round().astype("int64")
+        yield scored
+
+
+def write_csv(frames, out):
+    rows = 0
+    for i, frame in enumerate(frames):
+        frame.to_csv(out, index=False, header=(i == 0))
+        rows += len(frame)
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Score a cohort file with the health gain model.")
+    ap.add_argument("model", choices=sorted(MODELS))
+    ap.add_argument("input", help="CSV or JSONL file, or - for stdin")
+    ap.add_argument("-o", "--output", default="-",
+                    help="output CSV (default: stdout); .zip writes one CSV per person, .parquet one table")
+    ap.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from extension)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--id-column", help="input column copied to the output as the first column")
+    ap.add_argument("--skip-invalid", action="store_true",
+                    help="skip rows with blank or non-numeric inputs (listed on stderr) instead of failing")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="score each chunk across this many processes (default: 1, in-process)")
+    ap.add_argument("--bands", type=int, metavar="N", default=0,
+                    help="alcohol only: add gain_months_p5/p50/p95 from N Monte Carlo draws (seed 0; "
+                         "spread over --workers)")
+    ap.add_argument("--life-table", metavar="CSV", nargs="?", const="",
+                    help="alcohol only: gain from the life-table engine "
+                         "(default table: data/life_table_demo.csv)")
+    ap.add_argument("--lut", metavar="DIR",
+                    help="serve scores from the precomputed lookup table in DIR (built if missing)")
+    args = ap.parse_args(argv)
+    if args.lut and args.workers > 1:
+        ap.error("--lut and --workers cannot be combined")
+    if args.lut and args.model == "joint":
+        ap.error("--lut is only available for the alcohol and smoking models")
+    if args.bands and args.model != "alcohol":
+        ap.error("--bands is only available for the alcohol model")
+    if args.life_table is not None and (args.model != "alcohol" or args.lut or args.workers > 1):
+        ap.error("--life-table is alcohol only and cannot be combined with --lut or --workers")
+
+    fmt = args.format or guess_format(args.input)
+    chunks = read_chunks(args.input, fmt, args.chunk_size)
+    scorer = None
+    if args.life_table is not None:
+        import functools
+
+        from health_gain_lifetable import LifeTable, default_table, health_gain_lifetable_batch
+
+        table = LifeTable.from_csv(args.life_table) if args.life_table else default_table()
+        batch = functools.partial(health_gain_lifetable_batch, table=table)
+    elif args.lut:
+        from health_gain_lut import LookupTable
+
+        table = LookupTable.load_or_build(args.lut)
+        batch = table.alcohol_batch if args.model == "alcohol" else table.smoking_batch
+    elif args.workers > 1:
+        from health_gain_parallel import ParallelScorer
+
+        from health_gain_uncertainty import DEFAULT_PERCENTILES
+
+        scorer = batch = ParallelScorer(args.model, workers=args.workers, capacity=args.chunk_size,
+                                        band_percentiles=DEFAULT_PERCENTILES if args.bands else None)
+    else:
+        batch = None
+    skipped = [] if args.skip_invalid else None
+    frames = score_chunks(chunks, args.model, args.id_column, batch, args.bands, invalid=skipped,
+                          first_line=1 if fmt == "jsonl" else 2, bands_batch=scorer and scorer.bands)
+    out_ext = os.path.splitext(args.output)[1].lower()
+    try:
+        if args.output == "-":
+            rows = write_csv(frames, sys.stdout)
+        elif out_ext == ".zip":
+            from health_gain_export import write_zip
+
+            rows = write_zip(frames, args.output, id_column=args.id_column)
+        elif out_ext == ".parquet":
+            from health_gain_export import write_parquet
+
+            rows = write_parquet(frames, args.output)
+        else:
+            try:
+                with open(args.output, "w", newline="", encoding="utf-8") as out:
+                    rows = write_csv(frames, out)
+            except ValueError:
+                os.remove(args.output)  # a partial CSV would look like a complete one
+                raise
+    except ValueError as exc:
+        ap.error(str(exc))
+    finally:
+        if scorer is not None:
+            scorer.close()
+    for error in skipped or ():
+        print(f"{args.input}: {error}", file=sys.stderr)
+    print(f"scored {rows:,} rows" + (f", {len(skipped):,} invalid skipped" if skipped else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
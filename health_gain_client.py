@@ -0,0 +1,178 @@
+"""Browser-side evaluation for the dual (alcohol + smoking) apps.
+
+By default every slider move is a websocket message and a full script rerun
+on the server. With HEALTH_GAIN_CLIENT_MODE=1 the apps instead render one
+static component holding the parameter set, the catalog strings and a
+JavaScript port of the model (`data/client/health_gain_model.js`): inputs,
+results, charts, tips and the downloads are all computed in the browser, so
+the server only runs the page load (and a language switch).
+
+The component page is built once per (language, parameter set, layout) and
+cached for the process. A new parameter version reaches browsers on their
+next page load. Telemetry only sees server-side calculations, so it records
+nothing in this mode.
+
+The JS model mirrors `health_gain_demo`, `health_gain_alcohol`,
+`health_gain_smoking` and `health_gain_joint` operation for operation,
+including Python's rounding; check them against each other (needs Node):
+
+    python health_gain_client.py check
+"""
+import argparse
+import functools
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import health_gain_i18n as i18n
+import health_gain_model as model
+from health_gain_joint import health_gain_joint, health_gain_joint_simple
+from health_gain_params import current as current_params
+
+CLIENT_ENV = "HEALTH_GAIN_CLIENT_MODE"
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "client")
+DEFAULT_HEIGHT = 1600  # initial iframe height; the page resizes it once rendered
+
+# slider/number defaults of the dual apps
+DEFAULTS = {
+    "age": 28, "years_drink": 5, "drinking_days": 5, "drinks_per": 2, "target_days": 2,
+    "years_smoking": 5, "cigs_now": 20, "cigs_goal": 0,
+}
+
+
+def enabled():
+    return os.environ.get(CLIENT_ENV, "") not in ("", "0")
+
+
+@functools.lru_cache(maxsize=None)
+def asset(name):
+    with open(os.path.join(ASSET_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def markdown_html(text):
+    """The little Markdown the catalog strings use (headings, bullets, bold, italics) as HTML."""
+    heading = re.match(r"(#{1,6}) (.*)", text)
+    if heading:
+        level = len(heading.group(1))
+        return f"<h{level}>{markdown_html(heading.group(2))}</h{level}>"
+    if text.startswith("- "):
+        text = "• " + text[2:]
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+
+
+def payload(lang, params=None, shared_profile=True, joint=True, exports=False):
+    """Everything the page needs, as a JSON-able dict."""
+    p = params or current_params()
+    T = i18n.catalog("dual", lang)
+    return {
+        "model_version": model.MODEL_VERSION,
+        "params": p._asdict(),
+        "strings": {key: markdown_html(T[key]) for key in T},
+        "labels": {"male": T["male"], "female": T["female"]},
+        "layout": {"profile": "shared" if shared_profile else "per_module", "joint": joint, "exports": exports},
+        "defaults": DEFAULTS,
+        "caps": {"alcohol": model.ALCOHOL_BAR_CAP_MONTHS, "smoking": model.SMOKING_BAR_CAP_MONTHS},
+        "targets": list(model.ALCOHOL_TARGETS),
+        "goals": list(model.SMOKING_GOALS),
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def widget_html(lang, params, shared_profile=True, joint=True, exports=False):
+    """The self-contained component page (HTML + inline JS), cached per arguments."""
+    data = json.dumps(payload(lang, params, shared_profile, joint, exports), ensure_ascii=False)
+    return (asset("dual_widget.html")
+            .replace("__PAYLOAD__", data.replace("</", "<\\/"))
+            .replace("__MODEL_JS__", asset("health_gain_model.js"))
+            .replace("__WIDGET_JS__", asset("dual_widget.js")))
+
+
+def render(lang, params=None, height=DEFAULT_HEIGHT, **layout):
+    """Show the browser-side modules in the running Streamlit script."""
+    import streamlit.components.v1 as components
+
+    components.html(widget_html(lang, params or current_params(), **layout), height=height, scrolling=True)
+
+
+# ------------------------
+# Parity check (Node)
+# ------------------------
+_NODE_RUNNER = """
+const HG = require(process.argv[1]);
+let input = "";
+process.stdin.on("data", d => input += d);
+process.stdin.on("end", () => {
+  const {params, cases} = JSON.parse(input);
+  const out = cases.map(([age, sex, dd, dpo, years, td, cn, cg]) => {
+    const d = HG.demo(age, sex, dd, dpo, years, td, params);
+    const j = HG.joint(age, sex, dd, dpo, years, td, cn, cg, params);
+    const js = HG.jointSimple(dd, dpo, td, cn, cg, params);
+    return [d.rr_now, d.rr_after, d.gain_years, d.gain_months, HG.alcoholText(dd, dpo, td, params),
+            HG.smoking(cn, cg, params), j.combined_gain_months, js.combined_gain_months];
+  });
+  process.stdout.write(JSON.stringify(out));
+});
+"""
+
+
+def check_cases():
+    return [
+        (age, sex, dd, dpo, years, td, (dpo * 4) % 41, (dd * 3) % 41)
+        for age, sex, dd, dpo, years, td in itertools.product(
+            range(15, 91, 5), ("Male", "Kvinne"), range(8), range(11), range(0, 61, 10), range(8))
+    ]
+
+
+def check(params=None, node="node"):
+    """Compare the JS model with the Python one over the app's input grid; list of mismatches."""
+    p = params or current_params()
+    cases = check_cases()
+    proc = subprocess.run([node, "-e", _NODE_RUNNER, os.path.join(ASSET_DIR, "health_gain_model.js")],
+                          input=json.dumps({"params": p._asdict(), "cases": cases}),
+                          capture_output=True, text=True, check=True)
+    mismatches = []
+    for case, got in zip(cases, json.loads(proc.stdout)):
+        age, sex, dd, dpo, years, td, cn, cg = case
+        d = model.health_gain_demo(age, sex, dd, dpo, years, td, p)
+        want = [d["rr_now"], d["rr_after"], d["gain_years"], d["gain_months"],
+                str(model.health_gain_alcohol(dd, dpo, td, p)), model.health_gain_smoking(cn, cg, p),
+                health_gain_joint(age, sex, dd, dpo, years, td, cn, cg, p)["combined_gain_months"],
+                health_gain_joint_simple(dd, dpo, td, cn, cg, p)["combined_gain_months"]]
+        if got != want:
+            mismatches.append((case, got, want))
+    return len(cases), mismatches
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Browser-side model tools.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    chk = sub.add_parser("check", help="compare the JS model with the Python one (needs Node)")
+    chk.add_argument("--node", default=shutil.which("node") or "node")
+    page = sub.add_parser("html", help="write the component page, e.g. to open it without Streamlit")
+    page.add_argument("-o", "--output", default="-")
+    page.add_argument("--lang", default=i18n.DEFAULT_LANG)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "html":
+        text = widget_html(args.lang, current_params())
+        if args.output == "-":
+            sys.stdout.write(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text)
+        return
+    n, mismatches = check(node=args.node)
+    for case, got, want in mismatches[:10]:
+        print(f"{case}: js {got} != python {want}", file=sys.stderr)
+    print(f"{n:,} cases, {len(mismatches)} mismatch(es)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
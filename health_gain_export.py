@@ -0,0 +1,147 @@
+"""Result exports: one-row CSV/TXT for the apps, bulk ZIP/Parquet for cohorts.
+
+The apps' "Download data (.csv)" file is a header plus one row, which the
+csv module writes in microseconds; pandas is only needed for whole frames.
+`LazyExports` builds each download on first access and keeps it with the
+cached result, so a scenario's files are produced once per process, and only
+for results that are actually shown.
+
+Bulk writers take an iterable of scored DataFrames (e.g. the chunks from
+`health_gain_cli.score_chunks`) and write them in a single streaming pass to
+`<path>.tmp`, which replaces `path` only once every frame is written.
+"""
+import contextlib
+import csv
+import functools
+import io
+import math
+import os
+import re
+import zipfile
+
+
+def _cell(value):
+    # match DataFrame.to_csv: missing values are empty
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return value
+
+
+def csv_text(rows, columns=None):
+    """CSV (header + rows) for a few dicts, byte-identical to `pd.DataFrame(rows).to_csv(index=False)`."""
+    rows = list(rows)
+    if columns is None:
+        columns = list(rows[0]) if rows else []
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_cell(row.get(c)) for c in columns])
+    return buf.getvalue()
+
+
+class LazyExports:
+    """Download payloads for one result, each built on first access.
+
+    `txt` is a zero-argument callable returning the summary text.
+    """
+
+    def __init__(self, row, txt=None, columns=None):
+        self.row = row
+        self.columns = columns
+        self._txt = txt
+
+    @functools.cached_property
+    def csv(self):
+        return csv_text([self.row], self.columns)
+
+    @functools.cached_property
+    def txt(self):
+        return self._txt() if self._txt is not None else ""
+
+
+# ------------------------
+# Bulk
+# ------------------------
+@contextlib.contextmanager
+def _replacing(path):
+    """Yield `<path>.tmp` to write to; it replaces `path` only if the block completes."""
+    tmp = path + ".tmp"
+    try:
+        yield tmp
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+
+
+def member_name(key, prefix="result_"):
+    """A flat, safe zip member name for `key`: anything but letters, digits, . _ - becomes _."""
+    return f"{prefix}{re.sub(r'[^A-Za-z0-9._-]', '_', str(key))}"
+
+
+def write_zip(frames, path, id_column=None, prefix="result_"):
+    """One `<prefix><id>.csv` member per row (same layout as the app's CSV download).
+
+    Rows are named by `id_column` if given (see `member_name`), else by their
+    running row number; a repeated name gets a _2, _3, ... suffix.
+    Returns the number of rows written.
+    """
+    rows = 0
+    used = set()
+    with _replacing(path) as tmp, zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for frame in frames:
+            columns = list(frame.columns)
+            header = csv_text([], columns)
+            id_index = columns.index(id_column) if id_column else None
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            for values in frame.itertuples(index=False, name=None):
+                name = base = member_name(values[id_index] if id_column else rows, prefix)
+                n = 1
+                while name in used:
+                    n += 1
+                    name = f"{base}_{n}"
+                used.add(name)
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow([_cell(v) for v in values])
+                zf.writestr(f"{name}.csv", header + buf.getvalue())
+                rows += 1
+    return rows
+
+
+def write_parquet(frames, path):
+    """All rows in one Parquet file, one row group per frame (needs pyarrow).
+
+    The first frame fixes the schema; later frames are cast to it (e.g. an
+    int column that arrives as float), and a frame that can't be cast
+    losslessly raises ValueError.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from exc
+
+    rows = 0
+    writer = None
+    with _replacing(path) as tmp:
+        try:
+            for frame in frames:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                elif table.schema != writer.schema:
+                    try:
+                        table = table.cast(writer.schema)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as exc:
+                        raise ValueError(f"rows {rows + 1:,}-{rows + len(frame):,} don't fit the Parquet schema "
+                                         f"of the first chunk: {exc}") from exc
+                writer.write_table(table)
+                rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+    return rows
@@ -0,0 +1,89 @@
+"""Translation catalogs for the apps.
+
+Strings live in `data/locales/<catalog>/<lang>.json` ("form" for the
+single-form alcohol app, "dual" for the alcohol + smoking apps). A catalog is
+read and its templates parsed the first time a language is selected, then
+kept for the life of the process, so every session shares one copy and a
+rerun only does a dict lookup. Keys missing from a locale fall back to EN.
+
+    T = catalog("form", "NO")
+    T["title"]
+    T.format("headline", now=4, goal=2, months=7)
+"""
+import functools
+import json
+import os
+import string
+from collections.abc import Mapping
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "locales")
+DEFAULT_LANG = "EN"
+
+_FORMATTER = string.Formatter()
+
+
+def compile_template(text):
+    """Split a str.format template into (literal, field, format_spec) parts.
+
+    Only plain `{name}` / `{name:spec}` fields are allowed, so a bad template
+    fails when the catalog loads rather than on some user's rerun.
+    """
+    parts = []
+    for literal, field, spec, conversion in _FORMATTER.parse(text):
+        if field is not None and (not field.isidentifier() or conversion or "{" in spec):
+            raise ValueError(f"unsupported field {{{field}}} in template {text!r}")
+        parts.append((literal, field, spec))
+    return tuple(parts)
+
+
+def render(parts, values):
+    out = []
+    for literal, field, spec in parts:
+        out.append(literal)
+        if field is not None:
+            out.append(format(values[field], spec))
+    return "".join(out)
+
+
+class Catalog(Mapping):
+    """Read-only mapping of key -> string for one language, with pre-parsed templates."""
+
+    __slots__ = ("name", "lang", "_strings", "_templates")
+
+    def __init__(self, name, lang, strings):
+        self.name = name
+        self.lang = lang
+        self._strings = strings
+        self._templates = {key: compile_template(text) for key, text in strings.items()}
+
+    def __getitem__(self, key):
+        return self._strings[key]
+
+    def __iter__(self):
+        return iter(self._strings)
+
+    def __len__(self):
+        return len(self._strings)
+
+    def format(self, key, **values):
+        return render(self._templates[key], values)
+
+
+def _path(name, lang):
+    return os.path.join(LOCALE_DIR, name, f"{lang.lower()}.json")
+
+
+def languages(name):
+    """Language codes available for a catalog (upper case, sorted); nothing is loaded."""
+    return sorted(f[:-len(".json")].upper() for f in os.listdir(os.path.join(LOCALE_DIR, name))
+                  if f.endswith(".json"))
+
+
+@functools.lru_cache(maxsize=None)
+def catalog(name, lang=DEFAULT_LANG):
+    """The `lang` catalog of `name`, loaded once per process."""
+    with open(_path(name, lang), encoding="utf-8") as f:
+        strings = json.load(f)
+    if lang != DEFAULT_LANG:
+        strings = {**catalog(name, DEFAULT_LANG)._strings, **strings}
+    return Catalog(name, lang, strings)
@@ -0,0 +1,70 @@
+"""Joint alcohol + smoking model over one shared profile.
+
+One row holds a person's age and sex once, plus both behaviours; a single
+vectorized pass returns the alcohol gain (the `health_gain_demo` model, which
+uses age and sex), the smoking gain (`health_gain_smoking`) and their sum.
+Behaviours are treated as independent, so the combined gain is additive —
+a demo assumption like the rest of the parameters.
+
+`health_gain_joint_simple` is the same sum over the dual app's simple
+alcohol indicator (`health_gain_alcohol`, days only), so an app whose
+alcohol card shows that model can show a matching combined result.
+"""
+import health_gain_model as model
+from health_gain_params import current as current_params
+
+JOINT_INPUT_COLUMNS = model.INPUT_COLUMNS + model.SMOKING_INPUT_COLUMNS
+JOINT_OUTPUT_COLUMNS = ["rr_now", "rr_after", "alcohol_gain_months", "smoking_gain_months", "combined_gain_months"]
+
+
+def health_gain_joint(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, cigs_now, cigs_goal,
+                      params=None):
+    """Per-behaviour and combined gain (months) for one person."""
+    p = params or current_params()
+    detail = model.health_gain_demo(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, p)
+    smoking = model.health_gain_smoking(cigs_now, cigs_goal, p)
+    return {
+        "age": age, "sex": sex,
+        "rr_now": detail["rr_now"],
+        "rr_after": detail["rr_after"],
+        "alcohol_gain_months": detail["gain_months"],
+        "smoking_gain_months": smoking,
+        "combined_gain_months": detail["gain_months"] + smoking,
+        "param_version": p.version,
+    }
+
+
+def health_gain_joint_simple(drinking_days, drinks_per_occ, target_days, cigs_now, cigs_goal, params=None):
+    """Joint gain on the simple per-module indicators (`health_gain_alcohol` + `health_gain_smoking`)."""
+    p = params or current_params()
+    alcohol = model.health_gain_alcohol(drinking_days, drinks_per_occ, target_days, p)
+    smoking = model.health_gain_smoking(cigs_now, cigs_goal, p)
+    return {
+        "alcohol_gain_months": alcohol,
+        "smoking_gain_months": smoking,
+        "combined_gain_months": round(alcohol + smoking, 1),
+        "param_version": p.version,
+    }
+
+
+def health_gain_joint_batch(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                            cigs_now, cigs_goal, params=None):
+    """Array version of `health_gain_joint`: dict of arrays keyed by JOINT_OUTPUT_COLUMNS."""
+    rr_now, rr_after, gain_years = model.alcohol_gain_arrays(
+        age, model.female_mask(sex), drinking_days, drinks_per_occ, years_drinking, target_days, params=params)
+    alcohol = model.whole_months(gain_years * 12)
+    smoking = model.health_gain_smoking_batch(cigs_now, cigs_goal, params=params)
+    return {
+        "rr_now": model.round_half_even(rr_now, 3),
+        "rr_after": model.round_half_even(rr_after, 3),
+        "alcohol_gain_months": alcohol,
+        "smoking_gain_months": smoking,
+        "combined_gain_months": alcohol + smoking,
+    }
+
+
+def joint_frame(df, batch=health_gain_joint_batch, params=None):
+    """Score a DataFrame holding JOINT_INPUT_COLUMNS; age, sex, JOINT_OUTPUT_COLUMNS and param_version."""
+    p = params or current_params()
+    out = batch(*(df[col].to_numpy() for col in JOINT_INPUT_COLUMNS), params=p)
+    return df[["age", "sex"]].assign(**out, param_version=p.version)
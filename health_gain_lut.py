@@ -0,0 +1,233 @@
+"""Precomputed lookup table over the app's discrete input space.
+
+Every slider / number input in the app is a small bounded integer, so the
+alcohol (`health_gain_demo`) and smoking (`health_gain_smoking`) models can be
+evaluated once for the whole grid and then served by array indexing. Tables
+are saved as plain .npy files next to a meta.json holding MODEL_VERSION, the
+parameter set and the grid; `load_or_build` memory-maps a matching table
+and only recomputes when the model, parameters or grid changed. Lookups for a
+different parameter set than the table was built with fall back to the model.
+
+    python health_gain_lut.py build lut/
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+import health_gain_model as model
+from health_gain_params import current as current_params, from_dict as params_from_dict
+
+# (min, max) inclusive — same bounds as the app widgets
+GRID = {
+    "age": (15, 90),
+    "sex": (0, 1),  # 0 = male, 1 = female
+    "drinking_days": (0, 7),
+    "drinks_per_occ": (0, 10),
+    "years_drinking": (0, 60),
+    "target_days": (0, 7),
+    "cigs": (0, 40),
+}
+FILES = {
+    "gain_months": "alcohol_gain_months.npy",        # int16 [age, sex, days, drinks, years, target]
+    "gain_centiyears": "alcohol_gain_centiyears.npy",  # int16, round(gain_years, 2) * 100
+    "rr": "alcohol_rr.npy",                          # float64 [days, drinks, years]
+    "smoking_gain": "smoking_gain.npy",              # int16 [cigs_now, cigs_goal]
+}
+META_FILE = "meta.json"
+
+
+def _size(name):
+    lo, hi = GRID[name]
+    return hi - lo + 1
+
+
+def _axis(name):
+    lo, hi = GRID[name]
+    return np.arange(lo, hi + 1)
+
+
+def _narrow(values, dtype, name):
+    """`values` as `dtype`; raises instead of letting numpy wrap values that don't fit."""
+    values = np.asarray(values)
+    info = np.iinfo(dtype)
+    if values.size and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"{name} spans {values.min()}..{values.max()}, outside {np.dtype(dtype).name}; "
+                         f"check the parameters (e.g. gain_cap_years)")
+    return values.astype(dtype)
+
+
+class LookupTable:
+    def __init__(self, arrays, meta):
+        self.gain_months = arrays["gain_months"]
+        self.gain_centiyears = arrays["gain_centiyears"]
+        self.rr = arrays["rr"]
+        self.smoking_gain = arrays["smoking_gain"]
+        self.meta = meta
+        self.params = params_from_dict(meta["params"])  # what the table was built with
+
+    def _stale(self, params):
+        return params is not None and params != self.params
+
+    # ---- build / persist ----
+    @classmethod
+    def build(cls, params=None):
+        p = params or current_params()
+        shape = tuple(_size(n) for n in ("age", "sex", "drinking_days", "drinks_per_occ",
+                                         "years_drinking", "target_days"))
+        gain_months = np.empty(shape, dtype=np.int16)
+        gain_centiyears = np.empty(shape, dtype=np.int16)
+
+        # One age at a time keeps the temporaries small (~85k cells per slice).
+        sex, days, drinks, years, target = np.meshgrid(
+            np.array([False, True]), _axis("drinking_days"), _axis("drinks_per_occ"),
+            _axis("years_drinking"), _axis("target_days"), indexing="ij")
+        for i, age in enumerate(_axis("age")):
+            out = model.health_gain_demo_batch(np.full(sex.shape, age), sex, days, drinks, years, target, params=p)
+            gain_months[i] = _narrow(out["gain_months"], np.int16, "gain_months")
+            gain_centiyears[i] = _narrow(np.rint(out["gain_years"] * 100), np.int16, "gain_centiyears")
+
+        # rr only depends on (days, drinks, years): rr_after is rr at target days.
+        days, drinks, years = np.meshgrid(_axis("drinking_days"), _axis("drinks_per_occ"),
+                                          _axis("years_drinking"), indexing="ij")
+        rr = model.health_gain_demo_batch(np.full(days.shape, GRID["age"][0]), np.zeros(days.shape, bool),
+                                          days, drinks, years, days, params=p)["rr_now"]
+
+        now, goal = np.meshgrid(_axis("cigs"), _axis("cigs"), indexing="ij")
+        smoking_gain = _narrow(model.health_gain_smoking_batch(now, goal, params=p), np.int16, "smoking_gain")
+
+        arrays = {"gain_months": gain_months, "gain_centiyears": gain_centiyears,
+                  "rr": rr, "smoking_gain": smoking_gain}
+        return cls(arrays, cls.expected_meta(p))
+
+    @staticmethod
+    def expected_meta(params=None):
+        p = params or current_params()
+        return {"model_version": model.MODEL_VERSION, "params": p._asdict(),
+                "grid": {k: list(v) for k, v in GRID.items()}}
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for key, fname in FILES.items():
+            np.save(os.path.join(path, fname), getattr(self, key))
+        # meta.json last: a table without it is incomplete and gets rebuilt
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True, params=None):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        expected = cls.expected_meta(params)
+        if meta != expected:
+            raise ValueError(f"lookup table at {path} is for model {meta.get('model_version')!r}, parameters "
+                             f"{meta.get('params', {}).get('version')!r}; expected {expected['model_version']!r}, "
+                             f"{expected['params']['version']!r}")
+        mode = "r" if mmap else None
+        arrays = {key: np.load(os.path.join(path, fname), mmap_mode=mode) for key, fname in FILES.items()}
+        return cls(arrays, meta)
+
+    @classmethod
+    def load_or_build(cls, path, mmap=True, params=None):
+        """Load the table at `path`, (re)building and saving it first if missing or stale."""
+        p = params or current_params()
+        try:
+            return cls.load(path, mmap=mmap, params=p)
+        except (OSError, ValueError):
+            cls.build(p).save(path)
+            return cls.load(path, mmap=mmap, params=p)
+
+    # ---- lookups ----
+    @staticmethod
+    def _in_grid(**values):
+        return all(GRID[k][0] <= v <= GRID[k][1] and float(v).is_integer() for k, v in values.items())
+
+    def alcohol(self, age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+        """Same `detail` dict as `health_gain_model.health_gain_demo`."""
+        if self._stale(params) or not self._in_grid(age=age, drinking_days=drinking_days,
+                                                    drinks_per_occ=drinks_per_occ,
+                                                    years_drinking=years_drinking, target_days=target_days):
+            return model.health_gain_demo(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                                          params or self.params)
+        female = 1 if str(sex).lower() in model.FEMALE_LABELS else 0
+        a, d, n, y, t = (int(v) for v in (age - GRID["age"][0], drinking_days, drinks_per_occ,
+                                           years_drinking, target_days))
+        return {
+            "age": age, "sex": sex,
+            "now_drinks_per_week": drinking_days * drinks_per_occ,
+            "after_drinks_per_week": target_days * drinks_per_occ,
+            "rr_now": self.rr.item(d, n, y),
+            "rr_after": self.rr.item(t, n, y),
+            "gain_years": self.gain_centiyears.item(a, female, d, n, y, t) / 100,
+            "gain_months": self.gain_months.item(a, female, d, n, y, t),
+            "param_version": self.params.version,
+        }
+
+    def alcohol_batch(self, age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+        """Same result as `health_gain_demo_batch`; off-grid rows fall back to the model."""
+        if self._stale(params):
+            return model.health_gain_demo_batch(age, sex, drinking_days, drinks_per_occ, years_drinking,
+                                                target_days, params=params)
+        cols = {"age": age, "drinking_days": drinking_days, "drinks_per_occ": drinks_per_occ,
+                "years_drinking": years_drinking, "target_days": target_days}
+        cols = {k: np.asarray(v) for k, v in cols.items()}
+        female = model.female_mask(sex)
+        ok = np.ones(female.shape, dtype=bool)
+        for k, v in cols.items():
+            ok &= (v >= GRID[k][0]) & (v <= GRID[k][1]) & (v == np.floor(v))
+        idx = {k: np.where(ok, v, GRID[k][0]).astype(np.intp) for k, v in cols.items()}
+        a, d, n, y, t = (idx["age"] - GRID["age"][0], idx["drinking_days"], idx["drinks_per_occ"],
+                         idx["years_drinking"], idx["target_days"])
+        f = female.astype(np.intp)
+        out = {
+            "rr_now": self.rr[d, n, y],
+            "rr_after": self.rr[t, n, y],
+            "gain_years": self.gain_centiyears[a, f, d, n, y, t] / 100,
+            "gain_months": self.gain_months[a, f, d, n, y, t].astype(np.int64),
+        }
+        if not ok.all():
+            bad = ~ok
+            fallback = model.health_gain_demo_batch(*(v[bad] for v in (
+                cols["age"], female, cols["drinking_days"], cols["drinks_per_occ"],
+                cols["years_drinking"], cols["target_days"])), params=self.params)
+            for k in out:
+                out[k][bad] = fallback[k]
+        return out
+
+    def smoking(self, cigs_now, cigs_goal, params=None):
+        if self._stale(params) or not self._in_grid(cigs=cigs_now) or not self._in_grid(cigs=cigs_goal):
+            return model.health_gain_smoking(cigs_now, cigs_goal, params or self.params)
+        return self.smoking_gain.item(int(cigs_now), int(cigs_goal))
+
+    def smoking_batch(self, cigs_now, cigs_goal, params=None):
+        if self._stale(params):
+            return model.health_gain_smoking_batch(cigs_now, cigs_goal, params=params)
+        cigs_now, cigs_goal = np.asarray(cigs_now), np.asarray(cigs_goal)
+        lo, hi = GRID["cigs"]
+        ok = ((cigs_now >= lo) & (cigs_now <= hi) & (cigs_now == np.floor(cigs_now))
+              & (cigs_goal >= lo) & (cigs_goal <= hi) & (cigs_goal == np.floor(cigs_goal)))
+        out = self.smoking_gain[np.where(ok, cigs_now, lo).astype(np.intp),
+                                np.where(ok, cigs_goal, lo).astype(np.intp)].astype(np.int64)
+        if not ok.all():
+            out[~ok] = model.health_gain_smoking_batch(cigs_now[~ok], cigs_goal[~ok], params=self.params)
+        return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build or inspect the precomputed lookup table.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="(re)compute the table").add_argument("path")
+    sub.add_parser("info", help="show the table's meta data").add_argument("path")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        LookupTable.build().save(args.path)
+    table = LookupTable.load(args.path)
+    size = sum(getattr(table, key).nbytes for key in FILES)
+    print(f"{args.path}: model {table.meta['model_version']}, parameters {table.params.version}, "
+          f"{size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Health gain models (demo logic) without any UI.
+
+Safe to import from workers and services: no Streamlit, and NumPy is only
+imported by the batch functions that need it.
+
+The coefficients (demo placeholders — to be calibrated) come from
+`health_gain_params`: every function takes an optional `params` and
+otherwise uses the active set, `health_gain_params.current()`.
+"""
+from health_gain_params import current as current_params
+
+# Bump whenever a formula below changes: persisted lookup tables and caches
+# are keyed on it (and on the parameter version).
+MODEL_VERSION = "demo-1"
+
+FEMALE_LABELS = ("female", "f", "woman", "kvinne")
+
+# Caps for the "health lifespan" progress bars (months)
+ALCOHOL_BAR_CAP_MONTHS = 36
+SMOKING_BAR_CAP_MONTHS = 96
+
+INPUT_COLUMNS = ["age", "sex", "drinking_days", "drinks_per_occ", "years_drinking", "target_days"]
+OUTPUT_COLUMNS = ["rr_now", "rr_after", "gain_years", "gain_months"]
+# Column layout of the `detail` dict, i.e. the app's "Download data (.csv)"
+DETAIL_COLUMNS = ["age", "sex", "now_drinks_per_week", "after_drinks_per_week"] + OUTPUT_COLUMNS + ["param_version"]
+
+SMOKING_INPUT_COLUMNS = ["cigs_now", "cigs_goal"]
+SMOKING_OUTPUT_COLUMNS = ["smoking_gain"]
+
+# Every value of the apps' goal sliders, for the sweep (curve) functions
+ALCOHOL_TARGETS = tuple(range(0, 8))
+SMOKING_GOALS = tuple(range(0, 41))
+# (min, max) inclusive of each numeric input: the apps' widget bounds, i.e. the model's domain
+INPUT_RANGES = {
+    "age": (15, 90),
+    "drinking_days": (0, 7),
+    "drinks_per_occ": (0, 10),
+    "years_drinking": (0, 60),
+    "target_days": (0, 7),
+    "cigs_now": (0, 40),
+    "cigs_goal": (0, 40),
+}
+
+
+# ------------------------
+# Core model (one person)
+# ------------------------
+def sex_adj(sex, params=None):
+    p = params or current_params()
+    return p.female_adj if str(sex).lower() in FEMALE_LABELS else 1.0
+
+
+def age_adj(age, params=None):
+    p = params or current_params()
+    return max(p.age_adj_floor, p.age_adj_base - (age - p.age_adj_pivot) * p.age_adj_slope)
+
+
+def health_gain_alcohol(drinking_days, drinks_per_occ, target_days, params=None):
+    p = params or current_params()
+    return round(max(0, (drinking_days - target_days) * p.alcohol_months_per_day), 1)
+
+
+def health_gain_smoking(cigs_now, cigs_goal, params=None):
+    p = params or current_params()
+    return int(round(max(0, (cigs_now - cigs_goal) / p.cigs_per_pack * p.smoking_months_per_pack)))
+
+
+def health_gain_demo(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+    p = params or current_params()
+    drinks_per_week_now = drinking_days * drinks_per_occ
+    drinks_per_week_after = target_days * drinks_per_occ
+
+    binge_now = 1 if drinks_per_occ >= p.binge_drinks else 0
+    binge_after = binge_now
+
+    adjust = sex_adj(sex, p) * age_adj(age, p)
+
+    rr_now = 1 + p.a * drinks_per_week_now + p.b * binge_now + p.c * (years_drinking / 20.0)
+    rr_after = 1 + p.a * drinks_per_week_after + p.b * binge_after + p.c * (years_drinking / 20.0)
+
+    rr_now = max(rr_now, p.rr_floor)
+    rr_after = max(rr_after, p.rr_floor)
+
+    gain_years = p.k * (rr_now - rr_after) / rr_now * adjust
+
+    gain_years = max(0.0, min(gain_years, p.gain_cap_years))
+    gain_months = round(gain_years * 12)
+
+    return {
+        "age": age, "sex": sex,
+        "now_drinks_per_week": drinks_per_week_now,
+        "after_drinks_per_week": drinks_per_week_after,
+        "rr_now": round(rr_now, 3),
+        "rr_after": round(rr_after, 3),
+        "gain_years": round(gain_years, 2),
+        "gain_months": gain_months,
+        "param_version": p.version,
+    }
+
+
+# ------------------------
+# Batch model (whole populations, one vectorized pass)
+# ------------------------
+def female_mask(sex):
+    import numpy as np
+
+    sex = np.asarray(sex)
+    if sex.dtype == bool:
+        return sex
+    if sex.dtype.kind != "U":
+        sex = sex.astype(str)
+    # Case-fold on the raw UCS-4 code points instead of np.char.lower, which
+    # builds a Python string per row. FEMALE_LABELS are ASCII, so folding A-Z
+    # is enough to match them.
+    width = max(sex.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(sex.reshape(-1)).view(np.uint32).reshape(-1, width)
+    codes = codes | (((codes >= 65) & (codes <= 90)).astype(np.uint32) << 5)
+    folded = codes.view(sex.dtype).reshape(sex.shape)
+    mask = np.zeros(sex.shape, dtype=bool)
+    for label in FEMALE_LABELS:
+        mask |= folded == label
+    return mask
+
+
+def health_gain_demo_batch(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+    """Array version of `health_gain_demo`.
+
+    Takes array-likes of equal length (``sex`` may be labels or a boolean
+    "is female" mask) and returns a dict of arrays keyed by OUTPUT_COLUMNS,
+    rounded exactly like the scalar `detail`.
+    """
+    import numpy as np
+
+    rr_now, rr_after, gain_years = alcohol_gain_arrays(
+        age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=params)
+    return {
+        "rr_now": round_half_even(rr_now, 3),
+        "rr_after": round_half_even(rr_after, 3),
+        "gain_years": round_half_even(gain_years, 2),
+        "gain_months": whole_months(gain_years * 12),
+    }
+
+
+def alcohol_gain_arrays(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                        a=None, b=None, c=None, k=None, params=None):
+    """Unrounded (rr_now, rr_after, gain_years) arrays of the alcohol model.
+
+    Inputs and the coefficients a, b, c, k (default: from `params`) broadcast
+    against each other, so passing coefficient arrays evaluates many parameter
+    draws in one pass.
+    """
+    import numpy as np
+
+    p = params or current_params()
+    a = p.a if a is None else a
+    b = p.b if b is None else b
+    c = p.c if c is None else c
+    k = p.k if k is None else k
+
+    age = np.asarray(age, dtype=np.float64)
+    drinking_days = np.asarray(drinking_days, dtype=np.float64)
+    drinks_per_occ = np.asarray(drinks_per_occ, dtype=np.float64)
+    years_drinking = np.asarray(years_drinking, dtype=np.float64)
+    target_days = np.asarray(target_days, dtype=np.float64)
+
+    binge = (drinks_per_occ >= p.binge_drinks).astype(np.float64)
+    sex_factor = np.where(female_mask(sex), p.female_adj, 1.0)
+    age_factor = np.maximum(p.age_adj_floor, p.age_adj_base - (age - p.age_adj_pivot) * p.age_adj_slope)
+    adjust = sex_factor * age_factor
+
+    # Same operation order as the scalar model so results match bit for bit.
+    years_term = c * (years_drinking / 20.0)
+    rr_now = 1 + a * (drinking_days * drinks_per_occ) + b * binge + years_term
+    rr_after = 1 + a * (target_days * drinks_per_occ) + b * binge + years_term
+    rr_now = np.maximum(rr_now, p.rr_floor)
+    rr_after = np.maximum(rr_after, p.rr_floor)
+
+    gain_years = k * (rr_now - rr_after) / rr_now * adjust
+    gain_years = np.clip(gain_years, 0.0, p.gain_cap_years)
+    return rr_now, rr_after, gain_years
+
+
+def health_gain_smoking_batch(cigs_now, cigs_goal, params=None):
+    """Array version of `health_gain_smoking`; returns int months."""
+    import numpy as np
+
+    p = params or current_params()
+    cigs_now = np.asarray(cigs_now, dtype=np.float64)
+    cigs_goal = np.asarray(cigs_goal, dtype=np.float64)
+    months = np.maximum(0, (cigs_now - cigs_goal) / p.cigs_per_pack * p.smoking_months_per_pack)
+    return whole_months(months)
+
+
+def whole_months(months):
+    """`months` rounded half to even as int64.
+
+    Raises ValueError for NaN, infinite or out-of-range values (a blank or
+    huge input) instead of letting the cast turn them into -2**63.
+    """
+    import numpy as np
+
+    months = np.rint(months)
+    if not (np.abs(months) < 2.0 ** 63).all():  # False for NaN too
+        raise ValueError("inputs must be finite numbers in the model's range")
+    return months.astype(np.int64)
+
+
+def round_half_even(x, ndigits):
+    import numpy as np
+
+    # np.round scales by 10**ndigits before rounding, which can land on the
+    # other side of a tie than Python's round(); fix up those few cells so the
+    # batch output is identical to the scalar `detail`.
+    scale = 10.0 ** ndigits
+    out = np.round(x, ndigits)
+    err = np.abs(out - x) * scale
+    suspect = np.flatnonzero(np.abs(err - 0.5) < 1e-6)
+    if suspect.size:
+        flat_x = x.reshape(-1)
+        out.reshape(-1)[suspect] = [round(v, ndigits) for v in flat_x[suspect].tolist()]
+    return out
+
+
+def score_frame(df, params=None):
+    """Score a DataFrame holding INPUT_COLUMNS; returns a copy with OUTPUT_COLUMNS added."""
+    out = health_gain_demo_batch(*(df[col].to_numpy() for col in INPUT_COLUMNS), params=params)
+    return df.assign(**out)
+
+
+def detail_frame(df, batch=health_gain_demo_batch, params=None):
+    """Score a DataFrame holding INPUT_COLUMNS into the DETAIL_COLUMNS layout.
+
+    `batch` may be any callable with the signature of `health_gain_demo_batch`
+    (e.g. a `health_gain_parallel.ParallelScorer`).
+    """
+    p = params or current_params()
+    out = batch(*(df[col].to_numpy() for col in INPUT_COLUMNS), params=p)
+    return df[["age", "sex"]].assign(
+        now_drinks_per_week=df["drinking_days"] * df["drinks_per_occ"],
+        after_drinks_per_week=df["target_days"] * df["drinks_per_occ"],
+        **out,
+        param_version=p.version,
+    )
+
+
+def score_smoking_frame(df, batch=health_gain_smoking_batch, params=None):
+    """Score a DataFrame holding SMOKING_INPUT_COLUMNS into SMOKING_OUTPUT_COLUMNS."""
+    p = params or current_params()
+    gain = batch(df["cigs_now"].to_numpy(), df["cigs_goal"].to_numpy(), params=p)
+    return df[[]].assign(smoking_gain=gain, param_version=p.version)
+
+
+# ------------------------
+# Sweeps (one person, every goal at once)
+# ------------------------
+def health_gain_demo_curve(age, sex, drinking_days, drinks_per_occ, years_drinking, targets=ALCOHOL_TARGETS,
+                           params=None):
+    """`health_gain_demo` for each of `targets` in one vectorized call; list of `detail` dicts."""
+    import numpy as np
+
+    p = params or current_params()
+    targets = list(targets)
+    n = len(targets)
+    out = health_gain_demo_batch(np.full(n, age), np.full(n, female_mask(sex)), np.full(n, drinking_days),
+                                 np.full(n, drinks_per_occ), np.full(n, years_drinking), targets, params=p)
+    columns = {k: out[k].tolist() for k in OUTPUT_COLUMNS}
+    return [
+        {
+            "age": age, "sex": sex,
+            "now_drinks_per_week": drinking_days * drinks_per_occ,
+            "after_drinks_per_week": t * drinks_per_occ,
+            **{k: columns[k][i] for k in OUTPUT_COLUMNS},
+            "param_version": p.version,
+        }
+        for i, t in enumerate(targets)
+    ]
+
+
+def health_gain_alcohol_curve(drinking_days, drinks_per_occ, targets=ALCOHOL_TARGETS, params=None):
+    """`health_gain_alcohol` for each of `targets`; list of months."""
+    import numpy as np
+
+    p = params or current_params()
+    months = (drinking_days - np.asarray(targets, dtype=np.float64)) * p.alcohol_months_per_day
+    # max(0, x) in the scalar model returns the int 0 when x <= 0
+    return [m if m > 0 else 0 for m in round_half_even(months, 1).tolist()]
+
+
+def health_gain_smoking_curve(cigs_now, goals=SMOKING_GOALS, params=None):
+    """`health_gain_smoking` for each of `goals`; list of int months."""
+    import numpy as np
+
+    return health_gain_smoking_batch(np.full(len(goals), cigs_now), goals, params=params).tolist()
@@ -0,0 +1,228 @@
+"""Multi-core scoring over shared memory.
+
+The parent copies each chunk's input columns into fixed-capacity
+`multiprocessing.shared_memory` blocks, workers score (start, stop) shards of
+those blocks in place and write into shared output blocks. Only slice bounds
+and the parameter set travel through the pool's pipes — never rows — and because every shard writes
+to its own index range the merged result is in input order whatever order the
+workers finish in.
+
+    with ParallelScorer("alcohol", workers=4) as scorer:
+        out = scorer(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days)
+
+An alcohol scorer made with `band_percentiles` also shards the Monte Carlo
+bands (`scorer.bands`, like `gain_months_bands_batch`) the same way; with a
+fixed seed every worker draws the same coefficients, so the result equals
+the single-process one.
+"""
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import health_gain_model as model
+from health_gain_joint import health_gain_joint_batch
+from health_gain_params import current as current_params
+from health_gain_uncertainty import gain_months_bands_batch
+
+SEX_WIDTH = 16  # chars kept per sex label; longer labels can't be FEMALE_LABELS anyway
+
+# name -> dtype of each shared column, per model
+LAYOUTS = {
+    "alcohol": {
+        "inputs": {
+            "age": np.float64, "sex": f"U{SEX_WIDTH}", "drinking_days": np.float64,
+            "drinks_per_occ": np.float64, "years_drinking": np.float64, "target_days": np.float64,
+        },
+        "outputs": {
+            "rr_now": np.float64, "rr_after": np.float64,
+            "gain_years": np.float64, "gain_months": np.int64,
+        },
+    },
+    "smoking": {
+        "inputs": {"cigs_now": np.float64, "cigs_goal": np.float64},
+        "outputs": {"smoking_gain": np.int64},
+    },
+    "joint": {
+        "inputs": {
+            "age": np.float64, "sex": f"U{SEX_WIDTH}", "drinking_days": np.float64,
+            "drinks_per_occ": np.float64, "years_drinking": np.float64, "target_days": np.float64,
+            "cigs_now": np.float64, "cigs_goal": np.float64,
+        },
+        "outputs": {
+            "rr_now": np.float64, "rr_after": np.float64, "alcohol_gain_months": np.int64,
+            "smoking_gain_months": np.int64, "combined_gain_months": np.int64,
+        },
+    },
+}
+DEFAULT_CAPACITY = 100_000
+
+
+# ------------------------
+# Worker side
+# ------------------------
+_worker = {}
+
+
+def _attach(model_name, names, capacity, n_bands=0):
+    layout = LAYOUTS[model_name]
+    blocks, arrays = [], {}
+    for col, dtype in {**layout["inputs"], **layout["outputs"]}.items():
+        shm = shared_memory.SharedMemory(name=names[col])
+        blocks.append(shm)
+        arrays[col] = np.ndarray((capacity,), dtype=dtype, buffer=shm.buf)
+    if n_bands:
+        shm = shared_memory.SharedMemory(name=names["bands"])
+        blocks.append(shm)
+        arrays["bands"] = np.ndarray((n_bands, capacity), dtype=np.float64, buffer=shm.buf)
+    _worker.update(model=model_name, blocks=blocks, arrays=arrays)
+
+
+def _score_shard(task):
+    start, stop, params = task
+    arrays = _worker["arrays"]
+    layout = LAYOUTS[_worker["model"]]
+    args = [arrays[col][start:stop] for col in layout["inputs"]]
+    if _worker["model"] == "alcohol":
+        out = model.health_gain_demo_batch(*args, params=params)
+    elif _worker["model"] == "joint":
+        out = health_gain_joint_batch(*args, params=params)
+    else:
+        out = {"smoking_gain": model.health_gain_smoking_batch(*args, params=params)}
+    for col in layout["outputs"]:
+        arrays[col][start:stop] = out[col]
+    return start
+
+
+def _band_shard(task):
+    start, stop, params, n_draws, percentiles, seed = task
+    arrays = _worker["arrays"]
+    args = [arrays[col][start:stop] for col in LAYOUTS["alcohol"]["inputs"]]
+    out = gain_months_bands_batch(*args, n_draws=n_draws, percentiles=percentiles, seed=seed, params=params)
+    for i, q in enumerate(percentiles):
+        arrays["bands"][i, start:stop] = out[f"p{q:g}"]
+    return start
+
+
+# ------------------------
+# Parent side
+# ------------------------
+class ParallelScorer:
+    """Process pool scoring one model over shared-memory columns.
+
+    Call it like the model's batch function (`health_gain_demo_batch`,
+    `health_gain_smoking_batch` or `health_gain_joint_batch`); it returns the
+    same result. The parent's parameter set (`params`, default: the active
+    one) is sent with every shard, so workers never read or watch the
+    parameter file themselves. Inputs longer than `capacity` are processed in
+    capacity-sized pieces.
+    """
+
+    def __init__(self, model_name="alcohol", workers=None, capacity=DEFAULT_CAPACITY,
+                 shard_size=None, mp_context=None, band_percentiles=None):
+        if model_name not in LAYOUTS:
+            raise ValueError(f"unknown model {model_name!r}")
+        if band_percentiles and model_name != "alcohol":
+            raise ValueError("bands are only available for the alcohol model")
+        self.model_name = model_name
+        self.band_percentiles = tuple(band_percentiles or ())
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = capacity
+        self.shard_size = shard_size or max(1, -(-capacity // (self.workers * 4)))
+        layout = LAYOUTS[model_name]
+
+        self._blocks = {}
+        self._arrays = {}
+        for col, dtype in {**layout["inputs"], **layout["outputs"]}.items():
+            nbytes = max(1, np.dtype(dtype).itemsize * capacity)
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._blocks[col] = shm
+            self._arrays[col] = np.ndarray((capacity,), dtype=dtype, buffer=shm.buf)
+        n_bands = len(self.band_percentiles)
+        if n_bands:
+            shm = shared_memory.SharedMemory(create=True, size=8 * n_bands * capacity)
+            self._blocks["bands"] = shm
+            self._arrays["bands"] = np.ndarray((n_bands, capacity), dtype=np.float64, buffer=shm.buf)
+
+        names = {col: shm.name for col, shm in self._blocks.items()}
+        ctx = mp.get_context(mp_context) if mp_context else mp
+        self._pool = ctx.Pool(self.workers, initializer=_attach,
+                              initargs=(model_name, names, capacity, n_bands))
+
+    def _columns(self, columns):
+        layout = LAYOUTS[self.model_name]
+        columns = [np.asarray(c) for c in columns]
+        # boolean "is female" masks travel as labels the model understands
+        columns = [np.where(c, "female", "male") if c.dtype == bool else c for c in columns]
+        if len(columns) != len(layout["inputs"]):
+            raise TypeError(f"expected {len(layout['inputs'])} input columns, got {len(columns)}")
+        return columns
+
+    def __call__(self, *columns, params=None):
+        p = params or current_params()
+        layout = LAYOUTS[self.model_name]
+        columns = self._columns(columns)
+        n = len(columns[0])
+        result = {col: np.empty(n, dtype=dtype) for col, dtype in layout["outputs"].items()}
+        for offset in range(0, n, self.capacity):
+            stop = min(offset + self.capacity, n)
+            self._run(columns, offset, stop, result, p)
+        if self.model_name == "smoking":
+            return result["smoking_gain"]
+        return result
+
+    def _run(self, columns, offset, stop, result, params):
+        layout = LAYOUTS[self.model_name]
+        size = stop - offset
+        for col, values in zip(layout["inputs"], columns):
+            self._arrays[col][:size] = values[offset:stop]
+        shards = [(s, min(s + self.shard_size, size), params) for s in range(0, size, self.shard_size)]
+        for _ in self._pool.imap_unordered(_score_shard, shards):
+            pass
+        for col in layout["outputs"]:
+            result[col][offset:stop] = self._arrays[col][:size]
+
+    def bands(self, *columns, n_draws=1_000, seed=0, params=None):
+        """`gain_months_bands_batch` over the pool, for the scorer's `band_percentiles`.
+
+        Needs a seed: each shard draws its own coefficient samples, which
+        only agree across workers when they come from the same seed.
+        """
+        if not self.band_percentiles:
+            raise ValueError("scorer was made without band_percentiles")
+        if seed is None:
+            raise ValueError("parallel bands need a fixed seed")
+        p = params or current_params()
+        columns = self._columns(columns)
+        n = len(columns[0])
+        result = {f"p{q:g}": np.empty(n) for q in self.band_percentiles}
+        for offset in range(0, n, self.capacity):
+            stop = min(offset + self.capacity, n)
+            size = stop - offset
+            for col, values in zip(LAYOUTS["alcohol"]["inputs"], columns):
+                self._arrays[col][:size] = values[offset:stop]
+            shards = [(s, min(s + self.shard_size, size), p, n_draws, self.band_percentiles, seed)
+                      for s in range(0, size, self.shard_size)]
+            for _ in self._pool.imap_unordered(_band_shard, shards):
+                pass
+            for i, q in enumerate(self.band_percentiles):
+                result[f"p{q:g}"][offset:stop] = self._arrays["bands"][i, :size]
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._arrays.clear()
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,164 @@
+"""Versioned model parameters, loaded from a file and hot-reloaded.
+
+The coefficients of the alcohol and smoking models live in a JSON file
+(`data/params.json`, or the path in HEALTH_GAIN_PARAMS) with a "version"
+string. It is parsed and validated once into an immutable `Params` tuple;
+readers call `current()`, which returns that object without locking or
+parsing. `reload()` / `watch()` build a complete new `Params` and swap the
+module reference in one assignment, so a request sees either the old set or
+the new one, never a mix. A file that fails to parse or validate is reported
+and the previous set stays active.
+
+Every result carries `Params.version`, and cache keys include it, so
+recalibrating invalidates cached results and lookup tables automatically.
+"""
+import json
+import os
+import sys
+import threading
+from typing import NamedTuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "params.json")
+PARAMS_ENV = "HEALTH_GAIN_PARAMS"
+
+
+class Params(NamedTuple):
+    version: str = "builtin"
+    # Alcohol: dose-response -> relative risk -> healthy-life gain
+    a: float = 0.02
+    b: float = 0.15
+    c: float = 0.10
+    k: float = 8.0
+    binge_drinks: float = 5
+    rr_floor: float = 0.8
+    gain_cap_years: float = 3.0
+    # sex_adj / age_adj
+    female_adj: float = 0.95
+    age_adj_base: float = 1.2
+    age_adj_pivot: float = 20
+    age_adj_slope: float = 0.01
+    age_adj_floor: float = 0.6
+    # Simple per-module indicators used by the dual alcohol + smoking app
+    alcohol_months_per_day: float = 0.8
+    smoking_months_per_pack: float = 96
+    cigs_per_pack: float = 20
+    # Weekly progress tracker: a sustained change's gain accrues evenly over this many years
+    progress_horizon_years: float = 40
+
+
+BUILTIN = Params()
+_POSITIVE = ("k", "rr_floor", "gain_cap_years", "cigs_per_pack", "progress_horizon_years")
+
+
+def from_dict(data):
+    """Validate a parsed parameter file into a `Params`."""
+    if not isinstance(data, dict):
+        raise ValueError("parameter file must hold a JSON object")
+    unknown = sorted(set(data) - set(Params._fields))
+    if unknown:
+        raise ValueError(f"unknown parameter(s): {', '.join(unknown)}")
+    if not isinstance(data.get("version"), str) or not data["version"]:
+        raise ValueError("parameter file needs a non-empty \"version\" string")
+    values = {}
+    for name, value in data.items():
+        if name == "version":
+            values[name] = value
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{name} must be a number, got {value!r}")
+        values[name] = value
+    params = BUILTIN._replace(**values)
+    for name in _POSITIVE:
+        if getattr(params, name) <= 0:
+            raise ValueError(f"{name} must be > 0")
+    return params
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return from_dict(json.load(f))
+
+
+def default_path():
+    return os.environ.get(PARAMS_ENV) or DEFAULT_PATH
+
+
+# ------------------------
+# Active set
+# ------------------------
+_current = None
+_stamp = None  # (mtime_ns, size) of the file last read
+_lock = threading.Lock()  # serialises loads/reloads only; current() never takes it
+
+
+def _stat(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def current():
+    """The active parameter set (loaded on first use)."""
+    params = _current
+    if params is None:
+        reload()
+        params = _current
+    return params
+
+
+def set_current(params):
+    """Make `params` active (e.g. in tests or worker processes)."""
+    global _current
+    _current = params
+
+
+def reload(path=None, force=False):
+    """Re-read the parameter file if it changed; returns True if a new set was activated.
+
+    A missing default file means the built-in values; a bad file raises and
+    leaves the active set untouched.
+    """
+    global _current, _stamp
+    path = path or default_path()
+    with _lock:
+        try:
+            stamp = _stat(path)
+        except FileNotFoundError:
+            if path != DEFAULT_PATH or _current is not None:
+                raise
+            _current = BUILTIN
+            return True
+        if not force and stamp == _stamp and _current is not None:
+            return False
+        _stamp = stamp  # a bad file is reported once, not on every poll
+        _current = load(path)
+        return True
+
+
+_watcher = None
+
+
+def watch(path=None, interval=1.0):
+    """Poll the parameter file in a daemon thread and hot-swap on change (once per process)."""
+    global _watcher
+    current()
+    with _lock:
+        if _watcher is not None:
+            return _watcher
+        stop = threading.Event()
+
+        def run():
+            error = None  # reported once per state change, not on every poll
+            while not stop.wait(interval):
+                try:
+                    if reload(path):
+                        print(f"health_gain_params: now using {_current.version!r}", file=sys.stderr)
+                    error = None
+                except (OSError, ValueError) as exc:
+                    if str(exc) != error:
+                        print(f"health_gain_params: keeping {_current.version!r}: {exc}", file=sys.stderr)
+                    error = str(exc)
+
+        _watcher = threading.Thread(target=run, name="health-gain-params", daemon=True)
+        _watcher.stop = stop
+        _watcher.start()
+        return _watcher
@@ -0,0 +1,241 @@
+"""Per-stage timing for app reruns and API requests.
+
+Off unless HEALTH_GAIN_PROFILE=1 (or `enable()`); when off, `rerun()` and
+`stage()` hand back shared no-op objects, so instrumented code pays one
+function call per stage. When on, every stage gets a count, a sum and a
+latency histogram in a process-wide registry, exported as Prometheus text
+or JSON:
+
+    prof = profile.rerun()        # top of the script
+    ...
+    prof.mark("inputs")           # time since the previous mark
+    with profile.stage("model"):  # or time one block
+        ...
+    prof.done()                   # records the whole rerun as "rerun"
+
+With HEALTH_GAIN_PROFILE_PORT=<port>, `serve_metrics()` starts a small HTTP
+thread answering /metrics (Prometheus) and /metrics.json for the app process.
+Other modules can add gauges to both (`add_collector`) and JSON endpoints of
+their own (`add_endpoint`).
+"""
+import bisect
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# upper bounds in seconds; a final +Inf bucket is implied
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRIC = "health_gain_stage_seconds"
+
+_enabled = os.environ.get("HEALTH_GAIN_PROFILE", "") not in ("", "0")
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+# ------------------------
+# Registry
+# ------------------------
+class Histogram:
+    __slots__ = ("count", "sum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+class Registry:
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = Histogram()
+            hist.observe(seconds)
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self):
+        """{stage: {"count", "sum", "mean", "buckets": {le: cumulative count}}}"""
+        with self._lock:
+            stages = {k: (h.count, h.sum, list(h.buckets)) for k, h in self._stages.items()}
+        out = {}
+        for stage, (count, total, buckets) in sorted(stages.items()):
+            cumulative, running = {}, 0
+            for le, n in zip([*map(str, BUCKETS), "+Inf"], buckets):
+                running += n
+                cumulative[le] = running
+            out[stage] = {"count": count, "sum": total, "mean": total / count if count else 0.0,
+                          "buckets": cumulative}
+        return out
+
+    def to_dict(self):
+        return {"enabled": _enabled, "stages": self.snapshot(),
+                "gauges": {name: value for name, _, value in _collect()}}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        lines = [f"# HELP {METRIC} Time spent per named stage.", f"# TYPE {METRIC} histogram"]
+        for stage, s in self.snapshot().items():
+            for le, n in s["buckets"].items():
+                lines.append(f'{METRIC}_bucket{{stage="{stage}",le="{le}"}} {n}')
+            lines.append(f'{METRIC}_sum{{stage="{stage}"}} {s["sum"]:.6f}')
+            lines.append(f'{METRIC}_count{{stage="{stage}"}} {s["count"]}')
+        for name, help_text, value in _collect():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+_collectors = []  # callables returning [(metric, help, value), ...]
+_endpoints = {}   # path -> callable returning a JSON-able object
+
+
+def add_collector(fn):
+    """Export the gauges `fn()` returns ([(metric, help, value), ...]) with every scrape."""
+    if fn not in _collectors:
+        _collectors.append(fn)
+
+
+def add_endpoint(path, fn):
+    """Serve `fn()` as JSON at `path` on the metrics endpoint."""
+    _endpoints[path] = fn
+
+
+def _collect():
+    return [gauge for fn in list(_collectors) for gauge in fn()]
+
+
+# ------------------------
+# Instrumentation
+# ------------------------
+class _Stage:
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self._start)
+        return False
+
+
+class _Rerun:
+    __slots__ = ("_start", "_last")
+
+    def __init__(self):
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        REGISTRY.observe(stage, now - self._last)
+        self._last = now
+
+    def done(self, stage="rerun"):
+        REGISTRY.observe(stage, time.perf_counter() - self._start)
+
+
+class _NullRerun:
+    __slots__ = ()
+
+    def mark(self, stage):
+        pass
+
+    def done(self, stage="rerun"):
+        pass
+
+
+_NULL_STAGE = contextlib.nullcontext()
+_NULL_RERUN = _NullRerun()
+
+
+def stage(name):
+    """Context manager timing one block as `name`."""
+    return _Stage(name) if _enabled else _NULL_STAGE
+
+
+def rerun():
+    """Sequential stage timer for one script run; see the module docstring."""
+    return _Rerun() if _enabled else _NULL_RERUN
+
+
+# ------------------------
+# HTTP endpoint
+# ------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, ctype = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+        elif path == "/metrics.json":
+            body, ctype = REGISTRY.to_json(), "application/json"
+        elif path in _endpoints:
+            body, ctype = json.dumps(_endpoints[path](), indent=2), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port=None, host="127.0.0.1"):
+    """Start the metrics thread once per process; no-op when profiling is off or no port is set.
+
+    If the port can't be bound (e.g. already in use) that is reported once on
+    stderr and later calls return None without retrying; the app runs on.
+    """
+    global _server, _server_failed
+    if port is None:
+        port = os.environ.get("HEALTH_GAIN_PROFILE_PORT")
+    if not _enabled or not port:
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError as exc:
+                _server_failed = True
+                print(f"health_gain_profile: metrics not served on {host}:{port}: {exc}", file=sys.stderr)
+                return None
+            threading.Thread(target=_server.serve_forever, name="health-gain-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,337 @@
+"""Weekly check-ins: a personal progress tracker with incremental totals.
+
+Off unless HEALTH_GAIN_PROGRESS_DB names a SQLite file (or `configure()` is
+called). A user checks in once a week with that week's drinking days and
+cigarettes per day. Their first check-in is the baseline. Each later week
+banks a share of the healthy-life gain that the change from the baseline
+would give if kept:
+
+    week gain (days) = (health_gain_alcohol(base days -> days)
+                        + health_gain_smoking(base cigarettes -> cigarettes))
+                       * days per month / (progress_horizon_years * 52)
+
+Weeks without a check-in bank nothing. A week at or above the baseline
+banks 0, because the models never return a negative gain.
+
+Storage is append-mostly and indexed for per-user scans:
+
+    checkins   (user, week) primary key, WITHOUT ROWID, so one user's history
+               is a contiguous range of the index; 5 small columns per row
+    totals     one row per user: baseline, weeks, first/last week, banked days
+
+A check-in adds its row and bumps the user's `totals` row by that week's
+gain in the same transaction. It never re-reads the history, so it costs
+the same after ten years as after one week. Checking in again for a week
+replaces that week's row and applies the difference. Correcting the
+baseline week, or `recompute()` after a recalibration, is the one path that
+rescans a user's history. `check_in_many()` applies a whole batch in one
+transaction, so there is one commit instead of one per row, and sorts
+the batch so each user's weeks are applied in order.
+
+Users are stored as a 64-bit keyed hash of the name they check in under.
+The key is drawn per database and kept in it. The file therefore holds no
+names, but a name can be found again only through the same file.
+
+    python health_gain_progress.py import progress.db checkins.csv   # user,week_start,drinking_days,cigs
+
+The import validates every row first and reports bad ones by line number.
+It applies the whole file in one transaction only if every row is valid, or
+applies the valid rows with --skip-invalid.
+    python health_gain_progress.py summary progress.db
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import hmac
+import os
+import sqlite3
+import sys
+import threading
+from typing import NamedTuple
+
+from health_gain_model import health_gain_alcohol, health_gain_smoking
+from health_gain_params import current as current_params
+
+PROGRESS_ENV = "HEALTH_GAIN_PROGRESS_DB"
+DAYS_PER_MONTH = 365.25 / 12
+MAX_DRINKING_DAYS = 7
+MAX_CIGS = 40
+_EPOCH_MONDAY = datetime.date(1970, 1, 5).toordinal()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS checkins (
+    user INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    drinking_days INTEGER NOT NULL,
+    cigs INTEGER NOT NULL,
+    gain_days REAL NOT NULL,
+    PRIMARY KEY (user, week)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (
+    user INTEGER PRIMARY KEY,
+    base_drinking_days INTEGER NOT NULL,
+    base_cigs INTEGER NOT NULL,
+    first_week INTEGER NOT NULL,
+    last_week INTEGER NOT NULL,
+    weeks INTEGER NOT NULL,
+    gain_days REAL NOT NULL
+);
+"""
+
+
+def week_of(day=None):
+    """Weeks since the Monday 1970-01-05 for `day` (default: today)."""
+    day = day or datetime.date.today()
+    return (day.toordinal() - _EPOCH_MONDAY) // 7
+
+
+def week_start(week):
+    """The Monday that starts `week`."""
+    return datetime.date.fromordinal(_EPOCH_MONDAY + 7 * week)
+
+
+def week_gain_days(base_drinking_days, base_cigs, drinking_days, cigs, params=None):
+    """Healthy days banked by one week at (drinking_days, cigs) against the baseline."""
+    p = params or current_params()
+    months = (health_gain_alcohol(base_drinking_days, 0, drinking_days, p)
+              + health_gain_smoking(base_cigs, cigs, p))
+    return months * DAYS_PER_MONTH / (p.progress_horizon_years * 52)
+
+
+def _whole(name, value, high=None):
+    try:
+        whole = int(value)
+    except (TypeError, ValueError, OverflowError):
+        whole = None
+    if whole is None or isinstance(value, (bool, str)) or whole != value or (
+            high is not None and not 0 <= whole <= high):
+        bounds = f" 0-{high}" if high is not None else ""
+        raise ValueError(f"{name} must be a whole number{bounds}, got {value!r}")
+    return whole
+
+
+def validate_checkin(week, drinking_days, cigs):
+    """(week, drinking_days, cigs) as ints; ValueError unless they are whole numbers in range."""
+    return (_whole("week", week), _whole("drinking_days", drinking_days, MAX_DRINKING_DAYS),
+            _whole("cigs", cigs, MAX_CIGS))
+
+
+class Progress(NamedTuple):
+    base_drinking_days: int
+    base_cigs: int
+    first_week: int
+    last_week: int
+    weeks: int
+    gain_days: float
+
+
+# ------------------------
+# Store
+# ------------------------
+class ProgressStore:
+    """One SQLite file of check-ins, shared by every session of a process."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()  # one connection, used from every session's thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('user_key', ?)", (os.urandom(16),))
+        self._key = self._conn.execute("SELECT value FROM meta WHERE name = 'user_key'").fetchone()[0]
+
+    def user_id(self, name):
+        """The stored id for a check-in name (case and surrounding spaces ignored)."""
+        digest = hmac.new(self._key, name.strip().casefold().encode("utf-8"), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+    def check_in(self, name, drinking_days, cigs, week=None, params=None):
+        """Record one week (default: this week) for `name`; returns the healthy days it banked."""
+        p = params or current_params()
+        user = self.user_id(name)
+        with self._lock, self._conn:
+            return self._apply(user, week_of() if week is None else week, drinking_days, cigs, p)
+
+    def check_in_many(self, rows, params=None):
+        """Apply (name, week, drinking_days, cigs) rows in one transaction; returns the row count."""
+        p = params or current_params()
+        rows = sorted((self.user_id(name), week, days, cigs) for name, week, days, cigs in rows)
+        with self._lock, self._conn:
+            for user, week, days, cigs in rows:
+                self._apply(user, week, days, cigs, p)
+        return len(rows)
+
+    def _apply(self, user, week, drinking_days, cigs, p):
+        week, drinking_days, cigs = validate_checkin(week, drinking_days, cigs)
+        conn = self._conn
+        total = conn.execute("SELECT * FROM totals WHERE user = ?", (user,)).fetchone()
+        if total is None:
+            conn.execute("INSERT INTO checkins VALUES (?, ?, ?, ?, 0.0)", (user, week, drinking_days, cigs))
+            conn.execute("INSERT INTO totals VALUES (?, ?, ?, ?, ?, 1, 0.0)",
+                         (user, drinking_days, cigs, week, week))
+            return 0.0
+        _, base_days, base_cigs, first, last, weeks, gain_days = total
+        if week < first:
+            raise ValueError(f"week {week_start(week)} is before this tracker's first check-in "
+                             f"({week_start(first)})")
+        if week == first:  # a new baseline changes every week's gain
+            conn.execute("UPDATE checkins SET drinking_days = ?, cigs = ? WHERE user = ? AND week = ?",
+                         (drinking_days, cigs, user, week))
+            self._recompute(user, p)
+            return 0.0
+        gain = week_gain_days(base_days, base_cigs, drinking_days, cigs, p)
+        old = conn.execute("SELECT gain_days FROM checkins WHERE user = ? AND week = ?", (user, week)).fetchone()
+        conn.execute("INSERT OR REPLACE INTO checkins VALUES (?, ?, ?, ?, ?)",
+                     (user, week, drinking_days, cigs, gain))
+        if old is None:
+            weeks += 1
+            gain_days += gain
+        else:
+            gain_days += gain - old[0]
+        conn.execute("UPDATE totals SET last_week = ?, weeks = ?, gain_days = ? WHERE user = ?",
+                     (max(last, week), weeks, gain_days, user))
+        return gain
+
+    def _recompute(self, user, p):
+        conn = self._conn
+        rows = conn.execute("SELECT week, drinking_days, cigs FROM checkins WHERE user = ? ORDER BY week",
+                            (user,)).fetchall()
+        (first, base_days, base_cigs), gains = rows[0], [0.0]
+        gains += [week_gain_days(base_days, base_cigs, days, cigs, p) for _, days, cigs in rows[1:]]
+        conn.executemany("UPDATE checkins SET gain_days = ? WHERE user = ? AND week = ?",
+                         [(g, user, week) for g, (week, _, _) in zip(gains, rows)])
+        conn.execute("UPDATE totals SET base_drinking_days = ?, base_cigs = ?, first_week = ?, last_week = ?, "
+                     "weeks = ?, gain_days = ? WHERE user = ?",
+                     (base_days, base_cigs, first, rows[-1][0], len(rows), sum(gains), user))
+
+    def recompute(self, name, params=None):
+        """Re-derive every week's gain for `name` (e.g. after recalibrating); returns the new `Progress`."""
+        p = params or current_params()
+        user = self.user_id(name)
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM totals WHERE user = ?", (user,)).fetchone():
+                self._recompute(user, p)
+        return self.progress(name)
+
+    # ---- reading ----
+    def progress(self, name):
+        """Totals for `name` (one indexed row, whatever the history's length); None before the first check-in."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM totals WHERE user = ?", (self.user_id(name),)).fetchone()
+        return None if row is None else Progress(*row[1:])
+
+    def history(self, name, since_week=None):
+        """[(week, drinking_days, cigs, gain_days), ...] in week order, from `since_week` on."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT week, drinking_days, cigs, gain_days FROM checkins WHERE user = ? AND week >= ? "
+                "ORDER BY week", (self.user_id(name), -2 ** 31 if since_week is None else since_week)).fetchall()
+
+    def summary(self):
+        """(users, check-ins, banked days over all users)."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(weeks), 0), COALESCE(SUM(gain_days), 0) "
+                                      "FROM totals").fetchone()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure(path=None):
+    """Open the process-wide store (default file: HEALTH_GAIN_PROGRESS_DB); None when unset."""
+    global _store
+    path = path or os.environ.get(PROGRESS_ENV)
+    if not path:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore(path)
+    return _store
+
+
+def store():
+    """The process-wide store, or None when the tracker is off."""
+    return _store
+
+
+def read_checkins(path, db=None):
+    """Parse and validate a check-in CSV (user,week_start,drinking_days,cigs).
+
+    Returns (rows, errors): rows as (name, week, drinking_days, cigs) for
+    `check_in_many`, errors as "line N: reason". With `db`, a row earlier than
+    its user's first stored check-in is an error too. Rows need not be sorted;
+    `check_in_many` applies each user's weeks in order.
+    """
+    rows, lines, errors = [], [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            line = reader.line_num
+            try:
+                name = row["user"]
+                if not name or not name.strip():
+                    raise ValueError("empty user")
+                week = week_of(datetime.date.fromisoformat(row["week_start"]))
+                days = int(row["drinking_days"])
+                cigs = int(row["cigs"])
+                rows.append((name,) + validate_checkin(week, days, cigs))
+                lines.append(line)
+            except (KeyError, TypeError, ValueError) as exc:
+                errors.append((line, str(exc)))
+    if db is not None:
+        firsts = {}
+        for name, week, _, _ in rows:
+            firsts[name] = min(week, firsts.get(name, week))
+        stored = {name: db.progress(name) for name in firsts}
+        keep = []
+        for line, row in zip(lines, rows):
+            state = stored[row[0]]
+            if state is not None and row[1] < state.first_week:
+                errors.append((line, f"week {week_start(row[1])} is before this user's first check-in "
+                                     f"({week_start(state.first_week)})"))
+            else:
+                keep.append(row)
+        rows = keep
+    return rows, [f"line {line}: {reason}" for line, reason in sorted(errors)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Weekly check-in store.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="apply check-ins from a CSV (user,week_start,drinking_days,cigs)")
+    imp.add_argument("db")
+    imp.add_argument("csv")
+    imp.add_argument("--skip-invalid", action="store_true",
+                     help="apply the valid rows and report the rest (default: apply nothing if any row is bad)")
+    sub.add_parser("summary", help="users, check-ins and banked days").add_argument("db")
+    args = ap.parse_args(argv)
+
+    db = ProgressStore(args.db)
+    if args.cmd == "import":
+        rows, errors = read_checkins(args.csv, db)
+        for error in errors:
+            print(f"{args.csv}: {error}", file=sys.stderr)
+        if errors and not args.skip_invalid:
+            print(f"{len(errors):,} invalid row(s); nothing applied (--skip-invalid applies the rest)",
+                  file=sys.stderr)
+            db.close()
+            sys.exit(1)
+        # one transaction: the whole file is applied or, on an error, none of it
+        n = db.check_in_many(rows)
+        print(f"{n:,} check-ins applied" + (f", {len(errors):,} skipped" if errors else ""), file=sys.stderr)
+    users, checkins, days = db.summary()
+    print(f"{users:,} users, {checkins:,} check-ins, {days:,.1f} healthy days banked")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
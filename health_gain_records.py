@@ -0,0 +1,294 @@
+"""Compact alcohol-model results for bulk runs.
+
+A `detail` dict from `health_gain_demo` costs several hundred bytes; a few
+million of them collected before building a DataFrame is gigabytes.
+
+`AlcoholResult` is the same record as a slotted object (no per-instance
+dict). `ResultBuffer` goes further and keeps results column-wise in
+fixed-dtype NumPy chunks of `chunk_size` rows, about 22 bytes per result:
+
+    age, drinks/week   int16     rr_now, rr_after, gain_years   float32
+    gain_months        int16     sex, param_version             uint8 codes
+
+Rounded values are restored on the way out (rr to 3 and gain_years to 2
+decimals, like `health_gain_demo`), so `to_frame()` / `to_csv()` match
+`health_gain_model.detail_frame` exactly and `to_json()` matches
+`json.dumps` of the `detail` dicts. All three are built column by column
+from the chunks, never through per-row dicts. The API's batch responses
+go through `to_json()`.
+
+    buf = ResultBuffer()
+    for person in people:
+        buf.add(**person)                 # scalar model, nothing kept per row
+    buf.score(*columns)                   # or a whole batch at once
+    buf.to_csv("scored.csv")
+"""
+import json
+
+import numpy as np
+
+import health_gain_model as model
+from health_gain_params import current as current_params
+
+# storage dtype per DETAIL_COLUMNS entry; sex and param_version are codes
+# into the buffer's label lists
+COLUMN_DTYPES = {
+    "age": np.int16,
+    "sex": np.uint8,
+    "now_drinks_per_week": np.int16,
+    "after_drinks_per_week": np.int16,
+    "rr_now": np.float32,
+    "rr_after": np.float32,
+    "gain_years": np.float32,
+    "gain_months": np.int16,
+    "param_version": np.uint8,
+}
+DECIMALS = {"rr_now": 3, "rr_after": 3, "gain_years": 2}
+LABEL_COLUMNS = ("sex", "param_version")
+_INT_RANGES = {col: (np.iinfo(dtype).min, np.iinfo(dtype).max) for col, dtype in COLUMN_DTYPES.items()
+               if col not in LABEL_COLUMNS and np.issubdtype(dtype, np.integer)}
+DEFAULT_CHUNK_SIZE = 65_536
+
+
+class AlcoholResult:
+    """One `health_gain_demo` result with the `detail` fields as slots."""
+
+    __slots__ = tuple(model.DETAIL_COLUMNS)
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    @classmethod
+    def from_detail(cls, detail):
+        return cls(**detail)
+
+    def as_dict(self):
+        """The `detail` dict (for JSON / one-row exports)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, AlcoholResult):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"AlcoholResult({fields})"
+
+
+def alcohol_record(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+    """`health_gain_demo` as an `AlcoholResult`."""
+    return AlcoholResult.from_detail(model.health_gain_demo(
+        age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params))
+
+
+class ResultBuffer:
+    """Append-only, column-wise store of alcohol results that grows in chunks.
+
+    Integer columns must hold whole numbers that fit their dtype; anything
+    else raises ValueError rather than being silently truncated.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.chunk_size = chunk_size
+        self._chunks = []  # list of {column: array of chunk_size}
+        self._fill = chunk_size  # rows used in the last chunk (full: allocate on next append)
+        self._labels = {col: [] for col in LABEL_COLUMNS}
+        self._codes = {col: {} for col in LABEL_COLUMNS}
+
+    def __len__(self):
+        if not self._chunks:
+            return 0
+        return (len(self._chunks) - 1) * self.chunk_size + self._fill
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column chunks (allocated, not just filled)."""
+        return sum(arr.nbytes for chunk in self._chunks for arr in chunk.values())
+
+    # ---- appending ----
+    def _code(self, col, label):
+        codes = self._codes[col]
+        code = codes.get(label)
+        if code is None:
+            if len(codes) > np.iinfo(COLUMN_DTYPES[col]).max:
+                raise ValueError(f"too many distinct {col} values for one buffer")
+            code = codes[label] = len(codes)
+            self._labels[col].append(label)
+        return code
+
+    def _new_chunk(self):
+        self._chunks.append({col: np.empty(self.chunk_size, dtype=dtype) for col, dtype in COLUMN_DTYPES.items()})
+        self._fill = 0
+
+    @staticmethod
+    def _fit(col, values):
+        dtype = COLUMN_DTYPES[col]
+        values = np.asarray(values)
+        if col in _INT_RANGES:
+            lo, hi = _INT_RANGES[col]
+            if len(values) and (values.min() < lo or values.max() > hi
+                                or not np.array_equal(values, np.floor(values))):
+                raise ValueError(f"{col} must be whole numbers in [{lo}, {hi}]")
+        return values.astype(dtype)
+
+    def append(self, result):
+        """Add one result (`AlcoholResult` or `detail` dict)."""
+        if isinstance(result, AlcoholResult):
+            result = result.as_dict()
+        values = {}
+        for col in COLUMN_DTYPES:
+            value = result[col]
+            if col in LABEL_COLUMNS:
+                value = self._code(col, value)
+            elif col in _INT_RANGES:
+                lo, hi = _INT_RANGES[col]
+                if not (lo <= value <= hi and value == int(value)):
+                    raise ValueError(f"{col} must be whole numbers in [{lo}, {hi}], got {value!r}")
+            values[col] = value
+        if self._fill == self.chunk_size:
+            self._new_chunk()
+        chunk, i = self._chunks[-1], self._fill
+        for col, value in values.items():
+            chunk[col][i] = value
+        self._fill += 1
+
+    def add(self, age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=None):
+        """Score one person with the scalar model and append the result."""
+        self.append(model.health_gain_demo(age, sex, drinking_days, drinks_per_occ, years_drinking,
+                                           target_days, params))
+
+    def extend(self, columns):
+        """Append many results given as a dict of equal-length columns keyed by DETAIL_COLUMNS.
+
+        `sex` and `param_version` may be arrays of labels or a single label.
+        """
+        n = len(columns["gain_months"])
+        stored = {}
+        for col in COLUMN_DTYPES:
+            values = columns[col]
+            if col in LABEL_COLUMNS:
+                if np.ndim(values) == 0:
+                    values = np.full(n, self._code(col, values), dtype=COLUMN_DTYPES[col])
+                else:
+                    uniques, inverse = np.unique(np.asarray(values), return_inverse=True)
+                    lookup = np.array([self._code(col, label) for label in uniques.tolist()])
+                    values = lookup[inverse]
+            stored[col] = self._fit(col, values)
+        done = 0
+        while done < n:
+            if self._fill == self.chunk_size:
+                self._new_chunk()
+            take = min(n - done, self.chunk_size - self._fill)
+            chunk, i = self._chunks[-1], self._fill
+            for col, values in stored.items():
+                chunk[col][i:i + take] = values[done:done + take]
+            self._fill += take
+            done += take
+
+    def score(self, age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+              batch=model.health_gain_demo_batch, params=None):
+        """Score columns with `batch` (any `health_gain_demo_batch`-like callable) and append them."""
+        p = params or current_params()
+        out = batch(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days, params=p)
+        drinks_per_occ = np.asarray(drinks_per_occ)
+        self.extend({
+            "age": age, "sex": sex,
+            "now_drinks_per_week": np.asarray(drinking_days) * drinks_per_occ,
+            "after_drinks_per_week": np.asarray(target_days) * drinks_per_occ,
+            **out,
+            "param_version": p.version,
+        })
+
+    # ---- reading ----
+    def _decode(self, col, values):
+        if col in LABEL_COLUMNS:
+            return np.array(self._labels[col], dtype=object)[values]
+        if col in DECIMALS:
+            return np.round(values.astype(np.float64), DECIMALS[col])
+        return values.astype(np.int64)
+
+    def _chunk_slices(self):
+        for i, chunk in enumerate(self._chunks):
+            rows = self._fill if i == len(self._chunks) - 1 else self.chunk_size
+            yield {col: arr[:rows] for col, arr in chunk.items()}
+
+    def column(self, col):
+        """One column, decoded, as a NumPy array."""
+        parts = [chunk[col] for chunk in self._chunk_slices()]
+        values = np.concatenate(parts) if parts else np.empty(0, dtype=COLUMN_DTYPES[col])
+        return self._decode(col, values)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        chunk = self._chunks[index // self.chunk_size]
+        i = index % self.chunk_size
+        fields = {}
+        for col in COLUMN_DTYPES:
+            value = chunk[col][i]
+            if col in LABEL_COLUMNS:
+                fields[col] = self._labels[col][value]
+            elif col in DECIMALS:
+                fields[col] = round(float(value), DECIMALS[col])
+            else:
+                fields[col] = int(value)
+        return AlcoholResult(**fields)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def frames(self):
+        """One DataFrame per chunk in DETAIL_COLUMNS order, e.g. for the bulk export writers."""
+        import pandas as pd
+
+        for chunk in self._chunk_slices():
+            yield pd.DataFrame({col: self._decode(col, chunk[col]) for col in model.DETAIL_COLUMNS})
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({col: self.column(col) for col in model.DETAIL_COLUMNS})
+
+    def to_csv(self, path_or_buf):
+        """Write the buffer as CSV one chunk at a time; returns the number of rows."""
+        if isinstance(path_or_buf, str):
+            with open(path_or_buf, "w", newline="", encoding="utf-8") as f:
+                return self.to_csv(f)
+        rows = 0
+        for i, frame in enumerate(self.frames()):
+            frame.to_csv(path_or_buf, index=False, header=(i == 0))
+            rows += len(frame)
+        if rows == 0:
+            path_or_buf.write(",".join(model.DETAIL_COLUMNS) + "\n")
+        return rows
+
+    def to_json(self, block=8192):
+        """The results as a JSON array of `detail` objects, same text as `json.dumps([detail, ...])`.
+
+        Rows are formatted from the columns `block` at a time; labels are
+        JSON-encoded once per distinct value.
+        """
+        labels = {col: [json.dumps(label, ensure_ascii=False) for label in self._labels[col]]
+                  for col in LABEL_COLUMNS}
+        # floats: repr() is what json.dumps writes for finite values
+        spec = {col: "%s" if col in LABEL_COLUMNS else "%r" if col in DECIMALS else "%d" for col in COLUMN_DTYPES}
+        row = "{" + ", ".join(f"{json.dumps(col)}: {spec[col]}" for col in model.DETAIL_COLUMNS) + "}"
+        parts = []
+        for chunk in self._chunk_slices():
+            for start in range(0, len(chunk["gain_months"]), block):
+                columns = []
+                for col in model.DETAIL_COLUMNS:
+                    values = chunk[col][start:start + block]
+                    if col in LABEL_COLUMNS:
+                        columns.append([labels[col][code] for code in values.tolist()])
+                    else:
+                        columns.append(self._decode(col, values).tolist())
+                parts.append(", ".join(row % values for values in zip(*columns)))
+        return "[" + ", ".join(parts) + "]"
@@ -0,0 +1,315 @@
+"""Static what-if report: precomputed scenario tables and charts, no Streamlit.
+
+One page per (language, age band, sex) scenario, for EN and NO and every
+band in `health_gain_segments.AGE_BANDS`. A page holds, for a typical person
+of that band (the band midpoint; 80 for the open-ended top band):
+
+    - a table of gain_months for every "days now" x "goal days" pair, per
+      drinks-per-day level in DRINKS_PER_OCC
+    - the one-pager's headline example (4 -> 2 days) with its 90% band
+    - an SVG bar chart of the gain for every goal from 7 days/week
+
+Each page is written as Markdown and as self-contained HTML (charts inline;
+the Markdown links the same charts as .svg files), plus an index per
+language and a top-level index. Serve the output directory with any static
+file server.
+
+Scenarios are rendered in parallel worker processes. Each one has a content
+hash over everything its pages depend on (generator and model versions, the
+parameter set, the catalog strings and the scenario itself), kept in
+`<out>/.report-cache.json`; a re-run skips scenarios whose hash is unchanged
+and whose files are still there, and files are only rewritten when their
+bytes differ, so mtimes (and rsync/CDN uploads) only change with content.
+
+    python health_gain_report.py reports/ [--workers 4] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import health_gain_model as model
+from health_gain_i18n import catalog, languages
+from health_gain_params import current as current_params
+from health_gain_segments import AGE_BANDS, SEXES, band_labels
+from health_gain_uncertainty import gain_months_bands
+
+GENERATOR_VERSION = "1"  # bump when the page layout changes
+CATALOG = "report"
+MANIFEST = ".report-cache.json"
+DRINKS_PER_OCC = (2, 4, 6)
+DAYS = tuple(range(1, 8))         # days now (table rows)
+GOALS = tuple(range(0, 7))        # goal days (table columns)
+YEARS_DRINKING = 10               # capped at age - 15
+OPEN_BAND_AGE = 80                # "typical" age for the open-ended top band
+EXAMPLE = (4, 2)                  # the one-pager's headline: 4 -> 2 days/week
+CHART_NOW = 7
+BAND_DRAWS = 2_000
+
+
+# ------------------------
+# Scenarios
+# ------------------------
+def scenarios(langs=None, age_bands=AGE_BANDS, sexes=SEXES):
+    """Every (language, age band, sex) page as a small JSON-able dict."""
+    out = []
+    edges = list(age_bands)
+    for lang in langs or languages(CATALOG):
+        for band, lo, hi in zip(band_labels(edges), edges, edges[1:] + [None]):
+            age = OPEN_BAND_AGE if hi is None else (lo + hi - 1) // 2
+            for sex in sexes:
+                out.append({
+                    "lang": lang, "band": band, "age": age, "sex": sex,
+                    "years": min(YEARS_DRINKING, max(age - 15, 0)),
+                    "slug": f"{sex}-{band.replace('+', 'plus')}",
+                })
+    return out
+
+
+def scenario_key(scenario, params=None):
+    """Content hash of everything a scenario's pages depend on."""
+    p = params or current_params()
+    blob = json.dumps({
+        "generator": GENERATOR_VERSION,
+        "model": model.MODEL_VERSION,
+        "params": p._asdict(),
+        "strings": dict(catalog(CATALOG, scenario["lang"])),
+        "layout": [DRINKS_PER_OCC, DAYS, GOALS, EXAMPLE, CHART_NOW, BAND_DRAWS],
+        "scenario": scenario,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _grid(s, drinks, p):
+    # gain_months[now_index, goal_index]; None where the goal isn't below "now"
+    now, goal = np.meshgrid(DAYS, GOALS, indexing="ij")
+    n = now.size
+    out = model.health_gain_demo_batch(np.full(n, s["age"]), np.full(n, s["sex"]), now.ravel(),
+                                       np.full(n, drinks), np.full(n, s["years"]), goal.ravel(), params=p)
+    months = out["gain_months"].reshape(now.shape).tolist()
+    return [[m if g < d else None for g, m in zip(GOALS, row)] for d, row in zip(DAYS, months)]
+
+
+# ------------------------
+# Rendering
+# ------------------------
+def _svg_chart(values, T, drinks, cap):
+    """Bar chart of gain per goal (plain SVG, no plotting library)."""
+    w, h, left, bottom, top = 440, 240, 48, 40, 28
+    plot_w, plot_h = w - left - 12, h - bottom - top
+    step = plot_w / len(values)
+    title = html.escape(T.format("chart_title", now=CHART_NOW, drinks=drinks))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}" '
+        f'role="img" aria-label="{title}" font-family="sans-serif" font-size="11">',
+        f'<text x="{w / 2:g}" y="16" text-anchor="middle" font-size="12">{title}</text>',
+    ]
+    for tick in range(0, int(cap) + 1, 6):
+        y = top + plot_h * (1 - tick / cap)
+        parts.append(f'<line x1="{left}" x2="{w - 12}" y1="{y:.1f}" y2="{y:.1f}" stroke="#ddd"/>')
+        parts.append(f'<text x="{left - 6}" y="{y + 4:.1f}" text-anchor="end">{tick}</text>')
+    for i, (goal, months) in enumerate(values):
+        x = left + i * step + step * 0.15
+        bar = plot_h * min(months, cap) / cap
+        parts.append(f'<rect x="{x:.1f}" y="{top + plot_h - bar:.1f}" width="{step * 0.7:.1f}" '
+                     f'height="{bar:.1f}" fill="#4c78a8"><title>{months}</title></rect>')
+        parts.append(f'<text x="{x + step * 0.35:.1f}" y="{top + plot_h + 14}" text-anchor="middle">{goal}</text>')
+    parts.append(f'<text x="{left + plot_w / 2:.1f}" y="{h - 6}" text-anchor="middle">'
+                 f'{html.escape(T["chart_x"])}</text>')
+    parts.append(f'<text transform="translate(12 {top + plot_h / 2:.1f}) rotate(-90)" text-anchor="middle">'
+                 f'{html.escape(T["chart_y"])}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def _cell(months):
+    return "–" if months is None else str(months)
+
+
+def _markdown_table(grid, T):
+    lines = [f"| {T['corner']} | " + " | ".join(str(g) for g in GOALS) + " |",
+             "|---|" + "---:|" * len(GOALS)]
+    for d, row in zip(DAYS, grid):
+        lines.append(f"| **{d}** | " + " | ".join(_cell(m) for m in row) + " |")
+    return "\n".join(lines)
+
+
+def _html_table(grid, T):
+    head = "".join(f"<th>{g}</th>" for g in GOALS)
+    rows = "".join(
+        f"<tr><th>{d}</th>" + "".join(f"<td>{_cell(m)}</td>" for m in row) + "</tr>"
+        for d, row in zip(DAYS, grid)
+    )
+    return f"<table><thead><tr><th>{html.escape(T['corner'])}</th>{head}</tr></thead><tbody>{rows}</tbody></table>"
+
+
+_STYLE = ("body{font-family:sans-serif;max-width:52rem;margin:2rem auto;padding:0 1rem;color:#222}"
+          "table{border-collapse:collapse;margin:.5rem 0 1rem}th,td{border:1px solid #ccc;padding:.2rem .5rem;"
+          "text-align:right}thead th{background:#f3f3f3}small{color:#666}")
+
+
+def _html_page(title, body, lang):
+    return (f'<!DOCTYPE html>\n<html lang="{lang.lower()}">\n<head><meta charset="utf-8">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head>\n"
+            f"<body>\n{body}\n</body>\n</html>\n")
+
+
+def render_scenario(scenario, params=None):
+    """All files for one scenario as {relative path: text} (the worker entry point)."""
+    p = params or current_params()
+    s = scenario
+    T = catalog(CATALOG, s["lang"])
+    lang_dir = s["lang"].lower()
+    title = T.format("page_title", sex=T[s["sex"]], band=s["band"])
+    cap = p.gain_cap_years * 12
+
+    now, goal = EXAMPLE
+    drinks = DRINKS_PER_OCC[0]
+    headline = model.health_gain_demo(s["age"], s["sex"], now, drinks, s["years"], goal, p)["gain_months"]
+    bands = gain_months_bands(s["age"], s["sex"], now, drinks, s["years"], goal, n_draws=BAND_DRAWS,
+                              seed=0, params=p)
+    example = T.format("example", now=now, goal=goal, months=headline, lo=bands["p5"], hi=bands["p95"])
+    intro = [T.format("assumptions", age=s["age"], years=s["years"]), example]
+    footer = T.format("footer", model=model.MODEL_VERSION, params=p.version)
+
+    files = {}
+    md = [f"# {title}", "", intro[0], "", intro[1], ""]
+    body = [f'<p><a href="index.html">{html.escape(T["back"])}</a></p>', f"<h1>{html.escape(title)}</h1>",
+            *(f"<p>{html.escape(line)}</p>" for line in intro)]
+    for d in DRINKS_PER_OCC:
+        grid = _grid(s, d, p)
+        chart = _svg_chart(list(zip(GOALS, grid[DAYS.index(CHART_NOW)])), T, d, cap)
+        chart_name = f"{s['slug']}-d{d}.svg"
+        files[f"{lang_dir}/{chart_name}"] = chart
+        heading = T.format("table_title", drinks=d)
+        md += [f"## {heading}", "", _markdown_table(grid, T), "", f"![{heading}]({chart_name})", ""]
+        body += [f"<h2>{html.escape(heading)}</h2>", _html_table(grid, T), chart]
+    md += [f"[{T['back']}](index.md)", "", f"<small>{footer}</small>", ""]
+    body += [f"<p><small>{html.escape(footer)}</small></p>"]
+    files[f"{lang_dir}/{s['slug']}.md"] = "\n".join(md)
+    files[f"{lang_dir}/{s['slug']}.html"] = _html_page(title, "\n".join(body), s["lang"])
+    return files
+
+
+def render_indexes(all_scenarios):
+    """Per-language index pages and the top-level index; {relative path: text}."""
+    files = {}
+    by_lang = {}
+    for s in all_scenarios:
+        by_lang.setdefault(s["lang"], []).append(s)
+    top_md, top_html = [], []
+    for lang, items in by_lang.items():
+        T = catalog(CATALOG, lang)
+        lang_dir = lang.lower()
+        md = [f"# {T['title']}", "", T["intro"], ""]
+        body = [f"<h1>{html.escape(T['title'])}</h1>", f"<p>{html.escape(T['intro'])}</p>"]
+        for sex in dict.fromkeys(s["sex"] for s in items):
+            md.append(f"## {T[sex]}")
+            md.append("")
+            links = []
+            for s in items:
+                if s["sex"] == sex:
+                    md.append(f"- [{s['band']}]({s['slug']}.md)")
+                    links.append(f'<li><a href="{s["slug"]}.html">{html.escape(s["band"])}</a></li>')
+            md.append("")
+            body += [f"<h2>{html.escape(T[sex])}</h2>", f"<ul>{''.join(links)}</ul>"]
+        files[f"{lang_dir}/index.md"] = "\n".join(md)
+        files[f"{lang_dir}/index.html"] = _html_page(T["title"], "\n".join(body), lang)
+        top_md.append(f"- [{T['lang_name']}]({lang_dir}/index.md)")
+        top_html.append(f'<li><a href="{lang_dir}/index.html" hreflang="{lang_dir}">{html.escape(T["lang_name"])}</a></li>')
+    T = catalog(CATALOG)
+    files["index.md"] = "\n".join([f"# {T['title']}", "", *top_md, ""])
+    files["index.html"] = _html_page(T["title"], f"<h1>{html.escape(T['title'])}</h1>\n<ul>{''.join(top_html)}</ul>",
+                                     T.lang)
+    return files
+
+
+# ------------------------
+# Build
+# ------------------------
+def write_if_changed(path, text):
+    """Write `text` to `path` unless it already holds exactly those bytes; True if written."""
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _render_task(task):
+    scenario, params = task
+    return render_scenario(scenario, params)
+
+
+def build(out_dir, workers=None, force=False, params=None, langs=None):
+    """Render every scenario into `out_dir`; returns {"rendered", "skipped", "written"} counts."""
+    p = params or current_params()
+    all_scenarios = scenarios(langs)
+    manifest = {} if force else _load_manifest(out_dir)
+    entries = {}
+    stale = []
+    for s in all_scenarios:
+        name = f"{s['lang'].lower()}/{s['slug']}"
+        key = scenario_key(s, p)
+        entry = manifest.get(name)
+        if (entry and entry["key"] == key
+                and all(os.path.exists(os.path.join(out_dir, f)) for f in entry["files"])):
+            entries[name] = entry
+        else:
+            stale.append((name, key, s))
+
+    tasks = [(s, p) for _, _, s in stale]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and len(tasks) > 1 else None
+    written = 0
+    try:
+        rendered = pool.map(_render_task, tasks) if pool else map(_render_task, tasks)
+        for (name, key, _), files in zip(stale, rendered):
+            for rel, text in files.items():
+                written += write_if_changed(os.path.join(out_dir, rel), text)
+            entries[name] = {"key": key, "files": sorted(files)}
+    finally:
+        if pool:
+            pool.shutdown()
+    for rel, text in render_indexes(all_scenarios).items():
+        written += write_if_changed(os.path.join(out_dir, rel), text)
+    write_if_changed(os.path.join(out_dir, MANIFEST), json.dumps(entries, indent=1, sort_keys=True) + "\n")
+    return {"rendered": len(stale), "skipped": len(all_scenarios) - len(stale), "written": written}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write the static what-if report (HTML + Markdown).")
+    ap.add_argument("out_dir", nargs="?", default="reports")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="ignore the cache and re-render every scenario")
+    ap.add_argument("--lang", action="append", help="only this language (repeatable; default: all)")
+    args = ap.parse_args(argv)
+
+    stats = build(args.out_dir, workers=args.workers, force=args.force, langs=args.lang)
+    print(f"{stats['rendered']} scenario(s) rendered, {stats['skipped']} unchanged, "
+          f"{stats['written']} file(s) written to {args.out_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Population segmentation: grouped gain summaries over large cohorts.
+
+Rows are scored with the alcohol model chunk by chunk and folded into
+per-segment accumulators (age band x sex x consumption tier), so a file of
+any size is summarised in one streaming pass with memory bounded by the
+number of segments. Each segment key is packed into one integer and
+accumulated with `np.bincount`; gain_months is an integer, so a per-segment
+histogram of it gives exact percentiles without keeping the rows.
+
+Per segment: n (or summed weights), mean gain_months, percentiles and the
+population-attributable healthy months (total months gained if everyone in
+the segment reached their target).
+
+    python health_gain_segments.py cohort.csv -o segments.csv
+"""
+import argparse
+import sys
+
+import numpy as np
+
+import health_gain_model as model
+from health_gain_params import current as current_params
+
+AGE_BANDS = (15, 25, 35, 45, 55, 65, 75)  # lower edges; the last band is open-ended
+TIER_EDGES = (0, 1, 8, 15)                # drinks per week now, lower edges
+TIER_LABELS = ("none", "low", "moderate", "high")
+SEXES = ("male", "female")
+DEFAULT_PERCENTILES = (5, 50, 95)
+SUMMARY_COLUMNS = ["age_band", "sex", "tier", "n", "mean_gain_months", "attributable_months"]
+
+
+def band_labels(edges):
+    labels = [f"{lo}-{hi - 1}" for lo, hi in zip(edges, edges[1:])]
+    return labels + [f"{edges[-1]}+"]
+
+
+def _bin(values, edges):
+    # index of the band each value falls in; values below the first edge go to band 0
+    return np.clip(np.searchsorted(np.asarray(edges), values, side="right") - 1, 0, len(edges) - 1)
+
+
+class SegmentAccumulator:
+    """Streaming group-by of gain_months over age band x sex x tier."""
+
+    def __init__(self, age_bands=AGE_BANDS, tier_edges=TIER_EDGES, tier_labels=TIER_LABELS,
+                 percentiles=DEFAULT_PERCENTILES):
+        if len(tier_edges) != len(tier_labels):
+            raise ValueError("tier_edges and tier_labels must have the same length")
+        self.age_bands = tuple(age_bands)
+        self.tier_edges = tuple(tier_edges)
+        self.tier_labels = tuple(tier_labels)
+        self.percentiles = tuple(percentiles)
+        self.n_groups = len(self.age_bands) * len(SEXES) * len(self.tier_edges)
+        self.months_bins = int(round(current_params().gain_cap_years * 12)) + 1
+        self.weight = np.zeros(self.n_groups)
+        self.months_sum = np.zeros(self.n_groups)
+        self.hist = np.zeros((self.n_groups, self.months_bins))
+        self.rows = 0
+        self.weighted = False
+
+    def _codes(self, age, sex, drinks_per_week):
+        a = _bin(np.asarray(age, dtype=np.float64), self.age_bands)
+        s = model.female_mask(sex).astype(np.intp)
+        t = _bin(np.asarray(drinks_per_week, dtype=np.float64), self.tier_edges)
+        return (a * len(SEXES) + s) * len(self.tier_edges) + t
+
+    def add(self, age, sex, drinks_per_week, gain_months, weight=None):
+        """Fold one chunk of columns (already scored) into the totals."""
+        codes = self._codes(age, sex, drinks_per_week)
+        months = np.asarray(gain_months).astype(np.intp)
+        top = int(months.max(initial=0)) + 1
+        if top > self.months_bins:  # e.g. the life-table engine, which has no 3-year cap
+            self.hist = np.pad(self.hist, ((0, 0), (0, top - self.months_bins)))
+            self.months_bins = top
+        w = None if weight is None else np.asarray(weight, dtype=np.float64)
+        self.weighted |= w is not None
+        self.weight += np.bincount(codes, weights=w, minlength=self.n_groups)
+        self.months_sum += np.bincount(codes, weights=months if w is None else months * w,
+                                       minlength=self.n_groups)
+        cells = np.bincount(codes * self.months_bins + months, weights=w,
+                            minlength=self.n_groups * self.months_bins)
+        self.hist += cells.reshape(self.n_groups, self.months_bins)
+        self.rows += len(codes)
+
+    def add_frame(self, df, batch=model.health_gain_demo_batch, weight_column=None, params=None):
+        """Score a DataFrame holding INPUT_COLUMNS with `batch` and fold it in."""
+        out = batch(*(df[col].to_numpy() for col in model.INPUT_COLUMNS), params=params)
+        drinks_per_week = df["drinking_days"].to_numpy() * df["drinks_per_occ"].to_numpy()
+        weight = df[weight_column].to_numpy() if weight_column else None
+        self.add(df["age"].to_numpy(), df["sex"].to_numpy(), drinks_per_week, out["gain_months"], weight)
+
+    def percentile(self, q):
+        """Nearest-rank percentile of gain_months per segment (NaN for empty segments)."""
+        cum = np.cumsum(self.hist, axis=1)
+        target = np.maximum(q / 100.0 * cum[:, -1], 1e-12)
+        value = (cum < target[:, None]).sum(axis=1).astype(np.float64)
+        value[cum[:, -1] == 0] = np.nan
+        return value
+
+    def result(self, include_empty=False):
+        """One row per segment, in SUMMARY_COLUMNS order plus gain_months_p<q>."""
+        import pandas as pd
+
+        ages = band_labels(self.age_bands)
+        shape = (len(ages), len(SEXES), len(self.tier_edges))
+        a, s, t = (idx.reshape(-1) for idx in np.indices(shape))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.months_sum / self.weight
+        frame = pd.DataFrame({
+            "age_band": np.asarray(ages)[a],
+            "sex": np.asarray(SEXES)[s],
+            "tier": np.asarray(self.tier_labels)[t],
+            "n": self.weight,
+            "mean_gain_months": np.round(mean, 2),
+            "attributable_months": self.months_sum,
+        })
+        for q in self.percentiles:
+            frame[f"gain_months_p{q:g}"] = self.percentile(q)
+        if not include_empty:
+            frame = frame[frame["n"] > 0].reset_index(drop=True)
+            frame[[f"gain_months_p{q:g}" for q in self.percentiles]] = \
+                frame[[f"gain_months_p{q:g}" for q in self.percentiles]].astype(np.int64)
+        if not self.weighted:
+            frame[["n", "attributable_months"]] = frame[["n", "attributable_months"]].astype(np.int64)
+        return frame
+
+
+def summarise(chunks, batch=model.health_gain_demo_batch, weight_column=None, params=None, **kwargs):
+    """Stream DataFrame chunks through a SegmentAccumulator; returns the summary frame.
+
+    All chunks are scored with one parameter set (`params`, default: the
+    active one), even if it is hot-swapped mid-stream.
+    """
+    p = params or current_params()
+    acc = SegmentAccumulator(**kwargs)
+    for chunk in chunks:
+        acc.add_frame(chunk, batch, weight_column, p)
+    return acc.result()
+
+
+def main(argv=None):
+    from health_gain_cli import DEFAULT_CHUNK_SIZE, guess_format, read_chunks
+
+    ap = argparse.ArgumentParser(description="Summarise alcohol-model gains by age band, sex and tier.")
+    ap.add_argument("input", help="CSV or JSONL file with the model's input columns, or - for stdin")
+    ap.add_argument("-o", "--output", default="-", help="output CSV (default: stdout)")
+    ap.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from extension)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--weight-column", help="survey weight column (default: every row counts 1)")
+    ap.add_argument("--age-bands", type=lambda v: tuple(int(x) for x in v.split(",")), default=AGE_BANDS,
+                    help="comma-separated lower edges (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    chunks = read_chunks(args.input, args.format or guess_format(args.input), args.chunk_size)
+    summary = summarise(chunks, weight_column=args.weight_column, age_bands=args.age_bands)
+    summary.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Minimal per-session state, idle eviction and memory accounting for the apps.
+
+Everything a rerun needs is read from the widgets, whose values the browser
+re-sends with every rerun (the language is the radio's own keyed value, not
+a copy). The only other per-session data is one slotted `SessionData` under
+st.session_state["hg"]:
+
+    telemetry_token   random token whose hash pseudonymises telemetry (None until used)
+    last_seen         time.monotonic() of the session's latest rerun
+
+`start()` (once per process) runs a sweeper that, every quarter TTL (at most
+a minute), evicts sessions idle for longer than HEALTH_GAIN_SESSION_TTL seconds
+(default 900). A connected session has its session state and cached message
+references dropped; the browser tab still holds its widget values and sends
+them with the next interaction, so a returning visitor sees the same page
+(telemetry counts them as a new session). A disconnected session, which
+Streamlit would otherwise keep for reconnects, is shut down.
+
+`accounting()` sizes each session's state (with the same asizeof Streamlit's
+own stats use) and the total. With profiling on, the metrics endpoint adds
+session gauges to /metrics and a per-session breakdown at /sessions.json:
+
+    HEALTH_GAIN_PROFILE=1 HEALTH_GAIN_PROFILE_PORT=9100 HEALTH_GAIN_SESSION_TTL=300 \\
+        python3 -m streamlit run ai_health_gain_demo.py
+    curl localhost:9100/sessions.json
+
+The sweeper and `accounting()` reach into Streamlit's runtime (session
+manager, session run state, message cache, event loop), which has no public
+API for this; they are written against the Streamlit version pinned in
+requirements.txt (STREAMLIT_TESTED) and do nothing outside a running server
+(e.g. under AppTest). If any of those internals is missing or has changed,
+that is reported once on stderr and both turn themselves off for the rest of
+the process; the apps run on without idle eviction.
+"""
+import contextlib
+import os
+import sys
+import threading
+import time
+
+import health_gain_profile as profile
+
+SESSION_KEY = "hg"
+TTL_ENV = "HEALTH_GAIN_SESSION_TTL"
+DEFAULT_TTL = 900.0
+STREAMLIT_TESTED = "1.38.0"  # keep in step with requirements.txt
+
+
+class SessionData:
+    """The apps' own per-session state (see the module docstring)."""
+
+    __slots__ = ("telemetry_token", "last_seen")
+
+    def __init__(self):
+        self.telemetry_token = None
+        self.last_seen = time.monotonic()
+
+
+def current(state=None):
+    """This session's `SessionData` (created on first use), marked as seen now."""
+    if state is None:
+        import streamlit as st
+
+        state = st.session_state
+    data = state.get(SESSION_KEY)
+    if data is None:
+        data = state[SESSION_KEY] = SessionData()
+    data.last_seen = time.monotonic()
+    return data
+
+
+def ttl():
+    return float(os.environ.get(TTL_ENV) or DEFAULT_TTL)
+
+
+# ------------------------
+# Runtime access
+# ------------------------
+_disabled = False
+
+
+@contextlib.contextmanager
+def _internals(what):
+    """Guard one use of Streamlit internals: if it fails, report it once and turn the sweeper off.
+
+    Callers check `_disabled` after the block; the exception is not re-raised.
+    """
+    global _disabled
+    try:
+        yield
+    except (AttributeError, ImportError, TypeError) as exc:
+        if not _disabled:
+            _disabled = True
+            print(f"health_gain_session: {what} not as in streamlit {STREAMLIT_TESTED} ({exc!r}); "
+                  "idle-session sweeper and session accounting disabled", file=sys.stderr)
+
+
+def _runtime():
+    if _disabled:
+        return None
+    try:
+        from streamlit.runtime import Runtime
+    except ImportError:
+        return None
+    return Runtime.instance() if Runtime.exists() else None
+
+
+def _sessions(runtime):
+    """(session, connected) for every session the runtime holds; [] once disabled."""
+    with _internals("Runtime._session_mgr"):
+        mgr = runtime._session_mgr
+        return [(info.session, mgr.is_active_session(info.session.id)) for info in mgr.list_sessions()]
+    return []
+
+
+def _data(session):
+    try:
+        return session.session_state[SESSION_KEY]
+    except KeyError:
+        return None
+
+
+# ------------------------
+# Eviction
+# ------------------------
+_evicted = 0
+
+
+def sweep(max_idle=None, now=None):
+    """Evict sessions idle for longer than `max_idle` seconds; returns how many.
+
+    Must run on the runtime's event loop thread (the sweeper schedules it there).
+    """
+    global _evicted
+    runtime = _runtime()
+    if runtime is None:
+        return 0
+    with _internals("AppSessionState.APP_NOT_RUNNING"):
+        from streamlit.runtime.app_session import AppSessionState
+
+        not_running = AppSessionState.APP_NOT_RUNNING
+    if _disabled:
+        return 0
+    max_idle = ttl() if max_idle is None else max_idle
+    now = time.monotonic() if now is None else now
+    evicted = 0
+    for session, connected in _sessions(runtime):
+        data = _data(session)
+        if data is None or now - data.last_seen < max_idle:
+            continue
+        if not connected:
+            runtime.close_session(session.id)
+        else:
+            with _internals("AppSession._state"):
+                if session._state != not_running:
+                    continue  # mid-run: its state is in use
+            if _disabled:
+                break
+            session.session_state.clear()
+            with _internals("Runtime.message_cache.remove_refs_for_session"):
+                runtime.message_cache.remove_refs_for_session(session)
+            if _disabled:
+                break
+        evicted += 1
+    _evicted += evicted
+    return evicted
+
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def start(interval=None):
+    """Start the idle-session sweeper and the accounting metrics (once per process)."""
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is not None:
+            return _sweeper
+        interval = min(60.0, ttl() / 4) if interval is None else interval
+        _check_version()
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval) and not _disabled:
+                runtime = _runtime()
+                if runtime is None:
+                    continue
+                with _internals("Runtime._async_objs.eventloop"):
+                    if runtime._async_objs is not None:
+                        runtime._async_objs.eventloop.call_soon_threadsafe(sweep)
+
+        _sweeper = threading.Thread(target=run, name="health-gain-sessions", daemon=True)
+        _sweeper.stop = stop
+        _sweeper.start()
+        profile.add_collector(_gauges)
+        profile.add_endpoint("/sessions.json", accounting)
+        return _sweeper
+
+
+def _check_version():
+    try:
+        from importlib.metadata import version
+
+        installed = version("streamlit")
+    except Exception:
+        return
+    if installed != STREAMLIT_TESTED:
+        print(f"health_gain_session: streamlit {installed} installed, sweeper tested with "
+              f"{STREAMLIT_TESTED}; it turns itself off if the internals it uses have changed",
+              file=sys.stderr)
+
+
+# ------------------------
+# Accounting
+# ------------------------
+def accounting():
+    """Per-session and total bytes of session state.
+
+    {"sessions": [{"id", "connected", "idle_seconds", "bytes"}, ...],
+     "total_bytes", "evicted"}; idle_seconds is None for sessions with no
+    `SessionData` (not run yet, or evicted).
+    """
+    runtime = _runtime()
+    rows = []
+    asizeof = None
+    if runtime is not None:
+        with _internals("streamlit.vendor.pympler"):
+            from streamlit.vendor.pympler.asizeof import asizeof
+    if asizeof is not None:
+        now = time.monotonic()
+        for session, connected in _sessions(runtime):
+            data = _data(session)
+            rows.append({
+                "id": session.id,
+                "connected": connected,
+                "idle_seconds": None if data is None else round(now - data.last_seen, 1),
+                "bytes": asizeof(session.session_state),
+            })
+    return {"sessions": rows, "total_bytes": sum(r["bytes"] for r in rows), "evicted": _evicted}
+
+
+def _gauges():
+    report = accounting()
+    sizes = [r["bytes"] for r in report["sessions"]]
+    connected = sum(r["connected"] for r in report["sessions"])
+    return [
+        ("health_gain_sessions_connected", "Sessions with an open websocket.", connected),
+        ("health_gain_sessions_disconnected", "Sessions kept for a reconnect.", len(sizes) - connected),
+        ("health_gain_session_state_bytes", "Session-state bytes over all sessions.", report["total_bytes"]),
+        ("health_gain_session_state_bytes_max", "Largest single session state in bytes.", max(sizes, default=0)),
+        ("health_gain_sessions_evicted", "Idle sessions evicted since start.", report["evicted"]),
+    ]
@@ -0,0 +1,315 @@
+"""Opt-in, pseudonymised result log for pilot studies.
+
+Off unless HEALTH_GAIN_TELEMETRY_DIR names a directory (or `configure()` is
+called); when off, `record()` returns immediately. When on, each calculation
+is reduced to coarse, non-identifying fields and appended to a local
+columnar store:
+
+    hour            hours since the epoch (no finer timestamp)
+    session         32-bit keyed hash of a random per-session token; the key
+                    is drawn per process and never stored, so sessions can't
+                    be linked across restarts or back to a person
+    module          alcohol / alcohol_simple / smoking / joint
+    age_band        age rounded down to 5 years; years_band likewise
+    female          1 / 0 (-1 when not asked)
+    drinking_days, drinks_per_occ, target_days, cigs_now, cigs_goal
+                    slider values (-1 when not part of the module)
+    gain_months     the result shown
+
+`record()` only appends a tuple to a deque, so it never blocks a rerun. A
+background thread drains the deque every `flush_interval` seconds and
+appends each column to a raw little-endian file in the open segment
+(`<dir>/<segment>.open/<column>.bin`), then commits the new row count to
+the segment's `rows` file (write + rename). A flush that fails partway is
+not committed: its rows go back on the queue and the next flush rewrites
+them from the last committed row, so columns never drift apart. A segment
+is closed after `segment_rows` rows (and on exit); closed segments older
+than the newest `keep_raw` are compressed into `<segment>.npz`.
+
+Readers memory-map the raw segments (open ones included) and decompress
+.npz segments column by column:
+
+    python health_gain_telemetry.py summary telemetry/
+    python health_gain_telemetry.py export telemetry/ -o usage.csv
+"""
+import argparse
+import atexit
+import collections
+import hashlib
+import hmac
+import os
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+import numpy as np
+
+from health_gain_model import FEMALE_LABELS
+
+TELEMETRY_ENV = "HEALTH_GAIN_TELEMETRY_DIR"
+SCHEMA = {
+    "hour": "<u4",
+    "session": "<u4",
+    "module": "u1",
+    "age_band": "i1",
+    "female": "i1",
+    "drinking_days": "i1",
+    "drinks_per_occ": "i1",
+    "years_band": "i1",
+    "target_days": "i1",
+    "cigs_now": "i1",
+    "cigs_goal": "i1",
+    "gain_months": "<f4",
+}
+MODULES = ("alcohol", "alcohol_simple", "smoking", "joint")
+BAND_YEARS = 5
+MISSING = -1
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_SEGMENT_ROWS = 100_000
+DEFAULT_KEEP_RAW = 2
+OPEN_SUFFIX = ".open"
+ROWS_FILE = "rows"  # committed row count of a raw segment
+
+
+def _band(value):
+    return MISSING if value is None else int(value) // BAND_YEARS * BAND_YEARS
+
+
+def _small(value):
+    return MISSING if value is None else int(value)
+
+
+# ------------------------
+# Writing
+# ------------------------
+class TelemetrySink:
+    """Buffered, append-only writer for one process (see the module docstring)."""
+
+    def __init__(self, directory, flush_interval=DEFAULT_FLUSH_INTERVAL, segment_rows=DEFAULT_SEGMENT_ROWS,
+                 keep_raw=DEFAULT_KEEP_RAW):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.segment_rows = segment_rows
+        self.keep_raw = keep_raw
+        self._key = os.urandom(16)
+        self._pending = collections.deque()
+        self._segment = None
+        self._segment_count = 0
+        self._rows = 0
+        self._closed_segments = []
+        self._io_lock = threading.Lock()  # flusher vs. explicit flush()/close(); record() never takes it
+        self._wake = threading.Event()
+        self._stop = False
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="health-gain-telemetry", daemon=True)
+        self._thread.start()
+
+    def pseudonym(self, token):
+        digest = hmac.new(self._key, str(token).encode("utf-8"), hashlib.sha256).digest()
+        return int.from_bytes(digest[:4], "little")
+
+    def record(self, module, session, age=None, sex=None, drinking_days=None, drinks_per_occ=None,
+               years=None, target_days=None, cigs_now=None, cigs_goal=None, gain_months=0.0):
+        """Queue one calculation; returns at once."""
+        female = MISSING if sex is None else int(str(sex).lower() in FEMALE_LABELS)
+        self._pending.append((
+            int(time.time() // 3600), self.pseudonym(session), MODULES.index(module),
+            _band(age), female, _small(drinking_days), _small(drinks_per_occ), _band(years),
+            _small(target_days), _small(cigs_now), _small(cigs_goal), float(gain_months),
+        ))
+
+    # ---- background side ----
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as exc:
+                print(f"health_gain_telemetry: flush failed: {exc}", file=sys.stderr)
+
+    def _open_segment(self):
+        self._segment_count += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        name = f"{stamp}-{os.getpid()}-{self._segment_count:04d}"
+        self._segment = os.path.join(self.directory, name + OPEN_SUFFIX)
+        os.makedirs(self._segment)
+        self._rows = 0
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        closed = self._segment[:-len(OPEN_SUFFIX)]
+        os.rename(self._segment, closed)
+        self._segment = None
+        self._closed_segments.append(closed)
+        while len(self._closed_segments) > self.keep_raw:
+            compress_segment(self._closed_segments.pop(0))
+
+    def flush(self):
+        """Write everything queued so far (called by the background thread and on close)."""
+        with self._io_lock:
+            while self._pending:
+                n = len(self._pending)
+                if self._segment is None:
+                    self._open_segment()
+                n = min(n, self.segment_rows - self._rows)
+                rows = [self._pending.popleft() for _ in range(n)]
+                try:
+                    self._write(rows)
+                except BaseException:
+                    self._pending.extendleft(reversed(rows))  # retried from the same offset
+                    raise
+                self._rows += n
+                if self._rows >= self.segment_rows:
+                    self._close_segment()
+
+    def _write(self, rows):
+        # each column is written at the committed offset (not appended), so a
+        # retry overwrites whatever a failed flush left behind
+        table = np.array(rows, dtype=list(SCHEMA.items()))
+        for col, dt in SCHEMA.items():
+            path = os.path.join(self._segment, col + ".bin")
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.seek(self._rows * np.dtype(dt).itemsize)
+                f.write(np.ascontiguousarray(table[col]).tobytes())
+                f.truncate()
+        tmp = os.path.join(self._segment, ROWS_FILE + ".tmp")
+        with open(tmp, "w", encoding="ascii") as f:
+            f.write(str(self._rows + len(rows)))
+        os.replace(tmp, os.path.join(self._segment, ROWS_FILE))
+
+    def close(self):
+        """Flush, stop the thread and close the open segment."""
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        with self._io_lock:
+            self._close_segment()
+
+
+def compress_segment(path):
+    """Pack a closed raw segment directory into `<path>.npz` and remove the directory."""
+    columns = read_segment(path)
+    tmp = path + ".npz.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **{col: np.asarray(values) for col, values in columns.items()})
+    del columns  # drop the memory maps before removing their files
+    os.replace(tmp, path + ".npz")
+    shutil.rmtree(path)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def configure(directory=None, **kwargs):
+    """Start the process-wide sink (default directory: HEALTH_GAIN_TELEMETRY_DIR); None when unset."""
+    global _sink
+    directory = directory or os.environ.get(TELEMETRY_ENV)
+    if not directory:
+        return None
+    with _sink_lock:
+        if _sink is None:
+            _sink = TelemetrySink(directory, **kwargs)
+            atexit.register(_sink.close)
+    return _sink
+
+
+def enabled():
+    return _sink is not None
+
+
+def session_token(state):
+    """Random token for one UI session, kept on `state`; only its hash is logged.
+
+    `state` is the session's `health_gain_session.SessionData` or a mapping
+    (e.g. st.session_state).
+    """
+    if isinstance(state, Mapping):
+        token = state.get("telemetry_token")
+        if token is None:
+            token = state["telemetry_token"] = os.urandom(8).hex()
+        return token
+    if state.telemetry_token is None:
+        state.telemetry_token = os.urandom(8).hex()
+    return state.telemetry_token
+
+
+def record(module, session, **fields):
+    """Log one calculation to the process-wide sink; no-op unless telemetry is configured."""
+    sink = _sink
+    if sink is not None:
+        sink.record(module, session, **fields)
+
+
+# ------------------------
+# Reading
+# ------------------------
+def read_segment(path):
+    """{column: array} for one segment; raw segments are memory-mapped, .npz ones decompressed."""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {col: data[col] for col in SCHEMA}
+    try:
+        with open(os.path.join(path, ROWS_FILE), encoding="ascii") as f:
+            rows = int(f.read())
+    except FileNotFoundError:  # segment opened, first flush not committed yet
+        rows = 0
+    for col, dt in SCHEMA.items():
+        # rows past the committed count belong to a flush that failed or is in progress
+        try:
+            rows = min(rows, os.path.getsize(os.path.join(path, col + ".bin")) // np.dtype(dt).itemsize)
+        except FileNotFoundError:
+            rows = 0
+    if rows == 0:
+        return {col: np.empty(0, dtype=dt) for col, dt in SCHEMA.items()}
+    return {col: np.memmap(os.path.join(path, col + ".bin"), dtype=dt, mode="r", shape=(rows,))
+            for col, dt in SCHEMA.items()}
+
+
+def segments(directory):
+    """Segment paths in write order (compressed, closed and open ones)."""
+    names = sorted(n for n in os.listdir(directory) if not n.endswith(".tmp"))
+    return [os.path.join(directory, n) for n in names]
+
+
+def read(directory):
+    """All rows as {column: array} (one copy, concatenated across segments)."""
+    parts = [read_segment(path) for path in segments(directory)]
+    return {col: np.concatenate([p[col] for p in parts]) if parts else np.empty(0, dtype=dt)
+            for col, dt in SCHEMA.items()}
+
+
+def to_frame(directory):
+    import pandas as pd
+
+    frame = pd.DataFrame(read(directory))
+    frame["module"] = np.asarray(MODULES)[frame["module"].to_numpy()]
+    return frame
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Inspect the pseudonymised result log.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("summary", help="calculations and mean gain per module").add_argument("directory")
+    export = sub.add_parser("export", help="write every row as CSV")
+    export.add_argument("directory")
+    export.add_argument("-o", "--output", default="-")
+    args = ap.parse_args(argv)
+
+    frame = to_frame(args.directory)
+    if args.cmd == "export":
+        frame.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+        return
+    print(f"{len(frame):,} calculations in {len(segments(args.directory))} segment(s), "
+          f"{frame['session'].nunique():,} sessions")
+    if len(frame):
+        print(frame.groupby("module")["gain_months"].agg(["count", "mean"]).round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
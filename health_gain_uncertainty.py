@@ -0,0 +1,99 @@
+"""Monte Carlo uncertainty bands for the alcohol model.
+
+Draws N samples of the coefficients (a, b, c, k) from configurable
+distributions and evaluates all of them in one broadcast NumPy pass through
+`health_gain_model.alcohol_gain_arrays`, returning percentiles of
+gain_months. With a fixed seed the bands are reproducible (and cacheable).
+
+Distributions are tuples:
+    ("fixed", value)
+    ("normal", mean, sd)            truncated at 0
+    ("lognormal", median, sigma)    sigma of log(x)
+    ("uniform", low, high)
+    ("triangular", low, mode, high)
+"""
+import numpy as np
+
+import health_gain_model as model
+from health_gain_params import current as current_params
+
+DEFAULT_DRAWS = 10_000
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+def _draw(spec, n, rng):
+    kind, *args = spec
+    if kind == "fixed":
+        return np.full(n, float(args[0]))
+    if kind == "normal":
+        return np.maximum(rng.normal(args[0], args[1], n), 0.0)
+    if kind == "lognormal":
+        return args[0] * np.exp(rng.normal(0.0, args[1], n))
+    if kind == "uniform":
+        return rng.uniform(args[0], args[1], n)
+    if kind == "triangular":
+        return rng.triangular(args[0], args[1], args[2], n)
+    raise ValueError(f"unknown distribution {kind!r}")
+
+
+def default_distributions(params=None):
+    """Placeholder spreads around the point estimates of `params`, pending calibration."""
+    p = params or current_params()
+    return {
+        "a": ("normal", p.a, 0.005),
+        "b": ("normal", p.b, 0.04),
+        "c": ("normal", p.c, 0.03),
+        "k": ("lognormal", p.k, 0.2),
+    }
+
+
+def sample_params(n_draws=DEFAULT_DRAWS, distributions=None, seed=None, params=None):
+    """Dict of coefficient arrays, each of length `n_draws`."""
+    rng = np.random.default_rng(seed)
+    dists = {**default_distributions(params), **(distributions or {})}
+    return {name: _draw(dists[name], n_draws, rng) for name in ("a", "b", "c", "k")}
+
+
+def gain_months_draws(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                      n_draws=DEFAULT_DRAWS, distributions=None, seed=None, params=None):
+    """gain_months for every parameter draw; shape (n_draws,) or (n_users, n_draws)."""
+    p = params or current_params()
+    draws = sample_params(n_draws, distributions, seed, p)
+    inputs = [np.asarray(v) for v in (age, sex, drinking_days, drinks_per_occ, years_drinking, target_days)]
+    if inputs[0].ndim:
+        inputs = [v[:, None] for v in inputs]  # users along rows, draws along columns
+    _, _, gain_years = model.alcohol_gain_arrays(*inputs, **draws, params=p)
+    return np.rint(gain_years * 12)
+
+
+def gain_months_bands(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                      n_draws=DEFAULT_DRAWS, percentiles=DEFAULT_PERCENTILES, distributions=None, seed=None,
+                      params=None):
+    """Percentile bands of gain_months for one person, e.g. {"p5": 4.0, "p50": 7.0, "p95": 11.0}."""
+    draws = gain_months_draws(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                              n_draws, distributions, seed, params)
+    values = np.percentile(draws, percentiles)
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
+
+
+def gain_months_bands_batch(age, sex, drinking_days, drinks_per_occ, years_drinking, target_days,
+                            n_draws=1_000, percentiles=DEFAULT_PERCENTILES, distributions=None, seed=None,
+                            max_cells=5_000_000, params=None):
+    """Bands for many people: dict of "p<q>" arrays.
+
+    Every person sees the same parameter draws; users are processed in blocks
+    so at most `max_cells` (users x draws) values are held at once.
+    """
+    cols = [np.asarray(v) for v in (age, sex, drinking_days, drinks_per_occ, years_drinking, target_days)]
+    n = len(cols[0])
+    p = params or current_params()
+    draws = {k: v[None, :] for k, v in sample_params(n_draws, distributions, seed, p).items()}
+    out = {f"p{q:g}": np.empty(n) for q in percentiles}
+    step = max(1, max_cells // n_draws)
+    for start in range(0, n, step):
+        block = [v[start:start + step, None] for v in cols]
+        _, _, gain_years = model.alcohol_gain_arrays(*block, **draws, params=p)
+        values = np.percentile(np.rint(gain_years * 12), percentiles, axis=1)
+        for q, v in zip(percentiles, values):
+            out[f"p{q:g}"][start:start + step] = v
+    return out